@@ -4,7 +4,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
-from .models import Avis
+from .models import Avis, VoteAvis
 
 
 @admin.register(Avis)
@@ -303,4 +303,19 @@ class AvisAdmin(admin.ModelAdmin):
             'location',
             'repondu_par',
             'modere_par'
-        )
\ No newline at end of file
+        )
+
+
+@admin.register(VoteAvis)
+class VoteAvisAdmin(admin.ModelAdmin):
+    """
+    Interface d'administration pour les votes sur les avis.
+    """
+    
+    list_display = ['id', 'avis', 'utilisateur', 'est_utile', 'date_modification']
+    list_filter = ['est_utile']
+    raw_id_fields = ['avis', 'utilisateur']
+    
+    def get_queryset(self, request):
+        """Optimiser les requêtes."""
+        return super().get_queryset(request).select_related('avis', 'utilisateur')
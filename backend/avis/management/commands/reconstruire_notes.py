@@ -0,0 +1,32 @@
+# backend/avis/management/commands/reconstruire_notes.py
+from django.core.management.base import BaseCommand
+from vehicules.models import Vehicule
+from concessions.models import Concession
+from vehicules import compteurs_derives
+
+
+class Command(BaseCommand):
+    help = "Recalculer les notes moyennes (somme et nombre d'avis) de tous les véhicules et concessions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--taille-lot',
+            type=int,
+            default=500,
+            help='Nombre de lignes mises à jour par requête'
+        )
+
+    def handle(self, *args, **options):
+        """Reconstruire les notes depuis la table des avis."""
+        
+        taille_lot = options['taille_lot']
+        vehicules = compteurs_derives.recalculer(
+            'note_vehicule', Vehicule.objects.values_list('pk', flat=True), taille_lot=taille_lot
+        )
+        concessions = compteurs_derives.recalculer(
+            'note_concession', Concession.objects.values_list('pk', flat=True), taille_lot=taille_lot
+        )
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'Notes recalculées : {vehicules} véhicule(s), {concessions} concession(s)')
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('avis', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoteAvis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('est_utile', models.BooleanField(help_text='Vrai : utile, faux : inutile', verbose_name='Avis utile')),
+                ('date_creation', models.DateTimeField(auto_now_add=True)),
+                ('date_modification', models.DateTimeField(auto_now=True)),
+                ('avis', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes', to='avis.avis', verbose_name='Avis')),
+                ('utilisateur', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='votes_avis', to=settings.AUTH_USER_MODEL, verbose_name='Utilisateur')),
+            ],
+            options={
+                'verbose_name': 'Vote sur un avis',
+                'verbose_name_plural': 'Votes sur les avis',
+                'constraints': [models.UniqueConstraint(fields=('utilisateur', 'avis'), name='vote_avis_unique')],
+            },
+        ),
+    ]
@@ -1,12 +1,14 @@
 # backend/avis/models.py
 # Modèle pour les avis et évaluations
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from users.models import User
 from vehicules.models import Vehicule
 from locations.models import Location
+from avis import notes
 
 
 class Avis(models.Model):
@@ -246,17 +248,28 @@ class Avis(models.Model):
                 "Un avis ne peut être donné que sur une location terminée"
             )
     
+    # Champs dont dépend la contribution de l'avis aux notes moyennes
+    CHAMPS_NOTE = {'note', 'est_valide', 'vehicule'}
+    
     def save(self, *args, **kwargs):
-        """Override save."""
+        """Override save : répercuter le delta de note (avis/notes.py)."""
         self.clean()
         
-        is_new = self.pk is None
-        
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not self.CHAMPS_NOTE.intersection(update_fields):
+            # Réponse, signalement, utilité : notes inchangées
+            super().save(*args, **kwargs)
+            return
         
-        # Mettre à jour la note moyenne du véhicule
-        if is_new or 'note' in kwargs.get('update_fields', []):
-            self.vehicule.mettre_a_jour_note()
+        with transaction.atomic():
+            ancien = None
+            if self.pk is not None:
+                ancien = Avis.objects.select_for_update().filter(pk=self.pk).values(
+                    'vehicule_id', 'note', 'est_valide'
+                ).first()
+            
+            super().save(*args, **kwargs)
+            notes.avis_enregistre(self, ancien)
     
     def repondre(self, reponse, user):
         """Ajouter une réponse du concessionnaire."""
@@ -281,19 +294,51 @@ class Avis(models.Model):
         self.modere_par = user
         self.date_moderation = timezone.now()
         self.save(update_fields=['est_valide', 'modere_par', 'date_moderation'])
-        
-        # Mettre à jour la note du véhicule
-        self.vehicule.mettre_a_jour_note()
-    
-    def marquer_utile(self):
-        """Incrémenter le compteur d'utilité."""
-        self.nb_personnes_utile += 1
-        self.save(update_fields=['nb_personnes_utile'])
     
-    def marquer_inutile(self):
-        """Incrémenter le compteur d'inutilité."""
-        self.nb_personnes_inutile += 1
-        self.save(update_fields=['nb_personnes_inutile'])
+    def voter(self, utilisateur, utile):
+        """
+        Enregistrer le vote d'un utilisateur (un seul vote par avis).
+
+        Les compteurs sont mis à jour par F() en base : aucun vote perdu en
+        cas de votes simultanés. Revoter la même chose ne change rien ;
+        voter l'inverse bascule le vote.
+
+        Returns:
+            True si les compteurs ont changé
+        """
+        with transaction.atomic():
+            vote, cree = VoteAvis.objects.get_or_create(
+                avis=self,
+                utilisateur=utilisateur,
+                defaults={'est_utile': utile}
+            )
+
+            deltas = {}
+            if cree:
+                deltas[VoteAvis.champ_compteur(utile)] = 1
+            else:
+                vote = VoteAvis.objects.select_for_update().get(pk=vote.pk)
+                if vote.est_utile == utile:
+                    return False
+                vote.est_utile = utile
+                vote.save(update_fields=['est_utile', 'date_modification'])
+                deltas[VoteAvis.champ_compteur(utile)] = 1
+                deltas[VoteAvis.champ_compteur(not utile)] = -1
+
+            Avis.objects.filter(pk=self.pk).update(
+                **{champ: F(champ) + delta for champ, delta in deltas.items()}
+            )
+
+        self.refresh_from_db(fields=['nb_personnes_utile', 'nb_personnes_inutile'])
+        return True
+
+    def marquer_utile(self, utilisateur):
+        """Voter « utile » pour l'avis."""
+        return self.voter(utilisateur, True)
+
+    def marquer_inutile(self, utilisateur):
+        """Voter « inutile » pour l'avis."""
+        return self.voter(utilisateur, False)
     
     @property
     def score_utilite(self):
@@ -323,9 +368,49 @@ class Avis(models.Model):
     def a_reponse(self):
         """Vérifier si le concessionnaire a répondu."""
         return bool(self.reponse)
+
+
+class VoteAvis(models.Model):
+    """
+    Vote d'un utilisateur sur l'utilité d'un avis.
+    Un seul vote par utilisateur et par avis ; les compteurs
+    nb_personnes_utile / nb_personnes_inutile de l'avis en sont le total.
+    """
+    
+    avis = models.ForeignKey(
+        Avis,
+        on_delete=models.CASCADE,
+        related_name='votes',
+        verbose_name="Avis"
+    )
+    
+    utilisateur = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='votes_avis',
+        verbose_name="Utilisateur"
+    )
+    
+    est_utile = models.BooleanField(
+        verbose_name="Avis utile",
+        help_text="Vrai : utile, faux : inutile"
+    )
+    
+    date_creation = models.DateTimeField(auto_now_add=True)
+    date_modification = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Vote sur un avis"
+        verbose_name_plural = "Votes sur les avis"
+        constraints = [
+            # Couvre aussi la lecture des votes d'un utilisateur sur une page d'avis
+            models.UniqueConstraint(fields=['utilisateur', 'avis'], name='vote_avis_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.utilisateur} - avis {self.avis_id} : {'utile' if self.est_utile else 'inutile'}"
     
-    def delete(self, *args, **kwargs):
-        """Override delete pour mettre à jour la note du véhicule."""
-        vehicule = self.vehicule
-        super().delete(*args, **kwargs)
-        vehicule.mettre_a_jour_note()
\ No newline at end of file
+    @staticmethod
+    def champ_compteur(utile):
+        """Compteur de l'avis correspondant au sens du vote."""
+        return 'nb_personnes_utile' if utile else 'nb_personnes_inutile'
@@ -0,0 +1,83 @@
+# backend/avis/notes.py
+# Notes moyennes des véhicules et des concessions, maintenues par deltas
+#
+# Véhicule et concession stockent la somme et le nombre des notes des avis
+# validés (somme_notes, nombre_avis) ; la moyenne en est déduite. Chaque
+# création, modification, modération ou suppression d'avis applique la
+# différence de sa contribution par un UPDATE ... SET somme_notes =
+# somme_notes + delta, sur le véhicule puis sur sa concession, sans relire
+# l'historique des avis. La commande reconstruire_notes recalcule tout
+# depuis la table des avis.
+
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, F, Value, When
+from django.db.models.functions import Cast
+
+from vehicules import cache as cache_vehicules
+
+
+def contribution(note, est_valide):
+    """(somme, nombre) apportés par un avis aux notes de son véhicule."""
+    return (note, 1) if est_valide else (0, 0)
+
+
+def _champs_delta(delta_somme, delta_nombre):
+    """Expressions UPDATE appliquant un delta à somme, nombre et moyenne."""
+    somme = F('somme_notes') + delta_somme
+    nombre = F('nombre_avis') + delta_nombre
+    decimal = DecimalField(max_digits=3, decimal_places=2)
+    return {
+        'somme_notes': somme,
+        'nombre_avis': nombre,
+        # Dans un UPDATE, F() désigne les valeurs avant modification
+        'note_moyenne': Case(
+            When(nombre_avis__gt=-delta_nombre, then=Cast(
+                Cast(somme, DecimalField(max_digits=12, decimal_places=2)) / nombre, decimal
+            )),
+            default=Value(Decimal('0')),
+            output_field=decimal,
+        ),
+    }
+
+
+def appliquer_delta(vehicule_id, delta_somme, delta_nombre):
+    """Appliquer un delta aux notes d'un véhicule et de sa concession."""
+    from vehicules.models import Vehicule
+    from concessions.models import Concession
+
+    if not delta_somme and not delta_nombre:
+        return
+
+    champs = _champs_delta(delta_somme, delta_nombre)
+    Vehicule.objects.filter(pk=vehicule_id).update(**champs)
+    Concession.objects.filter(vehicules=vehicule_id).update(**champs)
+    cache_vehicules.invalider_vehicule(vehicule_id)
+
+
+def avis_enregistre(avis, ancien=None):
+    """
+    Répercuter la création ou la modification d'un avis.
+
+    Args:
+        avis: Avis enregistré
+        ancien: dict {'vehicule_id', 'note', 'est_valide'} de l'état
+            précédent en base, None pour une création
+    """
+    somme, nombre = contribution(avis.note, avis.est_valide)
+    if ancien is None:
+        appliquer_delta(avis.vehicule_id, somme, nombre)
+        return
+
+    ancienne_somme, ancien_nombre = contribution(ancien['note'], ancien['est_valide'])
+    if ancien['vehicule_id'] != avis.vehicule_id:
+        appliquer_delta(ancien['vehicule_id'], -ancienne_somme, -ancien_nombre)
+        appliquer_delta(avis.vehicule_id, somme, nombre)
+    else:
+        appliquer_delta(avis.vehicule_id, somme - ancienne_somme, nombre - ancien_nombre)
+
+
+def avis_supprime(avis):
+    """Retirer la contribution d'un avis supprimé."""
+    somme, nombre = contribution(avis.note, avis.est_valide)
+    appliquer_delta(avis.vehicule_id, -somme, -nombre)
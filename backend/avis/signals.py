@@ -0,0 +1,17 @@
+# backend/avis/signals.py
+# Notes des véhicules et des concessions à la suppression d'un avis
+#
+# Reçu aussi pour les suppressions en cascade (client, location, véhicule)
+# et par lot (QuerySet.delete, action « supprimer » de l'admin), qui ne
+# passent pas par Avis.delete.
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from avis import notes
+from avis.models import Avis
+
+
+@receiver(post_delete, sender=Avis)
+def avis_supprime(sender, instance, **kwargs):
+    notes.avis_supprime(instance)
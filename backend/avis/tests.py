@@ -1,3 +1,149 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from users.models import User, Role
+from vehicules.tests.donnees import CatalogueTestMixin
+from vehicules.models import Vehicule
+from locations.models import Location
+from avis.models import Avis, VoteAvis
+
+
+class AvisTestMixin(CatalogueTestMixin):
+    """Véhicules et avis (sur une location terminée) pour les tests."""
+
+    def creer_vehicule(self):
+        numero = Vehicule.objects.count()
+        return Vehicule.objects.create(
+            concessionnaire=self.concessionnaire, concession=self.concession,
+            marque=self.marque, categorie=self.categorie,
+            nom_modele=f'Modele {numero}', annee=2020, couleur='Noir',
+            immatriculation=f'DK-{numero:04d}-A', prix_location_jour=Decimal('20000')
+        )
+
+    def creer_client(self):
+        numero = User.objects.count()
+        return User.objects.create_user(
+            email=f'client{numero}@test.sn', password='test', nom='Ndiaye', prenom='Fatou',
+            type_utilisateur='CLIENT', role=Role.objects.get(nom='CLIENT')
+        )
+
+    def creer_avis(self, vehicule, note):
+        """Avis d'un nouveau client, après une location terminée."""
+        client = self.creer_client()
+        debut = timezone.now().date() - timedelta(days=10 * (Location.objects.count() + 2))
+        location = Location.objects.create(
+            vehicule=vehicule, client=client,
+            date_debut=debut, date_fin=debut + timedelta(days=2),
+            prix_jour=Decimal('20000'), caution=Decimal('0')
+        )
+        Location.objects.filter(pk=location.pk).update(statut='TERMINEE')
+        location.refresh_from_db()
+        return Avis.objects.create(
+            client=client, vehicule=vehicule, location=location, note=note,
+            titre='Avis', commentaire='Très bonne expérience de location.'
+        )
+
+    def notes(self, objet):
+        objet.refresh_from_db()
+        return objet.somme_notes, objet.nombre_avis, objet.note_moyenne
+
+
+class NotesDeltasTest(AvisTestMixin, TestCase):
+    """Les notes du véhicule et de sa concession suivent chaque avis."""
+
+    def test_creation_modification_moderation_suppression(self):
+        vehicule, autre = self.creer_vehicule(), self.creer_vehicule()
+        avis = self.creer_avis(vehicule, 5)
+        deuxieme = self.creer_avis(vehicule, 2)
+        self.creer_avis(autre, 4)
+        self.assertEqual(self.notes(vehicule), (7, 2, Decimal('3.50')))
+        self.assertEqual(self.notes(self.concession), (11, 3, Decimal('3.67')))
+
+        deuxieme.note = 3
+        deuxieme.save()
+        self.assertEqual(self.notes(vehicule), (8, 2, Decimal('4.00')))
+        self.assertEqual(self.notes(self.concession), (12, 3, Decimal('4.00')))
+
+        deuxieme.moderer(False, self.concessionnaire)
+        deuxieme.moderer(False, self.concessionnaire)
+        self.assertEqual(self.notes(vehicule), (5, 1, Decimal('5.00')))
+        self.assertEqual(self.notes(self.concession), (9, 2, Decimal('4.50')))
+
+        deuxieme.moderer(True, self.concessionnaire)
+        self.assertEqual(self.notes(vehicule), (8, 2, Decimal('4.00')))
+
+        avis.delete()
+        self.assertEqual(self.notes(vehicule), (3, 1, Decimal('3.00')))
+        self.assertEqual(self.notes(self.concession), (7, 2, Decimal('3.50')))
+
+    def test_suppression_vehicule(self):
+        """Les avis supprimés en cascade sortent de la note de la concession."""
+        vehicule, autre = self.creer_vehicule(), self.creer_vehicule()
+        self.creer_avis(vehicule, 5)
+        self.creer_avis(autre, 3)
+        self.assertEqual(self.notes(self.concession), (8, 2, Decimal('4.00')))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # Locations protégées : supprimées d'abord, avec leurs avis
+            Location.objects.filter(vehicule=vehicule).delete()
+            vehicule.delete()
+        self.assertEqual(self.notes(self.concession), (3, 1, Decimal('3.00')))
+
+    def test_suppression_client_et_par_lot(self):
+        """Les avis supprimés en cascade ou par QuerySet.delete sortent des notes."""
+        vehicule = self.creer_vehicule()
+        avis = self.creer_avis(vehicule, 5)
+        self.creer_avis(vehicule, 2)
+        self.creer_avis(vehicule, 4)
+        self.assertEqual(self.notes(vehicule), (11, 3, Decimal('3.67')))
+
+        avis.client.delete()
+        self.assertEqual(self.notes(vehicule), (6, 2, Decimal('3.00')))
+        self.assertEqual(self.notes(self.concession), (6, 2, Decimal('3.00')))
+
+        Avis.objects.filter(vehicule=vehicule, note=2).delete()
+        self.assertEqual(self.notes(vehicule), (4, 1, Decimal('4.00')))
+        self.assertEqual(self.notes(self.concession), (4, 1, Decimal('4.00')))
+
+
+class VotesAvisTest(AvisTestMixin, TestCase):
+    """Un vote par utilisateur et par avis, compteurs mis à jour en base."""
+
+    def test_revote_identique_sans_effet(self):
+        avis = self.creer_avis(self.creer_vehicule(), 4)
+
+        self.assertTrue(avis.voter(self.client_user, True))
+        with CaptureQueriesContext(connection) as contexte:
+            self.assertFalse(avis.voter(self.client_user, True))
+
+        self.assertFalse([
+            requete for requete in contexte.captured_queries
+            if requete['sql'].startswith('UPDATE')
+        ])
+        avis.refresh_from_db()
+        self.assertEqual((avis.nb_personnes_utile, avis.nb_personnes_inutile), (1, 0))
+        self.assertEqual(VoteAvis.objects.filter(avis=avis).count(), 1)
+
+    def test_bascule_du_vote(self):
+        avis = self.creer_avis(self.creer_vehicule(), 4)
+        avis.voter(self.client_user, True)
+        avis.voter(self.concessionnaire, True)
+
+        with CaptureQueriesContext(connection) as contexte:
+            self.assertTrue(avis.voter(self.client_user, False))
 
-# Create your tests here.
+        # +1 inutile et -1 utile dans le même UPDATE de l'avis
+        mises_a_jour = [
+            requete['sql'] for requete in contexte.captured_queries
+            if requete['sql'].startswith('UPDATE "avis_avis"')
+        ]
+        self.assertEqual(len(mises_a_jour), 1)
+        self.assertIn('"nb_personnes_utile"', mises_a_jour[0])
+        self.assertIn('"nb_personnes_inutile"', mises_a_jour[0])
+        self.assertEqual((avis.nb_personnes_utile, avis.nb_personnes_inutile), (1, 1))
+        self.assertFalse(VoteAvis.objects.get(avis=avis, utilisateur=self.client_user).est_utile)
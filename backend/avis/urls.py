@@ -36,6 +36,7 @@ PATCH  /api/avis/{id}/signaler/          - Signaler un avis
 PATCH  /api/avis/{id}/moderer/           - Modérer un avis (Admin)
 POST   /api/avis/{id}/utile/             - Marquer comme utile
 POST   /api/avis/{id}/inutile/           - Marquer comme inutile
+GET    /api/avis/mes-votes/?avis=1,2,3   - Mes votes sur une page d'avis (une requête)
 GET    /api/avis/statistiques/           - Statistiques globales
 
 FILTRES :
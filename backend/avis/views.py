@@ -9,7 +9,7 @@ from django.db.models import Q
 from favoris.models import Historique
 from notifications.models import Notification
 
-from .models import Avis
+from .models import Avis, VoteAvis
 from .serializers import (
     AvisSerializer,
     AvisListSerializer,
@@ -21,6 +21,10 @@ from .serializers import (
 from users.permissions import IsClient, IsConcessionnaire
 
 
+# Nombre maximal d'avis par appel à mes-votes (une page de liste)
+MAX_AVIS_VOTES = 100
+
+
 # ========================================
 # VIEWSET AVIS
 # ========================================
@@ -42,6 +46,7 @@ class AvisViewSet(viewsets.ModelViewSet):
     - PATCH  /api/avis/{id}/moderer/       - Modérer (Admin)
     - POST   /api/avis/{id}/utile/         - Marquer utile
     - POST   /api/avis/{id}/inutile/       - Marquer inutile
+    - GET    /api/avis/mes-votes/?avis=1,2 - Mes votes sur une page d'avis
     - GET    /api/avis/mes-avis/           - Mes avis (Client)
     - GET    /api/avis/vehicule/{id}/      - Avis d'un véhicule
     """
@@ -114,7 +119,7 @@ class AvisViewSet(viewsets.ModelViewSet):
             return [permissions.IsAuthenticated()]
         elif self.action == 'repondre':
             return [permissions.IsAuthenticated(), IsConcessionnaire()]
-        elif self.action in ['signaler', 'marquer_utile', 'marquer_inutile']:
+        elif self.action in ['signaler', 'marquer_utile', 'marquer_inutile', 'mes_votes']:
             return [permissions.IsAuthenticated()]
         elif self.action == 'moderer':
             return [permissions.IsAdminUser()]
@@ -420,36 +425,42 @@ class AvisViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
 
-    @action(
-        detail=True,
-        methods=['post'],
-        permission_classes=[permissions.IsAuthenticated]
-    )
-    def marquer_utile(self, request, pk=None):
-        """
-        Marquer un avis comme utile.
-        POST /api/avis/{id}/utile/
-        """
+    def _voter(self, request, utile):
+        """Enregistrer le vote de l'utilisateur connecté (utile / inutile)."""
         avis = self.get_object()
         
         # Ne pas pouvoir voter pour son propre avis
-        if avis.client == request.user:
+        if avis.client_id == request.user.id:
             return Response(
                 {"error": "Vous ne pouvez pas voter pour votre propre avis"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        avis.marquer_utile()
+        compte = avis.voter(request.user, utile)
         
         return Response(
             {
-                "message": "Merci pour votre vote",
+                "message": "Merci pour votre vote" if compte else "Vote déjà enregistré",
+                "vote": "utile" if utile else "inutile",
                 "nb_personnes_utile": avis.nb_personnes_utile,
+                "nb_personnes_inutile": avis.nb_personnes_inutile,
                 "score_utilite": avis.score_utilite
             },
             status=status.HTTP_200_OK
         )
     
+    @action(
+        detail=True,
+        methods=['post'],
+        permission_classes=[permissions.IsAuthenticated]
+    )
+    def marquer_utile(self, request, pk=None):
+        """
+        Marquer un avis comme utile (un vote par utilisateur, modifiable).
+        POST /api/avis/{id}/utile/
+        """
+        return self._voter(request, True)
+    
     @action(
         detail=True,
         methods=['post'],
@@ -457,28 +468,50 @@ class AvisViewSet(viewsets.ModelViewSet):
     )
     def marquer_inutile(self, request, pk=None):
         """
-        Marquer un avis comme inutile.
+        Marquer un avis comme inutile (un vote par utilisateur, modifiable).
         POST /api/avis/{id}/inutile/
         """
-        avis = self.get_object()
+        return self._voter(request, False)
+    
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[permissions.IsAuthenticated],
+        url_path='mes-votes'
+    )
+    def mes_votes(self, request):
+        """
+        Votes de l'utilisateur connecté sur une page d'avis, en une requête.
+        GET /api/avis/mes-votes/?avis=12,15,18
         
-        # Ne pas pouvoir voter pour son propre avis
-        if avis.client == request.user:
+        Réponse : {"votes": {"12": "utile", "18": "inutile"}} (les avis
+        sans vote sont absents)
+        """
+        try:
+            identifiants = [int(i) for i in request.query_params.get('avis', '').split(',') if i.strip()]
+        except ValueError:
             return Response(
-                {"error": "Vous ne pouvez pas voter pour votre propre avis"},
+                {"error": "Le paramètre avis doit être une liste d'identifiants séparés par des virgules"},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        avis.marquer_inutile()
+        if len(identifiants) > MAX_AVIS_VOTES:
+            return Response(
+                {"error": f"{MAX_AVIS_VOTES} avis maximum par requête"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        return Response(
-            {
-                "message": "Merci pour votre vote",
-                "nb_personnes_inutile": avis.nb_personnes_inutile,
-                "score_utilite": avis.score_utilite
-            },
-            status=status.HTTP_200_OK
-        )
+        votes = VoteAvis.objects.filter(
+            utilisateur=request.user,
+            avis_id__in=identifiants
+        ).values_list('avis_id', 'est_utile')
+        
+        return Response({
+            "votes": {
+                str(avis_id): "utile" if est_utile else "inutile"
+                for avis_id, est_utile in votes
+            }
+        })
     
     @action(
         detail=False,
@@ -0,0 +1,131 @@
+# backend/concessions/geo.py
+# Recherche géographique sur les coordonnées des concessions
+#
+# Deux étapes, exécutées en une seule requête SQL :
+#   1. boîte englobante sur (latitude, longitude), couverte par l'index
+#      composite de Concession : seules les lignes candidates sont lues ;
+#   2. distance de Haversine calculée côté base sur ces candidates, puis
+#      filtre sur le rayon et tri par distance.
+
+import math
+
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import ASin, Cast, Cos, Least, Power, Radians, Sin, Sqrt
+
+
+RAYON_TERRE_KM = 6371.0
+
+# Rayon maximal accepté pour une recherche (km)
+RAYON_MAX_KM = 500.0
+
+
+def boite_englobante(latitude, longitude, rayon_km):
+    """
+    Boîte englobante du cercle (latitude, longitude, rayon_km).
+
+    Returns:
+        Tuple (lat_min, lat_max, lon_min, lon_max). Les bornes de longitude
+        valent None si la boîte traverse l'antiméridien ou un pôle.
+    """
+    delta_lat = math.degrees(rayon_km / RAYON_TERRE_KM)
+    lat_min = max(latitude - delta_lat, -90.0)
+    lat_max = min(latitude + delta_lat, 90.0)
+
+    cos_lat = math.cos(math.radians(latitude))
+    if lat_min <= -90.0 or lat_max >= 90.0 or cos_lat <= 0:
+        return lat_min, lat_max, None, None
+
+    delta_lon = math.degrees(rayon_km / (RAYON_TERRE_KM * cos_lat))
+    lon_min = longitude - delta_lon
+    lon_max = longitude + delta_lon
+    if delta_lon >= 180.0 or lon_min < -180.0 or lon_max > 180.0:
+        return lat_min, lat_max, None, None
+
+    return lat_min, lat_max, lon_min, lon_max
+
+
+def distance_haversine(lat1, lon1, lat2, lon2):
+    """Distance (km) entre deux points GPS."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (float(lat1), float(lon1), float(lat2), float(lon2)))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * RAYON_TERRE_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def expression_distance(latitude, longitude, prefixe=''):
+    """
+    Expression SQL de la distance de Haversine (km) entre le point donné
+    et les champs {prefixe}latitude / {prefixe}longitude.
+    """
+    lat = Radians(Cast(F(f'{prefixe}latitude'), FloatField()))
+    lon = Radians(Cast(F(f'{prefixe}longitude'), FloatField()))
+    lat0 = math.radians(latitude)
+    lon0 = math.radians(longitude)
+
+    a = (
+        Power(Sin((lat - Value(lat0)) / Value(2.0)), Value(2.0))
+        + Value(math.cos(lat0)) * Cos(lat)
+        * Power(Sin((lon - Value(lon0)) / Value(2.0)), Value(2.0))
+    )
+    return Value(2 * RAYON_TERRE_KM) * ASin(Least(Sqrt(a), Value(1.0)))
+
+
+def filtrer_proximite(queryset, latitude, longitude, rayon_km, prefixe=''):
+    """
+    Restreindre un QuerySet aux objets situés à moins de rayon_km du point,
+    avec une annotation `distance` (km).
+
+    Args:
+        queryset: QuerySet de Concession, ou d'un modèle lié (prefixe='concession__')
+        prefixe: Chemin vers les champs latitude / longitude
+    """
+    lat_min, lat_max, lon_min, lon_max = boite_englobante(latitude, longitude, rayon_km)
+
+    filtres = {
+        f'{prefixe}latitude__gte': lat_min,
+        f'{prefixe}latitude__lte': lat_max,
+    }
+    if lon_min is not None:
+        filtres[f'{prefixe}longitude__gte'] = lon_min
+        filtres[f'{prefixe}longitude__lte'] = lon_max
+
+    return queryset.filter(**filtres).annotate(
+        distance=expression_distance(latitude, longitude, prefixe)
+    ).filter(distance__lte=rayon_km)
+
+
+def lire_position(params, rayon_defaut=10.0):
+    """
+    Lire latitude, longitude et rayon depuis les paramètres de requête.
+
+    Returns:
+        Tuple (latitude, longitude, rayon_km), ou None si latitude et
+        longitude sont absentes
+
+    Raises:
+        ValueError: Paramètres invalides (message destiné au client)
+    """
+    latitude = params.get('latitude')
+    longitude = params.get('longitude')
+
+    if not latitude and not longitude:
+        return None
+    if not latitude or not longitude:
+        raise ValueError('Les paramètres latitude et longitude sont obligatoires')
+
+    try:
+        latitude = float(latitude)
+        longitude = float(longitude)
+        rayon = float(params.get('rayon') or rayon_defaut)
+    except ValueError:
+        raise ValueError('Latitude, longitude et rayon doivent être des nombres')
+
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError('Coordonnées GPS hors limites')
+
+    if not (0 < rayon <= RAYON_MAX_KM):
+        raise ValueError(f'Le rayon doit être compris entre 0 et {int(RAYON_MAX_KM)} km')
+
+    return latitude, longitude, rayon
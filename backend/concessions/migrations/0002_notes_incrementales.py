@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('concessions', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='concession',
+            name='somme_notes',
+            field=models.IntegerField(default=0, editable=False, help_text='Somme des notes des avis validés (avis/notes.py)', verbose_name='Somme des notes'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.core.validators import RegexValidator, MinValueValidator, MaxValueValidator
 from users.models import User
+from vehicules import compteurs
+from vehicules import compteurs_derives
 
 
 # ========================================
@@ -321,6 +323,13 @@ class Concession(models.Model):
         default=0,
         verbose_name="Nombre d'avis"
     )
+
+    somme_notes = models.IntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Somme des notes",
+        help_text="Somme des notes des avis validés (avis/notes.py)"
+    )
     
     nombre_vues = models.IntegerField(
         default=0,
@@ -371,30 +380,30 @@ class Concession(models.Model):
     def save(self, *args, **kwargs):
         """Override save pour gérer le compteur de concessions par région."""
         is_new = self.pk is None
-        old_region = None
+        old_region_id = None
         
         if not is_new:
             # Récupérer l'ancienne région si la concession existe déjà
-            old_concession = Concession.objects.filter(pk=self.pk).first()
-            if old_concession:
-                old_region = old_concession.region
+            old_region_id = Concession.objects.filter(pk=self.pk).values_list('region_id', flat=True).first()
         
         super().save(*args, **kwargs)
         
-        # Mettre à jour les compteurs de régions
+        # Compteurs de concessions des régions, recalculés au commit
         if is_new:
-            # Nouvelle concession : incrémenter la région
-            self.region.incrementer_concessions()
-        elif old_region and old_region != self.region:
-            # Changement de région : décrémenter l'ancienne, incrémenter la nouvelle
-            old_region.decrementer_concessions()
-            self.region.incrementer_concessions()
+            compteurs_derives.marquer('region', self.region_id)
+        elif old_region_id and old_region_id != self.region_id:
+            compteurs_derives.marquer('region', old_region_id, self.region_id)
+        
+        # Le nom et la ville entrent dans le vecteur de recherche des véhicules
+        from vehicules import recherche
+        from vehicules.champs import champs_concernes
+        if not is_new and champs_concernes(kwargs.get('update_fields'), ['nom', 'ville']):
+            recherche.indexer(concession_id=self.pk)
     
     def delete(self, *args, **kwargs):
-        """Override delete pour décrémenter le compteur de la région."""
-        region = self.region
+        """Override delete pour mettre à jour le compteur de la région."""
         super().delete(*args, **kwargs)
-        region.decrementer_concessions()
+        compteurs_derives.marquer('region', self.region_id)
     
     def get_coordonnees_gps(self):
         """Retourne les coordonnées GPS sous forme de tuple."""
@@ -417,9 +426,8 @@ class Concession(models.Model):
         return self.est_validee()
     
     def incrementer_vues(self):
-        """Incrémente le nombre de vues de la concession."""
-        self.nombre_vues += 1
-        self.save(update_fields=['nombre_vues'])
+        """Incrémente le nombre de vues de la concession (reporté en base par lots)."""
+        compteurs.incrementer('concession', self.pk)
     
     def get_adresse_complete(self):
         """Retourne l'adresse complète formatée."""
@@ -431,8 +439,9 @@ class Concession(models.Model):
     
     def mettre_a_jour_note(self):
         """
-        Met à jour la note moyenne de la concession.
-        À implémenter après création du modèle Avis.
+        Recalcule la note moyenne de la concession à partir de tous les avis
+        validés de ses véhicules (les avis appliquent sinon des deltas, voir
+        avis/notes.py).
         """
-        # TODO: Calculer depuis les avis
-        pass
\ No newline at end of file
+        compteurs_derives.recalculer('note_concession', [self.pk])
+        self.refresh_from_db(fields=['note_moyenne', 'nombre_avis', 'somme_notes'])
\ No newline at end of file
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Region, Concession
+from .geo import distance_haversine
 from users.serializers import UserSimpleSerializer
 
 
@@ -87,13 +88,16 @@ class ConcessionListSerializer(serializers.ModelSerializer):
         Calcule la distance entre la concession et l'utilisateur.
         La position de l'utilisateur doit être passée dans le contexte.
         """
+        # Distance déjà calculée en base (filtrer_proximite)
+        distance = getattr(obj, 'distance', None)
+        if distance is not None:
+            return round(distance, 2)
+        
         user_position = self.context.get('user_position')
-        if not user_position:
+        if not user_position or obj.latitude is None or obj.longitude is None:
             return None
         
-        # TODO: Implémenter le calcul de distance
-        # Utiliser la formule de Haversine
-        return None
+        return round(distance_haversine(user_position[0], user_position[1], obj.latitude, obj.longitude), 2)
 
 
 class ConcessionDetailSerializer(serializers.ModelSerializer):
@@ -6,6 +6,7 @@ from django.utils import timezone
 from django.db.models import Q, Count
 
 from .models import Region, Concession
+from .geo import filtrer_proximite, lire_position
 from .serializers import (
     RegionSerializer,
     ConcessionListSerializer,
@@ -393,40 +394,47 @@ class ConcessionViewSet(viewsets.ModelViewSet):
         Params:
         - latitude: Latitude de la position
         - longitude: Longitude de la position
-        - rayon: Rayon de recherche en km (défaut: 10km)
-        """
-        latitude = request.query_params.get('latitude')
-        longitude = request.query_params.get('longitude')
-        rayon = float(request.query_params.get('rayon', 10))  # km
+        - rayon: Rayon de recherche en km (défaut: 10km, max: 500km)
         
-        if not latitude or not longitude:
+        Résultats triés par distance croissante et paginés.
+        """
+        try:
+            position = lire_position(request.query_params)
+        except ValueError as e:
             return Response({
-                'error': 'Les paramètres latitude et longitude sont obligatoires'
+                'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        try:
-            latitude = float(latitude)
-            longitude = float(longitude)
-        except ValueError:
+        if position is None:
             return Response({
-                'error': 'Latitude et longitude doivent être des nombres'
+                'error': 'Les paramètres latitude et longitude sont obligatoires'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # TODO: Implémenter le calcul de distance avec la formule de Haversine
-        # Pour l'instant, retourner toutes les concessions validées
-        concessions = self.get_queryset().filter(
-            statut='VALIDE',
-            est_visible=True
-        )
+        latitude, longitude, rayon = position
         
-        serializer = ConcessionListSerializer(
-            concessions,
-            many=True,
-            context={
-                'request': request,
-                'user_position': (latitude, longitude)
-            }
-        )
+        # Boîte englobante (index latitude/longitude) puis Haversine en SQL
+        concessions = filtrer_proximite(
+            self.get_queryset().filter(statut='VALIDE', est_visible=True),
+            latitude,
+            longitude,
+            rayon
+        ).order_by('distance', 'id')
+        
+        contexte = {
+            'request': request,
+            'user_position': (latitude, longitude)
+        }
+        
+        page = self.paginate_queryset(concessions)
+        if page is not None:
+            serializer = ConcessionListSerializer(page, many=True, context=contexte)
+            count = self.paginator.page.paginator.count
+            suivant = self.paginator.get_next_link()
+            precedent = self.paginator.get_previous_link()
+        else:
+            serializer = ConcessionListSerializer(concessions, many=True, context=contexte)
+            count = len(serializer.data)
+            suivant = precedent = None
         
         return Response({
             'position': {
@@ -434,7 +442,9 @@ class ConcessionViewSet(viewsets.ModelViewSet):
                 'longitude': longitude
             },
             'rayon_km': rayon,
-            'count': concessions.count(),
+            'count': count,
+            'next': suivant,
+            'previous': precedent,
             'concessions': serializer.data
         })
     
@@ -0,0 +1,4 @@
+# Charger l'application Celery au démarrage de Django
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
@@ -3,6 +3,11 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Le flux temps réel des notifications (/api/notifications/flux/, vue
+asynchrone) doit être servi par un serveur ASGI, par exemple :
+    uvicorn config.asgi:application
+Sous WSGI, chaque flux ouvert occuperait un thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -0,0 +1,21 @@
+"""
+Configuration Celery pour le projet.
+
+Lancer un worker et le planificateur :
+    celery -A config worker -l info
+    celery -A config beat -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+app = Celery('config')
+
+# Lire les paramètres CELERY_* depuis settings.py
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Découvrir automatiquement les tasks.py de chaque app
+app.autodiscover_tasks()
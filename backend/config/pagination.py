@@ -0,0 +1,219 @@
+# backend/config/pagination.py
+# Pagination des listes de l'API
+#
+# Par défaut, les listes sont paginées par numéro de page (?page=3), ce
+# qui coûte un OFFSET et un COUNT(*) complet à chaque page. Les grandes
+# listes (catalogue, historique, notifications, locations) proposent en
+# plus un mode curseur (keyset) : chaque page reprend après la dernière
+# valeur de la clé de tri indexée, en temps constant quelle que soit la
+# profondeur. C'est le mode adapté au défilement infini.
+#
+# Le catalogue remplace en outre le COUNT(*) exact par l'estimation du
+# planificateur PostgreSQL au-delà d'un seuil (PaginationEstimee).
+
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+
+VALEURS_VRAIES = ('1', 'true', 'oui')
+
+
+# ========================================
+# COMPTAGE ESTIMÉ
+# ========================================
+
+def estimer_nombre(queryset):
+    """
+    Nombre de lignes estimé par le planificateur PostgreSQL (EXPLAIN),
+    sans exécuter la requête.
+
+    Returns:
+        Entier, ou None si la base n'est pas PostgreSQL
+    """
+    connexion = connections[queryset.db]
+    if connexion.vendor != 'postgresql':
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connexion.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class PageEstimee(Page):
+    """Page d'un total estimé : la page suivante existe si la requête a
+    renvoyé plus d'éléments que la taille de page."""
+
+    def __init__(self, object_list, number, paginator, suivante):
+        super().__init__(object_list, number, paginator)
+        self.suivante = suivante
+
+    def has_next(self):
+        return self.suivante
+
+
+class PaginateurEstime(Paginator):
+    """
+    Paginator dont le total est estimé au-delà du seuil.
+
+    Sous le seuil, l'estimation est confirmée par un COUNT(*) exact (peu
+    coûteux à cette taille). Au-delà, le total est approximatif : les
+    pages ne sont plus bornées par num_pages et l'existence d'une page
+    suivante est déterminée en lisant un élément de plus. Sur la dernière
+    page, le total redevient exact.
+    """
+
+    def __init__(self, *args, seuil=1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.seuil = seuil
+        self.est_estimation = False
+
+    @cached_property
+    def count(self):
+        estimation = estimer_nombre(self.object_list)
+        if estimation is not None and estimation >= self.seuil:
+            self.est_estimation = True
+            return estimation
+        return self.object_list.count()
+
+    def validate_number(self, number):
+        if not self.count or not self.est_estimation:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Le numéro de page doit être un entier')
+        if number < 1:
+            raise EmptyPage('Le numéro de page doit être supérieur ou égal à 1')
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.est_estimation:
+            return super().page(number)
+
+        bas = (number - 1) * self.per_page
+        elements = list(self.object_list[bas:bas + self.per_page + 1])
+        if not elements and number > 1:
+            raise EmptyPage('Cette page ne contient aucun résultat')
+        suivante = len(elements) > self.per_page
+        if not suivante:
+            # Dernière page : le total exact est connu
+            self.count = bas + len(elements)
+            self.est_estimation = False
+        return PageEstimee(elements[:self.per_page], number, self, suivante)
+
+
+class PaginationEstimee(PageNumberPagination):
+    """
+    Pagination par numéro de page avec total estimé au-delà du seuil
+    PAGINATION_SEUIL_ESTIMATION. La réponse indique count_is_estimate.
+    """
+
+    def django_paginator_class(self, *args, **kwargs):
+        seuil = getattr(settings, 'PAGINATION_SEUIL_ESTIMATION', 1000)
+        return PaginateurEstime(*args, seuil=seuil, **kwargs)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_is_estimate', self.page.paginator.est_estimation),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+# ========================================
+# CURSEUR
+# ========================================
+
+
+class PaginationCurseur(CursorPagination):
+    """
+    Pagination par curseur sur la clé de tri de la vue.
+
+    La clé est l'attribut `ordering_curseur` de la vue (par exemple
+    '-date_ajout'), qui doit être couvert par un index. Le paramètre
+    ?ordering est ignoré dans ce mode. Le total n'est calculé que sur
+    demande (?avec_total=true).
+    """
+
+    ordering = '-date_creation'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    parametre_total = 'avec_total'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'ordering_curseur', None) or self.ordering
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.total = None
+        if request.query_params.get(self.parametre_total, '').lower() in VALEURS_VRAIES:
+            self.total = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        contenu = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        if self.total is not None:
+            contenu['count'] = self.total
+        contenu['results'] = data
+        return Response(contenu)
+
+
+# ========================================
+# CHOIX DU MODE
+# ========================================
+
+class PaginationMixte(BasePagination):
+    """
+    Pagination par numéro de page, ou par curseur à la demande.
+
+    Le mode curseur est choisi par ?pagination=curseur (première page),
+    puis par le paramètre ?cursor des liens next / previous.
+    """
+
+    parametre_mode = 'pagination'
+    pagination_page = PageNumberPagination
+
+    def _mode_curseur(self, request):
+        return (
+            request.query_params.get(self.parametre_mode) == 'curseur'
+            or PaginationCurseur.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._mode_curseur(request):
+            self.delegue = PaginationCurseur()
+        else:
+            self.delegue = self.pagination_page()
+        return self.delegue.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.delegue.get_paginated_response(data)
+
+    def get_results(self, data):
+        return data['results']
+
+
+class PaginationCatalogue(PaginationMixte):
+    """Pagination mixte dont le mode page utilise un total estimé."""
+
+    pagination_page = PaginationEstimee
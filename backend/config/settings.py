@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'django_extensions',
 
     # App tierces
@@ -171,6 +172,9 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20,
 }
 
+# Total des listes du catalogue : estimation du planificateur au-delà de ce nombre de lignes
+PAGINATION_SEUIL_ESTIMATION = config('PAGINATION_SEUIL_ESTIMATION', default=1000, cast=int)
+
 #JWT Settings 
 
 
@@ -193,11 +197,28 @@ CACHES = {
         'LOCATION': f'redis://{REDIS_HOST}:{REDIS_PORT}/1',
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # Un Redis indisponible ne doit pas faire tomber l'API
+            'IGNORE_EXCEPTIONS': True,
         }
     }
 }
 
-# Celery Configuration (pour plus tard)
+# Cache du catalogue véhicules (durées en secondes)
+VEHICULES_CACHE_TTL_LISTE = config('VEHICULES_CACHE_TTL_LISTE', default=120, cast=int)
+VEHICULES_CACHE_TTL_DETAIL = config('VEHICULES_CACHE_TTL_DETAIL', default=300, cast=int)
+
+# Upload de photos par lot
+VEHICULES_PHOTOS_LOT_MAX = config('VEHICULES_PHOTOS_LOT_MAX', default=50, cast=int)
+VEHICULES_PHOTOS_TAILLE_MAX = config('VEHICULES_PHOTOS_TAILLE_MAX', default=10 * 1024 * 1024, cast=int)
+VEHICULES_PHOTOS_THREADS = config('VEHICULES_PHOTOS_THREADS', default=4, cast=int)
+
+# Import en masse de véhicules : lignes validées et insérées par lot
+VEHICULES_IMPORT_TAILLE_LOT = config('VEHICULES_IMPORT_TAILLE_LOT', default=500, cast=int)
+
+# Cache des tableaux de bord statistiques (secondes)
+STATISTIQUES_CACHE_TTL = config('STATISTIQUES_CACHE_TTL', default=60, cast=int)
+
+# Celery Configuration
 CELERY_BROKER_URL = f'redis://{REDIS_HOST}:{REDIS_PORT}/0'
 CELERY_RESULT_BACKEND = f'redis://{REDIS_HOST}:{REDIS_PORT}/0'
 CELERY_ACCEPT_CONTENT = ['json']
@@ -205,6 +226,57 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 
+# Tâches périodiques (celery -A config beat)
+CELERY_BEAT_SCHEDULE = {
+    'vider-compteurs-vues': {
+        'task': 'vehicules.tasks.vider_compteurs_vues',
+        'schedule': config('COMPTEURS_VUES_INTERVALLE_VIDAGE', default=60, cast=int),
+    },
+    'vider-file-historique': {
+        'task': 'favoris.tasks.vider_file_historique',
+        'schedule': config('HISTORIQUE_INTERVALLE_VIDAGE', default=10, cast=int),
+    },
+    'rafraichir-statistiques': {
+        'task': 'statistiques.tasks.rafraichir_statistiques',
+        'schedule': config('STATISTIQUES_INTERVALLE_RAFRAICHISSEMENT', default=300, cast=int),
+    },
+    'notifier-baisses-prix': {
+        'task': 'favoris.tasks.notifier_baisses_prix',
+        'schedule': config('ALERTES_PRIX_INTERVALLE', default=24 * 3600, cast=int),
+    },
+}
+
+# Compteurs de vues bufferisés (secondes entre deux reports en base, âge
+# d'un vidage interrompu repris au vidage suivant)
+COMPTEURS_VUES_INTERVALLE_VIDAGE = config('COMPTEURS_VUES_INTERVALLE_VIDAGE', default=60, cast=int)
+COMPTEURS_VUES_DELAI_ORPHELINS = config('COMPTEURS_VUES_DELAI_ORPHELINS', default=600, cast=int)
+
+# Compteurs dénormalisés (vehicules/compteurs_derives.py) : recalcul au
+# commit dans le processus, ou par un worker Celery si True
+COMPTEURS_DERIVES_ASYNCHRONE = config('COMPTEURS_DERIVES_ASYNCHRONE', default=False, cast=bool)
+
+# File d'écriture de l'historique (favoris/file_historique.py)
+HISTORIQUE_ECRITURE_SYNCHRONE = config('HISTORIQUE_ECRITURE_SYNCHRONE', default=False, cast=bool)
+HISTORIQUE_TAILLE_LOT = config('HISTORIQUE_TAILLE_LOT', default=200, cast=int)
+HISTORIQUE_TAILLE_MAX_FILE = config('HISTORIQUE_TAILLE_MAX_FILE', default=10000, cast=int)
+
+# Alertes prix des favoris (favoris/alertes_prix.py) : évaluées au
+# changement de prix par un worker Celery, ou dans le processus si True
+ALERTES_PRIX_SYNCHRONE = config('ALERTES_PRIX_SYNCHRONE', default=False, cast=bool)
+
+# Diffusion de notifications à une audience (notifications/diffusion.py)
+NOTIFICATIONS_DIFFUSION_TAILLE_LOT = config('NOTIFICATIONS_DIFFUSION_TAILLE_LOT', default=1000, cast=int)
+
+# Notifications en temps réel (notifications/temps_reel.py) : Redis pub/sub
+# et flux SSE (secondes entre deux messages de maintien, durée de validité
+# d'un ticket d'ouverture du flux)
+NOTIFICATIONS_TEMPS_REEL_REDIS_URL = config(
+    'NOTIFICATIONS_TEMPS_REEL_REDIS_URL',
+    default=f'redis://{REDIS_HOST}:{REDIS_PORT}/1'
+)
+NOTIFICATIONS_FLUX_PING = config('NOTIFICATIONS_FLUX_PING', default=15, cast=int)
+NOTIFICATIONS_FLUX_TICKET_TTL = config('NOTIFICATIONS_FLUX_TICKET_TTL', default=30, cast=int)
+
 # ========================================
 # MODÈLE UTILISATEUR PERSONNALISÉ
 # ========================================
@@ -15,6 +15,7 @@ from .serializers import (
     DemandeContactNotesSerializer
 )
 from users.permissions import IsClient, IsConcessionnaire
+from vehicules.models import prefetch_photo_principale
 
 
 # ========================================
@@ -45,6 +46,8 @@ class DemandeContactViewSet(viewsets.ModelViewSet):
         'vehicule__categorie',
         'concessionnaire',
         'repondu_par'
+    ).prefetch_related(
+        prefetch_photo_principale('vehicule__')
     )
     
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
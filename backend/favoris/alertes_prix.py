@@ -0,0 +1,164 @@
+# backend/favoris/alertes_prix.py
+# Détection des baisses de prix des favoris
+#
+# Le prix courant du véhicule (location si disponible, sinon vente) est
+# calculé en SQL et comparé à Favori.prix_initial dans la requête : seuls
+# les favoris en baisse sont lus. Les favoris sont parcourus par lots sur
+# la clé primaire (mémoire bornée quel que soit le volume) et les
+# notifications d'un lot sont créées par un seul bulk_create.
+#
+# Vehicule.save signale chaque changement de prix (prix_modifie) ; au
+# commit, seuls les favoris des véhicules modifiés sont évalués, par une
+# tâche Celery. Favori.prix_derniere_alerte retient le prix déjà notifié :
+# un client n'est notifié à nouveau que si le prix baisse encore. La tâche
+# de nuit reste un filet de sécurité (broker indisponible, update() en
+# masse) et profite de la même déduplication.
+
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Q, When
+
+
+def evaluation_synchrone():
+    return getattr(settings, 'ALERTES_PRIX_SYNCHRONE', False)
+
+
+def expression_prix_actuel(prefixe='vehicule__'):
+    """
+    Prix courant du véhicule, même règle que Vehicule.prix_courant : prix de
+    location s'il est proposé à la location, sinon prix de vente.
+    NULL si aucun prix n'est applicable.
+    """
+    return Case(
+        When(
+            Q(**{f'{prefixe}est_disponible_location': True, f'{prefixe}prix_location_jour__gt': 0}),
+            then=F(f'{prefixe}prix_location_jour')
+        ),
+        When(
+            Q(**{f'{prefixe}est_disponible_vente': True, f'{prefixe}prix_vente__gt': 0}),
+            then=F(f'{prefixe}prix_vente')
+        ),
+        default=None,
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def favoris_en_baisse(queryset=None):
+    """
+    Favoris avec alerte active dont le prix courant est inférieur au prix
+    initial, annotés de prix_actuel.
+    """
+    from favoris.models import Favori
+
+    if queryset is None:
+        queryset = Favori.objects.all()
+
+    return queryset.filter(
+        alerte_prix_active=True,
+        prix_initial__isnull=False
+    ).annotate(
+        prix_actuel=expression_prix_actuel()
+    ).filter(
+        prix_actuel__lt=F('prix_initial')
+    )
+
+
+def favoris_a_notifier(queryset=None):
+    """
+    Favoris en baisse dont le prix courant n'a pas encore été notifié :
+    jamais notifiés, ou prix inférieur au dernier prix notifié.
+    """
+    return favoris_en_baisse(queryset).filter(
+        Q(prix_derniere_alerte__isnull=True) | Q(prix_actuel__lt=F('prix_derniere_alerte'))
+    )
+
+
+def notifier_baisses_prix(taille_lot=2000, vehicule_ids=None):
+    """
+    Notifier les favoris en baisse non encore notifiés, lot par lot.
+
+    Les favoris d'un lot sont verrouillés le temps de créer les
+    notifications et d'enregistrer le prix notifié : deux évaluations
+    simultanées d'un même véhicule ne notifient qu'une fois.
+
+    Args:
+        taille_lot: Nombre de favoris par lot
+        vehicule_ids: Limiter l'évaluation aux favoris de ces véhicules
+
+    Returns:
+        Nombre de notifications créées
+    """
+    from favoris.models import Favori
+    from notifications.models import Notification
+
+    favoris = favoris_a_notifier()
+    if vehicule_ids is not None:
+        favoris = favoris.filter(vehicule_id__in=vehicule_ids)
+    favoris = favoris.select_related('vehicule__marque').order_by('pk')
+
+    total = 0
+    dernier = 0
+    while True:
+        with transaction.atomic():
+            lot = list(favoris.select_for_update(of=('self',)).filter(pk__gt=dernier)[:taille_lot])
+            if not lot:
+                break
+
+            Notification.objects.bulk_create(
+                [Notification.construire_favori_prix_baisse(favori) for favori in lot]
+            )
+            for favori in lot:
+                favori.prix_derniere_alerte = favori.prix_actuel
+            Favori.objects.bulk_update(lot, ['prix_derniere_alerte'])
+
+        total += len(lot)
+        dernier = lot[-1].pk
+
+    return total
+
+
+# ========================================
+# ÉVÉNEMENTS DE CHANGEMENT DE PRIX
+# ========================================
+
+_local = threading.local()
+
+
+def _en_attente():
+    if not hasattr(_local, 'en_attente'):
+        _local.en_attente = set()
+    return _local.en_attente
+
+
+def prix_modifie(vehicule_id):
+    """
+    Signaler le changement de prix d'un véhicule.
+
+    Les favoris du véhicule sont évalués au commit de la transaction
+    courante ; les véhicules modifiés dans une même transaction sont
+    évalués ensemble.
+    """
+    _en_attente().add(vehicule_id)
+    transaction.on_commit(vider)
+
+
+def vider():
+    """Évaluer les véhicules signalés du thread courant (appelé au commit)."""
+    en_attente = _en_attente()
+    if not en_attente:
+        return
+    vehicule_ids = sorted(en_attente)
+    en_attente.clear()
+
+    if not evaluation_synchrone():
+        from favoris.tasks import evaluer_alertes_prix
+        try:
+            evaluer_alertes_prix.delay(vehicule_ids)
+            return
+        except Exception:
+            # Broker indisponible : évaluer dans le processus
+            pass
+
+    notifier_baisses_prix(vehicule_ids=vehicule_ids)
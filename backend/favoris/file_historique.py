@@ -0,0 +1,286 @@
+# backend/favoris/file_historique.py
+# File d'écriture asynchrone de l'historique
+#
+# Les vues publient des événements légers dans une liste Redis ; un worker
+# (tâche Celery planifiée ou commande vider_file_historique) les insère
+# par lots avec bulk_create. Si Redis est indisponible, si la file est
+# pleine ou si HISTORIQUE_ECRITURE_SYNCHRONE est activé, l'événement est
+# écrit immédiatement. Un événement refusé par la base est déplacé dans une
+# liste de rejets, sans bloquer la file.
+
+import json
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import InterfaceError, OperationalError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+
+logger = logging.getLogger(__name__)
+
+CLE_FILE = 'historique:file'
+CLE_REJETS = 'historique:file:rejets'
+CLE_VERROU = 'historique:file:verrou'
+
+# Durée du verrou de vidage (secondes), prolongée à chaque lot
+DUREE_VERROU = 300
+
+
+def taille_lot():
+    """Nombre d'événements insérés par bulk_create."""
+    return getattr(settings, 'HISTORIQUE_TAILLE_LOT', 200)
+
+
+def taille_max_file():
+    """Au-delà de cette taille, les producteurs écrivent directement en base."""
+    return getattr(settings, 'HISTORIQUE_TAILLE_MAX_FILE', 10000)
+
+
+def ecriture_synchrone():
+    return getattr(settings, 'HISTORIQUE_ECRITURE_SYNCHRONE', False)
+
+
+def _connexion_redis():
+    """Retourner la connexion Redis brute, ou None si indisponible."""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except (ImportError, NotImplementedError):
+        return None
+
+
+# ========================================
+# PUBLICATION
+# ========================================
+
+def publier(evenement):
+    """
+    Publier un événement d'historique.
+
+    Args:
+        evenement: dict avec utilisateur_id, type_action, description,
+            vehicule_id, ip_address, user_agent, donnees_supplementaires
+            et date_action
+
+    Returns:
+        Instance Historique si l'écriture a été synchrone, sinon None
+    """
+    evenement.setdefault('date_action', timezone.now())
+
+    if ecriture_synchrone():
+        return _ecrire_un(evenement)
+
+    connexion = _connexion_redis()
+    if connexion is None:
+        return _ecrire_un(evenement)
+
+    try:
+        longueur = connexion.llen(CLE_FILE)
+        if longueur >= taille_max_file():
+            # Contre-pression : la file n'est pas vidée assez vite
+            logger.warning("File d'historique pleine (%s événements), écriture directe", longueur)
+            return _ecrire_un(evenement)
+
+        longueur = connexion.rpush(CLE_FILE, json.dumps(evenement, cls=DjangoJSONEncoder))
+    except Exception:
+        logger.exception("Redis indisponible, écriture directe de l'historique")
+        return _ecrire_un(evenement)
+
+    # Un lot complet est prêt : déclencher un vidage sans attendre la planification
+    if longueur % taille_lot() == 0:
+        _declencher_vidage()
+
+    return None
+
+
+def _ecrire_un(evenement):
+    objets = ecrire([evenement])
+    return objets[0] if objets else None
+
+
+def _declencher_vidage():
+    from favoris.tasks import vider_file_historique
+
+    try:
+        vider_file_historique.delay()
+    except Exception:
+        # Broker indisponible : le vidage planifié prendra le relais
+        pass
+
+
+# ========================================
+# ÉCRITURE
+# ========================================
+
+def ecrire(evenements):
+    """
+    Insérer des événements en base avec bulk_create.
+
+    Les événements dont l'utilisateur a été supprimé entre-temps sont
+    ignorés ; un véhicule supprimé est remplacé par NULL.
+
+    Returns:
+        Liste des instances Historique créées
+    """
+    from users.models import User
+    from vehicules.models import Vehicule
+    from favoris.models import Historique
+
+    if not evenements:
+        return []
+
+    utilisateurs = set(User.objects.filter(
+        pk__in={e['utilisateur_id'] for e in evenements}
+    ).values_list('pk', flat=True))
+
+    vehicules_ids = {e['vehicule_id'] for e in evenements if e.get('vehicule_id')}
+    vehicules = set(Vehicule.objects.filter(
+        pk__in=vehicules_ids
+    ).values_list('pk', flat=True)) if vehicules_ids else set()
+
+    objets = []
+    for e in evenements:
+        if e['utilisateur_id'] not in utilisateurs:
+            continue
+
+        date_action = e.get('date_action')
+        if isinstance(date_action, str):
+            date_action = parse_datetime(date_action)
+
+        objets.append(Historique(
+            utilisateur_id=e['utilisateur_id'],
+            type_action=e['type_action'],
+            description=e.get('description', ''),
+            vehicule_id=e.get('vehicule_id') if e.get('vehicule_id') in vehicules else None,
+            ip_address=e.get('ip_address'),
+            user_agent=e.get('user_agent', ''),
+            donnees_supplementaires=e.get('donnees_supplementaires') or {},
+            date_action=date_action or timezone.now(),
+        ))
+
+    return Historique.objects.bulk_create(objets, batch_size=taille_lot())
+
+
+def _si_proprietaire(connexion, jeton, commandes):
+    """
+    Exécuter commandes(pipeline) en une transaction Redis si le verrou
+    appartient encore à jeton (WATCH / MULTI).
+
+    Returns:
+        False si le verrou a expiré ou a été pris par un autre worker
+    """
+    from redis.exceptions import WatchError
+
+    with connexion.pipeline() as pipeline:
+        try:
+            pipeline.watch(CLE_VERROU)
+            valeur = pipeline.get(CLE_VERROU)
+            if valeur is None or valeur.decode() != jeton:
+                return False
+            pipeline.multi()
+            commandes(pipeline)
+            pipeline.execute()
+            return True
+        except WatchError:
+            return False
+
+
+def _ecrire_lot(bruts):
+    """
+    Insérer un lot d'événements bruts (JSON) en une transaction. Si la base
+    refuse le lot, les événements sont repris un par un.
+
+    Returns:
+        Liste des événements bruts refusés (à déplacer dans CLE_REJETS)
+
+    Raises:
+        OperationalError, InterfaceError: base indisponible (lot conservé)
+    """
+    try:
+        with transaction.atomic():
+            ecrire([json.loads(brut) for brut in bruts])
+        return []
+    except (OperationalError, InterfaceError):
+        raise
+    except Exception:
+        logger.exception("Lot d'historique refusé, reprise événement par événement")
+
+    rejetes = []
+    for brut in bruts:
+        try:
+            with transaction.atomic():
+                ecrire([json.loads(brut)])
+        except (OperationalError, InterfaceError):
+            raise
+        except Exception as erreur:
+            logger.error("Événement d'historique rejeté (%s) : %s", erreur, brut[:500])
+            rejetes.append(brut)
+    return rejetes
+
+
+def vider(max_lots=None):
+    """
+    Vider la file Redis par lots de taille_lot() événements.
+
+    Un verrou (jeton propre au worker, prolongé à chaque lot) empêche deux
+    workers de vider la file en même temps. Un lot n'est retiré de la file
+    qu'après son insertion ; les événements refusés par la base passent
+    dans la liste CLE_REJETS.
+
+    Args:
+        max_lots: Nombre maximal de lots à traiter (None = jusqu'à vider la file)
+
+    Returns:
+        Nombre d'événements retirés de la file (écrits ou rejetés)
+    """
+    connexion = _connexion_redis()
+    if connexion is None:
+        return 0
+
+    jeton = uuid.uuid4().hex
+    if not connexion.set(CLE_VERROU, jeton, nx=True, ex=DUREE_VERROU):
+        return 0
+
+    total = 0
+    lots = 0
+    try:
+        while max_lots is None or lots < max_lots:
+            if not _si_proprietaire(connexion, jeton, lambda pipeline: pipeline.expire(CLE_VERROU, DUREE_VERROU)):
+                logger.warning("Verrou de la file d'historique perdu, vidage interrompu")
+                break
+
+            bruts = connexion.lrange(CLE_FILE, 0, taille_lot() - 1)
+            if not bruts:
+                break
+
+            rejetes = _ecrire_lot(bruts)
+
+            def retirer(pipeline):
+                if rejetes:
+                    pipeline.rpush(CLE_REJETS, *rejetes)
+                pipeline.ltrim(CLE_FILE, len(bruts), -1)
+
+            if not _si_proprietaire(connexion, jeton, retirer):
+                logger.warning("Verrou de la file d'historique perdu, vidage interrompu")
+                break
+
+            total += len(bruts)
+            lots += 1
+    finally:
+        _si_proprietaire(connexion, jeton, lambda pipeline: pipeline.delete(CLE_VERROU))
+
+    return total
+
+
+def longueur_file(cle=CLE_FILE):
+    """Nombre d'événements en attente (ou rejetés, avec cle=CLE_REJETS)."""
+    connexion = _connexion_redis()
+    if connexion is None:
+        return 0
+    try:
+        return connexion.llen(cle)
+    except Exception:
+        return 0
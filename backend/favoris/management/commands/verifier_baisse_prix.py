@@ -1,26 +1,24 @@
 # backend/favoris/management/commands/verifier_baisse_prix.py
 from django.core.management.base import BaseCommand
-from favoris.models import Favori
-from notifications.models import Notification
+from favoris import alertes_prix
 
 
 class Command(BaseCommand):
     help = 'Vérifier les baisses de prix des favoris et notifier'
 
-    def handle(self, *args, **options):
-        """Vérifier tous les favoris avec alerte active."""
-        
-        favoris = Favori.objects.filter(alerte_prix_active=True).select_related(
-            'client', 'vehicule'
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--taille-lot',
+            type=int,
+            default=2000,
+            help='Nombre de favoris lus et notifiés par lot'
         )
+
+    def handle(self, *args, **options):
+        """Notifier tous les favoris avec alerte active dont le prix a baissé."""
         
-        count = 0
-        for favori in favoris:
-            if favori.verifier_baisse_prix():
-                # Créer notification
-                Notification.notifier_favori_prix_baisse(favori)
-                count += 1
+        count = alertes_prix.notifier_baisses_prix(taille_lot=options['taille_lot'])
         
         self.stdout.write(
             self.style.SUCCESS(f'{count} notification(s) de baisse de prix envoyée(s)')
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,30 @@
+# backend/favoris/management/commands/vider_file_historique.py
+from django.core.management.base import BaseCommand
+from favoris import file_historique
+
+
+class Command(BaseCommand):
+    help = "Insérer en base les événements d'historique en attente dans la file Redis"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-lots',
+            type=int,
+            default=None,
+            help='Nombre maximal de lots à traiter (défaut : vider toute la file)'
+        )
+
+    def handle(self, *args, **options):
+        """Vider la file d'historique."""
+        
+        total = file_historique.vider(max_lots=options['max_lots'])
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{total} événement(s) traité(s), {file_historique.longueur_file()} en attente'
+            )
+        )
+        
+        rejets = file_historique.longueur_file(file_historique.CLE_REJETS)
+        if rejets:
+            self.stderr.write(f'{rejets} événement(s) rejeté(s) dans {file_historique.CLE_REJETS}')
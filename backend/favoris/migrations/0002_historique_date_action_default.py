@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favoris', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='historique',
+            name='date_action',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name="Date de l'action"),
+        ),
+    ]
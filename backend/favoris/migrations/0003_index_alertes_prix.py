@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favoris', '0002_historique_date_action_default'),
+        ('vehicules', '0006_notes_incrementales'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='favori',
+            index=models.Index(condition=models.Q(('alerte_prix_active', True)), fields=['id'], name='favori_alerte_prix_idx'),
+        ),
+    ]
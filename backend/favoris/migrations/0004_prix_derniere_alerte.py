@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:48
+
+from django.db import migrations, models
+from django.db.models import Case, F, OuterRef, Q, Subquery, When
+
+
+def marquer_baisses_notifiees(apps, schema_editor):
+    """Les baisses en cours ont déjà été notifiées par la tâche de nuit."""
+    Favori = apps.get_model('favoris', 'Favori')
+    Vehicule = apps.get_model('vehicules', 'Vehicule')
+
+    # Prix courant du véhicule, figé à la date de la migration
+    prix_courant = Case(
+        When(Q(est_disponible_location=True, prix_location_jour__gt=0), then=F('prix_location_jour')),
+        When(Q(est_disponible_vente=True, prix_vente__gt=0), then=F('prix_vente')),
+        default=None,
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+    )
+    prix_actuel = Subquery(
+        Vehicule.objects.filter(pk=OuterRef('vehicule_id')).annotate(
+            prix=prix_courant
+        ).values('prix')[:1]
+    )
+    Favori.objects.filter(
+        alerte_prix_active=True,
+        prix_initial__isnull=False
+    ).annotate(
+        prix_actuel=prix_actuel
+    ).filter(
+        prix_actuel__lt=F('prix_initial')
+    ).update(prix_derniere_alerte=prix_actuel)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('favoris', '0003_index_alertes_prix'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='favori',
+            name='prix_derniere_alerte',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text="Prix déjà notifié : pas de nouvelle alerte tant qu'il ne baisse pas encore", max_digits=12, null=True, verbose_name='Prix de la dernière alerte (FCFA)'),
+        ),
+        migrations.RunPython(marquer_baisses_notifiees, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@
 # Modèles pour les favoris et l'historique
 
 from django.db import models
+from django.utils import timezone
 from users.models import User
 from vehicules.models import Vehicule
 
@@ -61,6 +62,16 @@ class Favori(models.Model):
         help_text="Prix au moment de l'ajout aux favoris"
     )
     
+    prix_derniere_alerte = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name="Prix de la dernière alerte (FCFA)",
+        help_text="Prix déjà notifié : pas de nouvelle alerte tant qu'il ne baisse pas encore"
+    )
+    
     # Notes personnelles
     notes = models.TextField(
         blank=True,
@@ -80,6 +91,8 @@ class Favori(models.Model):
         indexes = [
             models.Index(fields=['client', 'date_ajout']),
             models.Index(fields=['vehicule']),
+            # Parcours par lots des alertes actives (favoris/alertes_prix.py)
+            models.Index(fields=['id'], condition=models.Q(alerte_prix_active=True), name='favori_alerte_prix_idx'),
         ]
     
     def __str__(self):
@@ -96,37 +109,33 @@ class Favori(models.Model):
         
         super().save(*args, **kwargs)
     
+    def _prix_actuel(self):
+        """
+        Prix courant du véhicule : annotation prix_actuel si le favori vient
+        de favoris/alertes_prix.py, sinon calculé depuis le véhicule.
+        """
+        if hasattr(self, 'prix_actuel'):
+            return self.prix_actuel
+        return self.vehicule.prix_courant
+
     def verifier_baisse_prix(self):
         """Vérifier si le prix a baissé depuis l'ajout aux favoris."""
         if not self.prix_initial:
             return False
-        
-        prix_actuel = None
-        if self.vehicule.est_disponible_location and self.vehicule.prix_location_jour:
-            prix_actuel = self.vehicule.prix_location_jour
-        elif self.vehicule.est_disponible_vente and self.vehicule.prix_vente:
-            prix_actuel = self.vehicule.prix_vente
-        
-        if prix_actuel and prix_actuel < self.prix_initial:
-            return True
-        
-        return False
-    
+
+        prix_actuel = self._prix_actuel()
+        return bool(prix_actuel and prix_actuel < self.prix_initial)
+
     @property
     def difference_prix(self):
         """Calculer la différence de prix."""
         if not self.prix_initial:
             return None
-        
-        prix_actuel = None
-        if self.vehicule.est_disponible_location and self.vehicule.prix_location_jour:
-            prix_actuel = self.vehicule.prix_location_jour
-        elif self.vehicule.est_disponible_vente and self.vehicule.prix_vente:
-            prix_actuel = self.vehicule.prix_vente
-        
+
+        prix_actuel = self._prix_actuel()
         if prix_actuel:
             return prix_actuel - self.prix_initial
-        
+
         return None
 
 
@@ -242,8 +251,10 @@ class Historique(models.Model):
     # MÉTADONNÉES
     # ========================================
     
+    # Horodatage fourni à la publication : l'écriture peut être différée
     date_action = models.DateTimeField(
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         verbose_name="Date de l'action"
     )
     
@@ -277,8 +288,11 @@ class Historique(models.Model):
             **kwargs: Données supplémentaires (request, etc.)
         
         Returns:
-            Instance Historique créée
+            Instance Historique créée, ou None si l'écriture est différée
+            (voir favoris/file_historique.py)
         """
+        from favoris import file_historique
+        
         donnees = {}
         
         # Extraire IP et User Agent de la request si fournie
@@ -303,15 +317,15 @@ class Historique(models.Model):
         # Stocker les autres données
         donnees = kwargs
         
-        return cls.objects.create(
-            utilisateur=utilisateur,
-            type_action=type_action,
-            description=description,
-            vehicule=vehicule,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            donnees_supplementaires=donnees
-        )
+        return file_historique.publier({
+            'utilisateur_id': utilisateur.pk,
+            'type_action': type_action,
+            'description': description,
+            'vehicule_id': vehicule.pk if vehicule else None,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'donnees_supplementaires': donnees,
+        })
     
     @property
     def action_display(self):
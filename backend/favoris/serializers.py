@@ -35,13 +35,13 @@ class VehiculeMinimalSerializer(serializers.ModelSerializer):
         read_only_fields = fields
     
     def get_photo_principale(self, obj):
-        """Retourner l'URL de la photo principale."""
+        """Retourner l'URL de la miniature de la photo principale."""
         photo = obj.photo_principale
         if photo and photo.image:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(photo.image.url)
-            return photo.image.url
+                return request.build_absolute_uri(photo.url_variante('miniature'))
+            return photo.url_variante('miniature')
         return None
 
 
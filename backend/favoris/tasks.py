@@ -0,0 +1,28 @@
+# backend/favoris/tasks.py
+# Tâches Celery de l'app favoris
+
+from celery import shared_task
+
+from favoris import file_historique
+
+
+@shared_task
+def vider_file_historique():
+    """Insérer par lots les événements d'historique en attente."""
+    return file_historique.vider()
+
+
+@shared_task
+def notifier_baisses_prix():
+    """Notifier les baisses de prix non encore notifiées (tâche de nuit, filet de sécurité)."""
+    from favoris import alertes_prix
+
+    return alertes_prix.notifier_baisses_prix()
+
+
+@shared_task
+def evaluer_alertes_prix(vehicule_ids):
+    """Évaluer les alertes prix des favoris de véhicules dont le prix a changé."""
+    from favoris import alertes_prix
+
+    return alertes_prix.notifier_baisses_prix(vehicule_ids=vehicule_ids)
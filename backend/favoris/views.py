@@ -13,6 +13,9 @@ from .serializers import (
     HistoriqueSerializer
 )
 from users.permissions import IsClient
+from config.pagination import PaginationMixte
+from vehicules.models import prefetch_photo_principale
+from favoris import alertes_prix
 
 
 # ========================================
@@ -37,7 +40,7 @@ class FavoriViewSet(viewsets.ModelViewSet):
         'vehicule',
         'vehicule__marque',
         'vehicule__categorie'
-    ).prefetch_related('vehicule__photos')
+    ).prefetch_related(prefetch_photo_principale('vehicule__'))
     
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     permission_classes = [permissions.IsAuthenticated, IsClient]
@@ -111,11 +114,8 @@ class FavoriViewSet(viewsets.ModelViewSet):
         Récupérer les favoris avec alerte prix active et prix ayant baissé.
         GET /api/favoris/alertes-prix/
         """
-        favoris_avec_baisse = []
-        
-        for favori in self.get_queryset().filter(alerte_prix_active=True):
-            if favori.verifier_baisse_prix():
-                favoris_avec_baisse.append(favori)
+        # Comparaison prix initial / prix courant faite en SQL
+        favoris_avec_baisse = alertes_prix.favoris_en_baisse(self.get_queryset())
         
         serializer = FavoriSerializer(
             favoris_avec_baisse,
@@ -182,6 +182,10 @@ class HistoriqueViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ['date_action']
     ordering = ['-date_action']
     
+    # Pagination : ?page=N, ou curseur sur la date (?pagination=curseur)
+    pagination_class = PaginationMixte
+    ordering_curseur = '-date_action'
+    
     def get_queryset(self):
         """Filtrer uniquement l'historique de l'utilisateur connecté."""
         return super().get_queryset().filter(utilisateur=self.request.user)
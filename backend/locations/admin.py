@@ -228,7 +228,14 @@ class LocationAdmin(admin.ModelAdmin):
     
     def marquer_annulee(self, request, queryset):
         """Marquer les locations comme annulées."""
-        count = queryset.filter(statut='DEMANDE').update(statut='ANNULEE')
+        from statistiques.agregats import marquer_jours
+        
+        demandes = queryset.filter(statut='DEMANDE')
+        jours = list(demandes.values_list('date_creation', flat=True))
+        count = demandes.update(statut='ANNULEE')
+        
+        # update() ne déclenche pas les signaux des agrégats
+        marquer_jours(*jours)
         self.message_user(request, f'{count} location(s) annulée(s).')
     marquer_annulee.short_description = 'Marquer annulée'
     
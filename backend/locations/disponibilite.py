@@ -0,0 +1,110 @@
+# backend/locations/disponibilite.py
+# Moteur de disponibilité des véhicules à la location
+#
+# Une location occupe le véhicule du date_debut au date_fin inclus.
+# Sous PostgreSQL, les chevauchements sont recherchés avec l'opérateur &&
+# sur daterange(date_debut, date_fin, '[]'), couvert par l'index GiST de
+# la contrainte d'exclusion location_sans_chevauchement : une seule requête
+# indexée suffit, et la base refuse elle-même les doubles réservations.
+
+from django.contrib.postgres.fields import DateRangeField, RangeBoundary
+from django.db import connection
+from django.db.models import Exists, Func, OuterRef
+
+
+# Statuts qui réservent le véhicule sur la période
+STATUTS_BLOQUANTS = ['DEMANDE', 'CONFIRMEE', 'EN_COURS']
+
+# Statuts véhicule compatibles avec une réservation future
+# (un véhicule LOUE est libre en dehors de ses locations en cours)
+STATUTS_VEHICULE_LOUABLES = ['DISPONIBLE', 'LOUE']
+
+
+def plage_dates(debut, fin):
+    """
+    Expression SQL daterange(debut, fin, '[]').
+
+    Un simple Func (pas une sous-classe) : la contrainte d'exclusion qui
+    l'utilise se décrit dans les migrations sans importer ce module.
+    """
+    return Func(
+        debut, fin, RangeBoundary(inclusive_lower=True, inclusive_upper=True),
+        function='DATERANGE', output_field=DateRangeField()
+    )
+
+
+def _supporte_plages():
+    return connection.vendor == 'postgresql'
+
+
+def locations_en_conflit(date_debut, date_fin, vehicule=None, exclure=None):
+    """
+    Locations bloquantes qui chevauchent la période [date_debut, date_fin].
+
+    Args:
+        date_debut: Date de début (incluse)
+        date_fin: Date de fin (incluse)
+        vehicule: Instance ou id de véhicule (optionnel)
+        exclure: Instance ou id de location à ignorer (modification)
+
+    Returns:
+        QuerySet de Location
+    """
+    from locations.models import Location
+
+    queryset = Location.objects.filter(statut__in=STATUTS_BLOQUANTS)
+
+    if vehicule is not None:
+        queryset = queryset.filter(vehicule=vehicule)
+
+    if _supporte_plages():
+        from django.db.backends.postgresql.psycopg_any import DateRange
+
+        queryset = queryset.annotate(
+            periode=plage_dates('date_debut', 'date_fin')
+        ).filter(
+            periode__overlap=DateRange(date_debut, date_fin, '[]')
+        )
+    else:
+        queryset = queryset.filter(
+            date_debut__lte=date_fin,
+            date_fin__gte=date_debut
+        )
+
+    if exclure is not None:
+        queryset = queryset.exclude(pk=getattr(exclure, 'pk', exclure))
+
+    return queryset
+
+
+def est_disponible(vehicule, date_debut, date_fin, exclure=None):
+    """Le véhicule est-il libre sur toute la période ?"""
+    return not locations_en_conflit(
+        date_debut, date_fin, vehicule=vehicule, exclure=exclure
+    ).exists()
+
+
+def vehicules_disponibles(date_debut, date_fin, queryset=None):
+    """
+    Véhicules louables et libres sur toute la période.
+
+    Le filtre est un anti-join (NOT EXISTS) corrélé sur l'index de la
+    contrainte d'exclusion : le QuerySet reste une seule requête et peut
+    être combiné avec les autres filtres du catalogue.
+
+    Args:
+        queryset: QuerySet de Vehicule à restreindre (défaut : tous)
+    """
+    from vehicules.models import Vehicule
+
+    if queryset is None:
+        queryset = Vehicule.objects.all()
+
+    conflits = locations_en_conflit(date_debut, date_fin).filter(
+        vehicule=OuterRef('pk')
+    )
+
+    return queryset.filter(
+        est_disponible_location=True,
+        statut__in=STATUTS_VEHICULE_LOUABLES,
+    ).filter(~Exists(conflits))
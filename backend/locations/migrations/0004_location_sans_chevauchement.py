@@ -0,0 +1,70 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:06
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef
+
+
+STATUTS_BLOQUANTS = ['DEMANDE', 'CONFIRMEE', 'EN_COURS']
+
+# Réservation conservée en priorité quand deux réservations se chevauchent
+PRIORITE_STATUT = {'EN_COURS': 0, 'CONFIRMEE': 1, 'DEMANDE': 2}
+
+
+def annuler_chevauchements(apps, schema_editor):
+    """
+    Annuler les doubles réservations existantes, refusées par la contrainte.
+
+    Pour chaque véhicule concerné, les réservations sont conservées par
+    statut (en cours, confirmée, demande) puis par ancienneté ; une
+    réservation qui chevauche une réservation conservée est annulée.
+    """
+    Location = apps.get_model('locations', 'Location')
+
+    bloquantes = Location.objects.filter(statut__in=STATUTS_BLOQUANTS)
+    vehicules = bloquantes.filter(Exists(bloquantes.filter(
+        vehicule_id=OuterRef('vehicule_id'),
+        date_debut__lte=OuterRef('date_fin'),
+        date_fin__gte=OuterRef('date_debut'),
+    ).exclude(pk=OuterRef('pk')))).values_list('vehicule_id', flat=True).distinct()
+
+    for vehicule_id in list(vehicules):
+        locations = sorted(
+            bloquantes.filter(vehicule_id=vehicule_id).only('statut', 'date_debut', 'date_fin', 'date_creation'),
+            key=lambda location: (PRIORITE_STATUT[location.statut], location.date_creation, location.pk)
+        )
+        conservees = []
+        a_annuler = []
+        for location in locations:
+            if any(
+                location.date_debut <= autre.date_fin and location.date_fin >= autre.date_debut
+                for autre in conservees
+            ):
+                a_annuler.append(location.pk)
+            else:
+                conservees.append(location)
+        Location.objects.filter(pk__in=a_annuler).update(statut='ANNULEE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('concessions', '0001_initial'),
+        ('locations', '0003_location_promotion'),
+        ('promotions', '0001_initial'),
+        ('vehicules', '0002_remove_vehicule_image_principale_photo_video_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Égalité sur vehicule_id dans un index GiST
+        BtreeGistExtension(),
+        migrations.RunPython(annuler_chevauchements, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='location',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('statut__in', ['DEMANDE', 'CONFIRMEE', 'EN_COURS'])), expressions=[('vehicule', '='), (models.Func('date_debut', 'date_fin', django.contrib.postgres.fields.ranges.RangeBoundary(inclusive_lower=True, inclusive_upper=True), function='DATERANGE', output_field=django.contrib.postgres.fields.ranges.DateRangeField()), '&&')], name='location_sans_chevauchement'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('concessions', '0001_initial'),
+        ('locations', '0004_location_sans_chevauchement'),
+        ('promotions', '0001_initial'),
+        ('vehicules', '0003_recherche_plein_texte'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['client', 'date_creation'], name='locations_l_client__1a5d2d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['concessionnaire', 'date_creation'], name='locations_l_concess_543eac_idx'),
+        ),
+    ]
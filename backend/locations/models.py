@@ -2,6 +2,9 @@
 # Modèles pour le système de location
 
 from django.db import models
+from django.db.models import Q
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import RangeOperators
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError
 from users.models import User
@@ -10,6 +13,7 @@ from concessions.models import Concession
 from decimal import Decimal
 import uuid
 from promotions.models import Promotion, UtilisationPromotion
+from .disponibilite import plage_dates, STATUTS_BLOQUANTS
 
 
 # ========================================
@@ -271,6 +275,20 @@ class Location(models.Model):
             models.Index(fields=['concessionnaire', 'statut']),
             models.Index(fields=['date_debut', 'date_fin']),
             models.Index(fields=['statut', 'date_creation']),
+            models.Index(fields=['client', 'date_creation']),
+            models.Index(fields=['concessionnaire', 'date_creation']),
+        ]
+        constraints = [
+            # Pas de double réservation : index GiST (btree_gist) sur
+            # (vehicule, daterange(date_debut, date_fin, '[]'))
+            ExclusionConstraint(
+                name='location_sans_chevauchement',
+                expressions=[
+                    ('vehicule', RangeOperators.EQUAL),
+                    (plage_dates('date_debut', 'date_fin'), RangeOperators.OVERLAPS),
+                ],
+                condition=Q(statut__in=STATUTS_BLOQUANTS),
+            ),
         ]
     
     def __str__(self):
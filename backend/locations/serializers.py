@@ -1,8 +1,10 @@
 # backend/locations/serializers.py
 # Serializers pour les locations
 
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import Location, ContratLocation
+from .disponibilite import est_disponible, STATUTS_VEHICULE_LOUABLES
 from users.models import User
 from vehicules.models import Vehicule
 from concessions.models import Concession
@@ -49,13 +51,13 @@ class VehiculeMinimalSerializer(serializers.ModelSerializer):
         read_only_fields = fields
     
     def get_photo_principale(self, obj):
-        """Retourner l'URL de la photo principale."""
+        """Retourner l'URL de la miniature de la photo principale."""
         photo = obj.photo_principale
         if photo and photo.image:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(photo.image.url)
-            return photo.image.url
+                return request.build_absolute_uri(photo.url_variante('miniature'))
+            return photo.url_variante('miniature')
         return None
 
 
@@ -267,7 +269,7 @@ class LocationCreateSerializer(serializers.ModelSerializer):
     vehicule_id = serializers.PrimaryKeyRelatedField(
         queryset=Vehicule.objects.filter(
             est_disponible_location=True,
-            statut='DISPONIBLE'
+            statut__in=STATUTS_VEHICULE_LOUABLES
         ),
         source='vehicule',
         write_only=True,
@@ -386,21 +388,39 @@ class LocationCreateSerializer(serializers.ModelSerializer):
             except Promotion.DoesNotExist:
                 pass  # Code invalide, on ignore silencieusement
         
-        # Créer la location
-        location = Location.objects.create(**validated_data)
-        
-        # Enregistrer l'utilisation de la promotion
-        if promotion and montant_reduction > 0:
-            UtilisationPromotion.objects.create(
-                promotion=promotion,
-                client=location.client,
-                location=location,
-                montant_reduction=montant_reduction
-            )
-            
-            # Incrémenter le compteur
-            promotion.nombre_utilisations += 1
-            promotion.save(update_fields=['nombre_utilisations'])
+        message_conflit = "Ce véhicule est déjà réservé sur cette période"
+
+        try:
+            with transaction.atomic():
+                # Verrouiller le véhicule : deux demandes simultanées sur
+                # le même véhicule sont sérialisées
+                Vehicule.objects.select_for_update().filter(pk=vehicule.pk).first()
+
+                if not est_disponible(vehicule, date_debut, date_fin):
+                    raise serializers.ValidationError({'vehicule_id': message_conflit})
+
+                # Créer la location
+                location = Location.objects.create(**validated_data)
+
+                # Enregistrer l'utilisation de la promotion
+                if promotion and montant_reduction > 0:
+                    UtilisationPromotion.objects.create(
+                        promotion=promotion,
+                        client=location.client,
+                        location=location,
+                        montant_reduction=montant_reduction
+                    )
+
+                    # Incrémenter le compteur
+                    promotion.nombre_utilisations += 1
+                    promotion.save(update_fields=['nombre_utilisations'])
+        except IntegrityError as erreur:
+            # Seule la contrainte location_sans_chevauchement signifie
+            # « déjà réservé » ; toute autre violation est une vraie erreur
+            diag = getattr(erreur.__cause__, 'diag', None)
+            if getattr(diag, 'constraint_name', None) != 'location_sans_chevauchement':
+                raise
+            raise serializers.ValidationError({'vehicule_id': message_conflit})
         
         return location
 
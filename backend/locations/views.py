@@ -20,6 +20,8 @@ from .serializers import (
     ContratLocationSerializer
 )
 from users.permissions import IsClient, IsConcessionnaire
+from config.pagination import PaginationMixte
+from vehicules.models import prefetch_photo_principale
 
 
 # ========================================
@@ -54,7 +56,7 @@ class LocationViewSet(viewsets.ModelViewSet):
         'concessionnaire',
         'concession'
     ).prefetch_related(
-        'vehicule__photos'
+        prefetch_photo_principale('vehicule__')
     )
     
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -87,6 +89,10 @@ class LocationViewSet(viewsets.ModelViewSet):
     ]
     ordering = ['-date_creation']
     
+    # Pagination : ?page=N, ou curseur sur la date (?pagination=curseur)
+    pagination_class = PaginationMixte
+    ordering_curseur = '-date_creation'
+    
     def get_serializer_class(self):
         """Retourner le serializer approprié selon l'action."""
         if self.action == 'list':
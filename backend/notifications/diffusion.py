@@ -0,0 +1,172 @@
+# backend/notifications/diffusion.py
+# Diffusion d'une notification à une audience
+#
+# Une audience est une requête sur les utilisateurs (tous les clients,
+# clients d'une concession, clients ayant un véhicule en favori), filtrée
+# en SQL selon User.preferences_notifications. Les destinataires sont lus
+# par lots d'identifiants sur la clé primaire (aucun utilisateur chargé en
+# mémoire) et chaque lot est matérialisé par un seul bulk_create. La
+# diffusion s'exécute dans un worker Celery (tâche diffuser_notification).
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef
+
+
+def taille_lot():
+    """Nombre de notifications créées par bulk_create."""
+    return getattr(settings, 'NOTIFICATIONS_DIFFUSION_TAILLE_LOT', 1000)
+
+
+# Champs de Notification repris du contenu diffusé
+CHAMPS_CONTENU = (
+    'type_notification',
+    'titre',
+    'message',
+    'niveau_priorite',
+    'lien',
+    'texte_action',
+    'donnees_supplementaires',
+    'date_expiration',
+)
+
+# Préférence consultée par défaut selon le type de notification
+PREFERENCE_PAR_TYPE = {
+    'DEMANDE_': 'notifications_demandes',
+    'LOCATION_': 'notifications_reservations',
+    'AVIS_': 'notifications_avis',
+}
+
+# Autres types (INFORMATION, ALERTE, FAVORI_...) : une diffusion reste un
+# message promotionnel, que le client peut refuser
+PREFERENCE_DEFAUT = 'notifications_promotions'
+
+
+def preference_du_type(type_notification):
+    """Préférence (User.PREFERENCES_NOTIFICATIONS_DEFAUT) consultée pour un type."""
+    for prefixe, preference in PREFERENCE_PAR_TYPE.items():
+        if type_notification.startswith(prefixe):
+            return preference
+    return PREFERENCE_DEFAUT
+
+
+# ========================================
+# AUDIENCES
+# ========================================
+
+def _clients():
+    from users.models import User
+    return User.objects.filter(type_utilisateur='CLIENT', is_active=True)
+
+
+def _clients_concession(concession_id):
+    """Clients ayant loué un véhicule de la concession."""
+    from locations.models import Location
+    return _clients().filter(
+        Exists(Location.objects.filter(client=OuterRef('pk'), vehicule__concession_id=concession_id))
+    )
+
+
+def _favoris_vehicule(vehicule_id):
+    """Clients ayant le véhicule en favori."""
+    from favoris.models import Favori
+    return _clients().filter(
+        Exists(Favori.objects.filter(client=OuterRef('pk'), vehicule_id=vehicule_id))
+    )
+
+
+# nom : (requête, paramètres obligatoires)
+AUDIENCES = {
+    'clients': (_clients, ()),
+    'clients_concession': (_clients_concession, ('concession_id',)),
+    'favoris_vehicule': (_favoris_vehicule, ('vehicule_id',)),
+}
+
+
+def destinataires(audience, parametres=None, preference=None):
+    """
+    Utilisateurs d'une audience acceptant la préférence donnée.
+
+    Une préférence absente de preferences_notifications prend sa valeur
+    par défaut (User.PREFERENCES_NOTIFICATIONS_DEFAUT).
+
+    Raises:
+        ValueError: audience inconnue ou paramètre manquant
+    """
+    from users.models import User
+
+    if audience not in AUDIENCES:
+        raise ValueError(f"Audience inconnue : {audience}")
+    requete, obligatoires = AUDIENCES[audience]
+    parametres = parametres or {}
+    manquants = [nom for nom in obligatoires if parametres.get(nom) is None]
+    if manquants:
+        raise ValueError(f"Paramètre(s) manquant(s) pour {audience} : {', '.join(manquants)}")
+
+    queryset = requete(**{nom: parametres[nom] for nom in obligatoires})
+
+    if preference is not None:
+        if User.PREFERENCES_NOTIFICATIONS_DEFAUT.get(preference, True):
+            queryset = queryset.exclude(preferences_notifications__contains={preference: False})
+        else:
+            queryset = queryset.filter(preferences_notifications__contains={preference: True})
+
+    return queryset
+
+
+# ========================================
+# DIFFUSION
+# ========================================
+
+def diffuser(audience, contenu, parametres=None, preference=None, taille=None):
+    """
+    Créer la notification pour chaque destinataire de l'audience, par lots.
+
+    Args:
+        audience: Nom de l'audience (AUDIENCES)
+        contenu: dict des champs de la notification (CHAMPS_CONTENU)
+        parametres: Paramètres de l'audience (concession_id, vehicule_id)
+        preference: Préférence à respecter (défaut : selon le type,
+            notifications_promotions sinon)
+        taille: Nombre de notifications par bulk_create
+
+    Returns:
+        Nombre de notifications créées
+    """
+    from notifications.models import Notification
+
+    if preference is None:
+        preference = preference_du_type(contenu['type_notification'])
+    taille = taille or taille_lot()
+    champs = {champ: contenu[champ] for champ in CHAMPS_CONTENU if contenu.get(champ) is not None}
+
+    ids = destinataires(audience, parametres, preference).order_by('pk').values_list('pk', flat=True)
+
+    total = 0
+    dernier = 0
+    while True:
+        lot = list(ids.filter(pk__gt=dernier)[:taille])
+        if not lot:
+            break
+
+        Notification.objects.bulk_create(
+            [Notification(destinataire_id=destinataire_id, **champs) for destinataire_id in lot]
+        )
+        total += len(lot)
+        dernier = lot[-1]
+
+    return total
+
+
+def lancer(audience, contenu, parametres=None, preference=None):
+    """
+    Lancer la diffusion dans un worker Celery (dans le processus si le
+    broker est indisponible). Le contenu doit être sérialisable en JSON.
+    """
+    from notifications.tasks import diffuser_notification
+
+    try:
+        diffuser_notification.delay(audience, contenu, parametres, preference)
+        return None
+    except Exception:
+        # Broker indisponible : diffuser dans le processus
+        return diffuser(audience, contenu, parametres, preference)
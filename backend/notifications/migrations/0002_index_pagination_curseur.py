@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['destinataire', 'date_creation'], name='notificatio_destina_d2c771_idx'),
+        ),
+    ]
@@ -3,6 +3,16 @@
 
 from django.db import models
 from users.models import User
+from notifications import temps_reel
+
+
+class NotificationManager(models.Manager):
+    """Publie en temps réel les notifications créées par lot."""
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        notifications = super().bulk_create(objs, *args, **kwargs)
+        temps_reel.notifications_creees(notifications)
+        return notifications
 
 
 class Notification(models.Model):
@@ -158,6 +168,8 @@ class Notification(models.Model):
         help_text="Notification expirée après cette date"
     )
     
+    objects = NotificationManager()
+    
     # ========================================
     # META & MÉTHODES
     # ========================================
@@ -168,6 +180,7 @@ class Notification(models.Model):
         ordering = ['-date_creation']
         indexes = [
             models.Index(fields=['destinataire', 'est_lue', 'date_creation']),
+            models.Index(fields=['destinataire', 'date_creation']),
             models.Index(fields=['type_notification']),
             models.Index(fields=['niveau_priorite']),
         ]
@@ -176,6 +189,23 @@ class Notification(models.Model):
         statut = "✓" if self.est_lue else "●"
         return f"{statut} {self.destinataire.nom_complet} - {self.titre}"
     
+    def save(self, *args, **kwargs):
+        """Override save : publier la nouvelle notification (temps_reel)."""
+        is_new = self.pk is None
+        super().save(*args, **kwargs)
+        
+        if is_new:
+            temps_reel.notifications_creees([self])
+    
+    def delete(self, *args, **kwargs):
+        """Override delete : publier le compteur si la notification était non lue."""
+        destinataire_id = self.destinataire_id
+        resultat = super().delete(*args, **kwargs)
+        
+        if not self.est_lue:
+            temps_reel.compteur_modifie(destinataire_id)
+        return resultat
+    
     def marquer_comme_lue(self):
         """Marquer la notification comme lue."""
         if not self.est_lue:
@@ -183,6 +213,7 @@ class Notification(models.Model):
             self.est_lue = True
             self.date_lecture = timezone.now()
             self.save(update_fields=['est_lue', 'date_lecture'])
+            temps_reel.compteur_modifie(self.destinataire_id)
     
     def marquer_comme_non_lue(self):
         """Marquer la notification comme non lue."""
@@ -190,6 +221,7 @@ class Notification(models.Model):
             self.est_lue = False
             self.date_lecture = None
             self.save(update_fields=['est_lue', 'date_lecture'])
+            temps_reel.compteur_modifie(self.destinataire_id)
     
     @classmethod
     def creer_notification(cls, destinataire, type_notification, titre, message, **kwargs):
@@ -300,24 +332,35 @@ class Notification(models.Model):
             texte_action="Accéder au tableau de bord"
         )
     
+    @classmethod
+    def construire_favori_prix_baisse(cls, favori):
+        """
+        Notification (non enregistrée) de baisse de prix d'un favori, pour
+        un enregistrement par lot (bulk_create).
+        """
+        difference = favori.difference_prix
+        return cls(
+            destinataire_id=favori.client_id,
+            type_notification='FAVORI_PRIX_BAISSE',
+            titre="Prix baissé !",
+            message=f"Le prix de {favori.vehicule.nom_complet} a baissé de {abs(int(difference)):,} FCFA",
+            niveau_priorite='HAUTE',
+            lien=f"/vehicules/{favori.vehicule_id}",
+            texte_action="Voir le véhicule",
+            donnees_supplementaires={
+                'vehicule_id': favori.vehicule_id,
+                'prix_initial': float(favori.prix_initial),
+                'difference': float(difference)
+            }
+        )
+
     @classmethod
     def notifier_favori_prix_baisse(cls, favori):
         """Notifier le client qu'un favori a baissé de prix."""
         if favori.difference_prix and favori.difference_prix < 0:
-            return cls.creer_notification(
-                destinataire=favori.client,
-                type_notification='FAVORI_PRIX_BAISSE',
-                titre="Prix baissé !",
-                message=f"Le prix de {favori.vehicule.nom_complet} a baissé de {abs(int(favori.difference_prix)):,} FCFA",
-                niveau_priorite='HAUTE',
-                lien=f"/vehicules/{favori.vehicule.id}",
-                texte_action="Voir le véhicule",
-                donnees_supplementaires={
-                    'vehicule_id': favori.vehicule.id,
-                    'prix_initial': float(favori.prix_initial),
-                    'difference': float(favori.difference_prix)
-                }
-            )
+            notification = cls.construire_favori_prix_baisse(favori)
+            notification.save()
+            return notification
         return None
     
     @property
@@ -3,6 +3,8 @@
 
 from rest_framework import serializers
 from .models import Notification
+from users.models import User
+from notifications import diffusion
 
 
 class NotificationSerializer(serializers.ModelSerializer):
@@ -87,4 +89,49 @@ class MarquerLueSerializer(serializers.Serializer):
     Serializer pour marquer une notification comme lue/non lue.
     """
     
-    est_lue = serializers.BooleanField(required=True)
\ No newline at end of file
+    est_lue = serializers.BooleanField(required=True)
+
+
+class DiffusionSerializer(serializers.Serializer):
+    """
+    Serializer pour diffuser une notification à une audience.
+    POST /api/notifications/diffuser/
+    """
+    
+    audience = serializers.ChoiceField(choices=list(diffusion.AUDIENCES))
+    concession_id = serializers.IntegerField(required=False)
+    vehicule_id = serializers.IntegerField(required=False)
+    
+    # Préférence à respecter (défaut : selon le type de notification,
+    # notifications_promotions sinon)
+    preference = serializers.ChoiceField(
+        choices=[cle for cle in User.PREFERENCES_NOTIFICATIONS_DEFAUT if cle.startswith('notifications_')],
+        required=False
+    )
+    
+    type_notification = serializers.ChoiceField(
+        choices=Notification.TYPE_NOTIFICATION_CHOICES,
+        default='INFORMATION'
+    )
+    titre = serializers.CharField(max_length=200)
+    message = serializers.CharField()
+    niveau_priorite = serializers.ChoiceField(
+        choices=Notification.NIVEAU_PRIORITE_CHOICES,
+        default='NORMALE'
+    )
+    lien = serializers.CharField(max_length=500, required=False, allow_blank=True)
+    texte_action = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    donnees_supplementaires = serializers.JSONField(required=False)
+    date_expiration = serializers.DateTimeField(required=False)
+    
+    def validate(self, data):
+        """Vérifier les paramètres de l'audience."""
+        _, obligatoires = diffusion.AUDIENCES[data['audience']]
+        erreurs = {
+            nom: "Ce champ est obligatoire pour cette audience."
+            for nom in obligatoires if data.get(nom) is None
+        }
+        if erreurs:
+            raise serializers.ValidationError(erreurs)
+        
+        return data
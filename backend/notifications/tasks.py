@@ -0,0 +1,12 @@
+# backend/notifications/tasks.py
+# Tâches Celery de l'app notifications
+
+from celery import shared_task
+
+from notifications import diffusion
+
+
+@shared_task
+def diffuser_notification(audience, contenu, parametres=None, preference=None):
+    """Diffuser une notification à une audience (voir notifications/diffusion.py)."""
+    return diffusion.diffuser(audience, contenu, parametres, preference)
@@ -0,0 +1,201 @@
+# backend/notifications/temps_reel.py
+# Notifications en temps réel (Server-Sent Events + Redis pub/sub)
+#
+# Chaque utilisateur a un canal Redis. Les notifications créées (save ou
+# bulk_create) y sont publiées au commit, ainsi que le nombre de non lues
+# quand il change autrement (lecture, suppression). Le flux SSE
+# /api/notifications/flux/ (vue asynchrone, servie par config/asgi.py)
+# s'abonne au canal de l'utilisateur : une seule requête COUNT à la
+# connexion, puis le frontend tient son compteur à jour sans interroger
+# compteur / non_lues en boucle.
+#
+# EventSource ne peut pas envoyer d'en-tête : le flux s'ouvre avec un
+# ticket à usage unique et de courte durée (?ticket=), obtenu par une
+# requête authentifiée. Le jeton d'accès ne passe jamais dans l'URL (ni
+# donc dans les journaux des proxys).
+#
+# Redis indisponible : la publication est ignorée (journalisée) et le flux
+# répond 503 ; le frontend retombe sur l'API et se reconnecte.
+
+import json
+import logging
+import secrets
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+
+logger = logging.getLogger(__name__)
+
+_client = None
+
+
+def url_redis():
+    return settings.NOTIFICATIONS_TEMPS_REEL_REDIS_URL
+
+
+def intervalle_ping():
+    """Secondes sans événement avant un commentaire de maintien du flux."""
+    return getattr(settings, 'NOTIFICATIONS_FLUX_PING', 15)
+
+
+def duree_ticket():
+    """Secondes de validité d'un ticket d'ouverture du flux."""
+    return getattr(settings, 'NOTIFICATIONS_FLUX_TICKET_TTL', 30)
+
+
+def canal(utilisateur_id):
+    return f'notifications:utilisateur:{utilisateur_id}'
+
+
+def _connexion_redis():
+    """Client Redis synchrone (pool partagé) pour publier."""
+    global _client
+    if _client is None:
+        import redis
+        # Délais courts : un Redis injoignable ne doit pas bloquer les requêtes
+        _client = redis.Redis.from_url(url_redis(), socket_connect_timeout=1, socket_timeout=1)
+    return _client
+
+
+def client_asynchrone():
+    """Client Redis asynchrone, un par flux ouvert."""
+    import redis.asyncio
+    return redis.asyncio.Redis.from_url(url_redis(), socket_connect_timeout=2)
+
+
+def _evenement(type_evenement, donnees):
+    return json.dumps({'type': type_evenement, **donnees}, cls=DjangoJSONEncoder)
+
+
+def _publier(messages):
+    """Publier [(utilisateur_id, message)] en un aller-retour Redis."""
+    try:
+        pipeline = _connexion_redis().pipeline(transaction=False)
+        for utilisateur_id, message in messages:
+            pipeline.publish(canal(utilisateur_id), message)
+        pipeline.execute()
+    except Exception as erreur:
+        logger.warning("Publication temps réel impossible (%s message(s)) : %s", len(messages), erreur)
+
+
+# ========================================
+# PUBLICATION
+# ========================================
+
+def notifications_creees(notifications):
+    """
+    Publier au commit des notifications créées (Notification.save et
+    NotificationManager.bulk_create). Le frontend ajoute chacune à sa
+    liste et incrémente son compteur de non lues.
+    """
+    notifications = [notification for notification in notifications if notification.pk is not None]
+    if not notifications:
+        return
+
+    def publier():
+        from notifications.serializers import NotificationSerializer
+        _publier([
+            (
+                notification.destinataire_id,
+                _evenement('notification', {'notification': NotificationSerializer(notification).data})
+            )
+            for notification in notifications
+        ])
+
+    transaction.on_commit(publier)
+
+
+def compteur_modifie(utilisateur_id, non_lues=None):
+    """
+    Publier au commit le nombre de non lues d'un utilisateur, recompté si
+    non fourni (lecture, suppression : actions ponctuelles de l'utilisateur).
+    """
+    def publier():
+        from notifications.models import Notification
+        valeur = non_lues
+        if valeur is None:
+            valeur = Notification.objects.filter(destinataire_id=utilisateur_id, est_lue=False).count()
+        _publier([(utilisateur_id, _evenement('compteur', {'non_lues': valeur}))])
+
+    transaction.on_commit(publier)
+
+
+# ========================================
+# TICKETS
+# ========================================
+
+def _cle_ticket(ticket):
+    return f'notifications:ticket_flux:{ticket}'
+
+
+def creer_ticket(utilisateur_id):
+    """Ticket à usage unique ouvrant le flux de l'utilisateur."""
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_cle_ticket(ticket), utilisateur_id, duree_ticket())
+    return ticket
+
+
+def consommer_ticket(ticket):
+    """
+    Utilisateur d'un ticket valide, ou None. Le ticket est supprimé :
+    entre deux requêtes simultanées, seule celle qui le supprime l'emporte.
+    """
+    cle = _cle_ticket(ticket)
+    utilisateur_id = cache.get(cle)
+    if utilisateur_id is None or not cache.delete(cle):
+        return None
+    return utilisateur_id
+
+
+# ========================================
+# FLUX SSE
+# ========================================
+
+async def abonner(utilisateur_id):
+    """
+    Ouvrir l'abonnement au canal d'un utilisateur.
+
+    Returns:
+        (client, pubsub) à passer à flux()
+
+    Raises:
+        redis.exceptions.RedisError: Redis indisponible
+    """
+    client = client_asynchrone()
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(canal(utilisateur_id))
+    except Exception:
+        await pubsub.aclose()
+        await client.aclose()
+        raise
+    return client, pubsub
+
+
+async def flux(utilisateur_id, client, pubsub):
+    """
+    Générateur SSE : compteur initial puis événements du canal.
+
+    L'abonnement précède le comptage : aucune notification créée entre
+    les deux n'est perdue. Fermé par Django à la déconnexion du client.
+    """
+    from notifications.models import Notification
+
+    try:
+        non_lues = await Notification.objects.filter(destinataire_id=utilisateur_id, est_lue=False).acount()
+        yield 'retry: 5000\n'
+        yield f"data: {_evenement('compteur', {'non_lues': non_lues})}\n\n"
+
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=intervalle_ping())
+            if message is None:
+                # Maintien de la connexion à travers les proxys
+                yield ': ping\n\n'
+                continue
+            yield f"data: {message['data'].decode()}\n\n"
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
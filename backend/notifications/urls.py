@@ -3,7 +3,7 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import NotificationViewSet
+from .views import NotificationViewSet, flux_notifications
 
 # Créer le router
 router = DefaultRouter()
@@ -13,6 +13,8 @@ router.register(r'notifications', NotificationViewSet, basename='notification')
 
 # URLs
 urlpatterns = [
+    # Avant le router : « flux » serait pris pour un identifiant
+    path('notifications/flux/', flux_notifications, name='notifications-flux'),
     path('', include(router.urls)),
 ]
 
@@ -31,6 +33,9 @@ GET    /api/notifications/non-lues/              - Notifications non lues
 GET    /api/notifications/compteur/              - Compteur non lues
 DELETE /api/notifications/supprimer-lues/        - Supprimer toutes les lues
 GET    /api/notifications/statistiques/          - Statistiques
+POST   /api/notifications/diffuser/              - Diffuser à une audience (admin, concessionnaire)
+POST   /api/notifications/flux/ticket/           - Ticket à usage unique pour ouvrir le flux (30 s)
+GET    /api/notifications/flux/?ticket=          - Flux temps réel (SSE) : nouvelles notifications et compteur
 
 FILTRES :
 ---------
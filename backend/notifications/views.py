@@ -11,8 +11,12 @@ from .models import Notification
 from .serializers import (
     NotificationSerializer,
     NotificationCreateSerializer,
-    MarquerLueSerializer
+    MarquerLueSerializer,
+    DiffusionSerializer
 )
+from notifications import diffusion
+from notifications import temps_reel
+from config.pagination import PaginationMixte
 
 
 class NotificationViewSet(viewsets.ModelViewSet):
@@ -29,6 +33,7 @@ class NotificationViewSet(viewsets.ModelViewSet):
     - GET    /api/notifications/non-lues/       - Notifications non lues
     - GET    /api/notifications/compteur/       - Compteur non lues
     - DELETE /api/notifications/supprimer-lues/ - Supprimer toutes les lues
+    - POST   /api/notifications/diffuser/       - Diffuser à une audience
     """
     
     queryset = Notification.objects.select_related('destinataire')
@@ -58,6 +63,10 @@ class NotificationViewSet(viewsets.ModelViewSet):
     ]
     ordering = ['-date_creation']
     
+    # Pagination : ?page=N, ou curseur sur la date (?pagination=curseur)
+    pagination_class = PaginationMixte
+    ordering_curseur = '-date_creation'
+    
     def get_serializer_class(self):
         """Retourner le serializer approprié."""
         if self.action == 'create':
@@ -143,6 +152,9 @@ class NotificationViewSet(viewsets.ModelViewSet):
             date_lecture=timezone.now()
         )
         
+        if count:
+            temps_reel.compteur_modifie(request.user.pk, non_lues=0)
+        
         return Response(
             {
                 "message": f"{count} notification(s) marquée(s) comme lue(s)",
@@ -245,4 +257,145 @@ class NotificationViewSet(viewsets.ModelViewSet):
             'par_priorite': list(par_priorite),
         }
         
-        return Response(stats)
\ No newline at end of file
+        return Response(stats)
+    
+    @action(
+        detail=False,
+        methods=['post']
+    )
+    def diffuser(self, request):
+        """
+        Diffuser une notification à une audience, en arrière-plan.
+        POST /api/notifications/diffuser/
+        Body: {"audience": "clients_concession", "concession_id": 3,
+               "titre": "...", "message": "...", "preference": "notifications_promotions"}
+        
+        Audiences : clients (administrateur), clients_concession (clients
+        ayant loué dans la concession), favoris_vehicule (clients ayant le
+        véhicule en favori). Un concessionnaire ne cible que ses propres
+        concessions et véhicules.
+        """
+        serializer = DiffusionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        donnees = serializer.validated_data
+        audience = donnees['audience']
+        user = request.user
+        
+        if not user.is_administrateur():
+            from concessions.models import Concession
+            from vehicules.models import Vehicule
+            
+            autorise = user.is_concessionnaire() and (
+                (audience == 'clients_concession' and Concession.objects.filter(
+                    pk=donnees['concession_id'], concessionnaire=user
+                ).exists())
+                or (audience == 'favoris_vehicule' and Vehicule.objects.filter(
+                    pk=donnees['vehicule_id'], concessionnaire=user
+                ).exists())
+            )
+            if not autorise:
+                return Response(
+                    {"error": "Vous ne pouvez pas notifier cette audience"},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+        
+        # Représentation JSON du contenu : transmise telle quelle au worker
+        contenu = {
+            champ: valeur for champ, valeur in serializer.data.items()
+            if champ in diffusion.CHAMPS_CONTENU
+        }
+        parametres = {
+            nom: donnees[nom] for nom in ('concession_id', 'vehicule_id') if nom in donnees
+        }
+        total = diffusion.lancer(audience, contenu, parametres, donnees.get('preference'))
+        
+        reponse = {"message": "Diffusion lancée", "audience": audience}
+        if total is not None:
+            reponse['notifications_creees'] = total
+        return Response(reponse, status=status.HTTP_202_ACCEPTED)
+    
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='flux/ticket'
+    )
+    def ticket_flux(self, request):
+        """
+        Ticket d'ouverture du flux temps réel (usage unique).
+        POST /api/notifications/flux/ticket/
+        Response: {"ticket": "...", "expire_dans": 30}
+        """
+        return Response({
+            'ticket': temps_reel.creer_ticket(request.user.pk),
+            'expire_dans': temps_reel.duree_ticket(),
+        })
+
+
+# ========================================
+# FLUX TEMPS RÉEL (SSE)
+# ========================================
+
+def _authentifier_flux(request):
+    """
+    Utilisateur du flux : ticket à usage unique ?ticket= (EventSource ne
+    permet pas d'envoyer d'en-tête), ou jeton JWT dans l'en-tête
+    Authorization. Le jeton d'accès n'est jamais accepté dans l'URL.
+    """
+    from django.contrib.auth import get_user_model
+    from rest_framework.exceptions import AuthenticationFailed
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    
+    ticket = request.GET.get('ticket')
+    if ticket:
+        utilisateur_id = temps_reel.consommer_ticket(ticket)
+        if utilisateur_id is None:
+            return None
+        return get_user_model().objects.filter(pk=utilisateur_id).first()
+    
+    try:
+        resultat = JWTAuthentication().authenticate(request)
+        return resultat[0] if resultat else None
+    except AuthenticationFailed:
+        return None
+
+
+async def flux_notifications(request):
+    """
+    Flux temps réel des notifications (Server-Sent Events).
+    GET /api/notifications/flux/?ticket=<ticket de POST flux/ticket/>
+    
+    Événements (data JSON) :
+    - {"type": "compteur", "non_lues": 3} : à la connexion puis à chaque
+      lecture / suppression
+    - {"type": "notification", "notification": {...}} : nouvelle notification
+      (non lue : le compteur augmente de 1)
+    
+    À servir par un serveur ASGI (config/asgi.py) : chaque flux ouvert
+    n'occupe alors qu'une tâche asyncio, pas un thread.
+    """
+    from asgiref.sync import sync_to_async
+    from django.http import JsonResponse, StreamingHttpResponse
+    
+    if request.method != 'GET':
+        return JsonResponse({"error": "Méthode non autorisée"}, status=405)
+    
+    utilisateur = await sync_to_async(_authentifier_flux)(request)
+    if utilisateur is None or not utilisateur.is_active:
+        return JsonResponse({"error": "Authentification requise"}, status=401)
+    
+    try:
+        client, pubsub = await temps_reel.abonner(utilisateur.pk)
+    except Exception:
+        return JsonResponse(
+            {"error": "Flux temps réel indisponible, utiliser /api/notifications/compteur/"},
+            status=503
+        )
+    
+    reponse = StreamingHttpResponse(
+        temps_reel.flux(utilisateur.pk, client, pubsub),
+        content_type='text/event-stream'
+    )
+    reponse['Cache-Control'] = 'no-cache'
+    # Pas de mise en tampon par nginx
+    reponse['X-Accel-Buffering'] = 'no'
+    return reponse
@@ -0,0 +1,232 @@
+# backend/statistiques/agregats.py
+# Calcul des agrégats journaliers (statistiques/models.py)
+#
+# Un jour est toujours recalculé en entier à partir des tables sources :
+# le calcul est idempotent et peut être relancé sans risque. Les signaux
+# (statistiques/signals.py) marquent les jours touchés par une écriture ;
+# rafraichir() recalcule ces jours ainsi que la journée en cours.
+
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Sum, Q
+from django.utils import timezone
+
+from statistiques import cache as cache_statistiques
+from statistiques.models import (
+    StatistiquePlateformeJournaliere,
+    StatistiqueConcessionnaireJournaliere,
+    StatistiqueClientJournaliere,
+    JourARecalculer,
+)
+
+
+def _bornes(jour):
+    """Intervalle [début, fin[ d'une journée dans le fuseau courant."""
+    debut = timezone.make_aware(datetime.combine(jour, time.min))
+    return debut, debut + timedelta(days=1)
+
+
+def jour_de(valeur):
+    """Jour local d'un datetime (ou None)."""
+    if valeur is None:
+        return None
+    if isinstance(valeur, datetime):
+        if timezone.is_aware(valeur):
+            return timezone.localdate(valeur)
+        return valeur.date()
+    return valeur
+
+
+# ========================================
+# MARQUAGE
+# ========================================
+
+def marquer_jours(*jours):
+    """Marquer des jours à recalculer (les valeurs None sont ignorées)."""
+    jours = {jour_de(jour) for jour in jours if jour is not None}
+    if jours:
+        JourARecalculer.objects.bulk_create(
+            [JourARecalculer(date=jour) for jour in jours],
+            ignore_conflicts=True
+        )
+
+
+# ========================================
+# CALCUL D'UNE JOURNÉE
+# ========================================
+
+def recalculer_jour(jour):
+    """
+    Recalculer toutes les lignes d'agrégats d'une journée.
+
+    Returns:
+        Nombre de lignes écrites
+    """
+    from users.models import User
+    from locations.models import Location
+    from avis.models import Avis
+    from promotions.models import UtilisationPromotion
+
+    debut, fin = _bornes(jour)
+    creees_le_jour = Q(date_creation__gte=debut, date_creation__lt=fin)
+    retournees_le_jour = Q(
+        statut='TERMINEE',
+        date_retour_reel__gte=debut,
+        date_retour_reel__lt=fin
+    )
+
+    concessionnaires = defaultdict(dict)
+    clients = defaultdict(dict)
+
+    # Locations créées, par statut actuel
+    for ligne in Location.objects.filter(creees_le_jour).values('concessionnaire').annotate(
+        locations_creees=Count('id'),
+        locations_en_attente=Count('id', filter=Q(statut='DEMANDE')),
+        locations_confirmees=Count('id', filter=Q(statut='CONFIRMEE')),
+        locations_en_cours=Count('id', filter=Q(statut='EN_COURS')),
+        locations_terminees=Count('id', filter=Q(statut='TERMINEE')),
+        locations_annulees=Count('id', filter=Q(statut='ANNULEE')),
+        jours_loues=Sum('nombre_jours', filter=Q(statut='TERMINEE')),
+    ):
+        concessionnaires[ligne.pop('concessionnaire')].update(ligne)
+
+    # Revenus des locations retournées
+    for ligne in Location.objects.filter(retournees_le_jour).values('concessionnaire').annotate(
+        locations_retournees=Count('id'),
+        revenus=Sum('prix_total'),
+        penalites=Sum('montant_penalite'),
+    ):
+        concessionnaires[ligne.pop('concessionnaire')].update(ligne)
+
+    # Avis reçus
+    for ligne in Avis.objects.filter(creees_le_jour).values('vehicule__concessionnaire').annotate(
+        avis_recus=Count('id'),
+        somme_notes=Sum('note'),
+        avis_recommandes=Count('id', filter=Q(recommande=True)),
+    ):
+        concessionnaires[ligne.pop('vehicule__concessionnaire')].update(ligne)
+
+    # Promotions utilisées
+    for ligne in UtilisationPromotion.objects.filter(
+        date_utilisation__gte=debut,
+        date_utilisation__lt=fin
+    ).values('promotion__concessionnaire').annotate(
+        utilisations_promotions=Count('id'),
+        reductions_promotions=Sum('montant_reduction'),
+    ):
+        concessionnaires[ligne.pop('promotion__concessionnaire')].update(ligne)
+
+    # Locations des clients
+    for ligne in Location.objects.filter(creees_le_jour).values('client').annotate(
+        locations_creees=Count('id'),
+        locations_en_cours=Count('id', filter=Q(statut='EN_COURS')),
+        locations_terminees=Count('id', filter=Q(statut='TERMINEE')),
+        locations_annulees=Count('id', filter=Q(statut='ANNULEE')),
+    ):
+        clients[ligne.pop('client')].update(ligne)
+
+    for ligne in Location.objects.filter(retournees_le_jour).values('client').annotate(
+        locations_retournees=Count('id'),
+        depenses=Sum('prix_total'),
+        economies=Sum('montant_reduction'),
+    ):
+        clients[ligne.pop('client')].update(ligne)
+
+    # Inscriptions
+    inscriptions = User.objects.filter(
+        date_inscription__gte=debut,
+        date_inscription__lt=fin
+    ).aggregate(
+        nouveaux_utilisateurs=Count('id'),
+        nouveaux_clients=Count('id', filter=Q(type_utilisateur='CLIENT')),
+        nouveaux_concessionnaires=Count('id', filter=Q(type_utilisateur='CONCESSIONNAIRE')),
+        nouveaux_administrateurs=Count('id', filter=Q(type_utilisateur='ADMINISTRATEUR')),
+    )
+
+    lignes_concessionnaires = [
+        StatistiqueConcessionnaireJournaliere(
+            concessionnaire_id=concessionnaire_id,
+            date=jour,
+            **{cle: valeur or 0 for cle, valeur in valeurs.items()}
+        )
+        for concessionnaire_id, valeurs in concessionnaires.items()
+        if concessionnaire_id is not None
+    ]
+    lignes_clients = [
+        StatistiqueClientJournaliere(
+            client_id=client_id,
+            date=jour,
+            **{cle: valeur or 0 for cle, valeur in valeurs.items()}
+        )
+        for client_id, valeurs in clients.items()
+    ]
+
+    with transaction.atomic():
+        StatistiqueConcessionnaireJournaliere.objects.filter(date=jour).delete()
+        StatistiqueClientJournaliere.objects.filter(date=jour).delete()
+        StatistiquePlateformeJournaliere.objects.filter(date=jour).delete()
+
+        StatistiqueConcessionnaireJournaliere.objects.bulk_create(lignes_concessionnaires)
+        StatistiqueClientJournaliere.objects.bulk_create(lignes_clients)
+        if inscriptions['nouveaux_utilisateurs']:
+            StatistiquePlateformeJournaliere.objects.create(date=jour, **inscriptions)
+
+    # Les tableaux de bord de ces utilisateurs lisent les nouvelles lignes
+    cache_statistiques.invalider('concessionnaire', *concessionnaires.keys())
+    cache_statistiques.invalider('client', *clients.keys())
+
+    return len(lignes_concessionnaires) + len(lignes_clients) + (1 if inscriptions['nouveaux_utilisateurs'] else 0)
+
+
+# ========================================
+# RAFRAÎCHISSEMENT
+# ========================================
+
+def rafraichir(depuis=None):
+    """
+    Recalculer les jours marqués et la journée en cours.
+
+    Args:
+        depuis: Date de début d'une reconstruction complète (optionnel) :
+            tous les jours de depuis à aujourd'hui sont recalculés
+
+    Returns:
+        Nombre de jours recalculés
+    """
+    aujourd_hui = timezone.localdate()
+
+    # Retirer les marques avant le calcul : une écriture concurrente
+    # remarquera le jour pour le prochain passage
+    with transaction.atomic():
+        marques = list(JourARecalculer.objects.select_for_update().values_list('date', flat=True))
+        JourARecalculer.objects.filter(date__in=marques).delete()
+
+    jours = set(marques)
+    jours.add(aujourd_hui)
+
+    if depuis is not None:
+        jour = depuis
+        while jour <= aujourd_hui:
+            jours.add(jour)
+            jour += timedelta(days=1)
+
+    for jour in sorted(jours):
+        recalculer_jour(jour)
+
+    return len(jours)
+
+
+def premier_jour_sources():
+    """Jour de la plus ancienne donnée source (reconstruction complète)."""
+    from users.models import User
+    from locations.models import Location
+
+    candidats = [
+        User.objects.order_by('date_inscription').values_list('date_inscription', flat=True).first(),
+        Location.objects.order_by('date_creation').values_list('date_creation', flat=True).first(),
+    ]
+    candidats = [jour_de(c) for c in candidats if c is not None]
+    return min(candidats) if candidats else timezone.localdate()
+
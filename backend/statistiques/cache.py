@@ -0,0 +1,89 @@
+# backend/statistiques/cache.py
+# Cache des tableaux de bord par (rôle, utilisateur)
+#
+# Chaque réponse est stockée sous une clé contenant la génération de
+# l'utilisateur : incrémenter la génération invalide d'un coup toutes les
+# sections de son tableau de bord. Les tableaux de bord administrateur
+# agrègent toute la plateforme et ne sont invalidés que par leur TTL.
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+PREFIXE = 'statistiques:cache'
+
+
+def ttl():
+    """Durée de vie (secondes) des réponses en cache."""
+    return getattr(settings, 'STATISTIQUES_CACHE_TTL', 60)
+
+
+def _cle_generation(role, utilisateur_id):
+    return f'{PREFIXE}:generation:{role}:{utilisateur_id}'
+
+
+def cle(role, utilisateur_id, section):
+    """Clé d'une section du tableau de bord d'un utilisateur."""
+    generation = cache.get(_cle_generation(role, utilisateur_id), 0)
+    return f'{PREFIXE}:{role}:{utilisateur_id}:g{generation}:{section}'
+
+
+# ========================================
+# LECTURE
+# ========================================
+
+def obtenir(role, utilisateur_id, section, calcul):
+    """
+    Retourner la section en cache, ou la calculer et la stocker.
+
+    Args:
+        role: 'concessionnaire', 'client' ou 'admin'
+        utilisateur_id: Identifiant de l'utilisateur connecté
+        section: Nom de la section ('dashboard', 'revenus', ...)
+        calcul: Fonction sans argument qui calcule les données
+
+    Returns:
+        Tuple (données, trouvé_en_cache)
+    """
+    cle_section = cle(role, utilisateur_id, section)
+    data = cache.get(cle_section)
+    if data is not None:
+        return data, True
+
+    data = calcul()
+    cache.set(cle_section, data, timeout=ttl())
+    return data, False
+
+
+# ========================================
+# INVALIDATION
+# ========================================
+
+def _incrementer(cle_generation):
+    try:
+        cache.incr(cle_generation)
+    except ValueError:
+        if not cache.add(cle_generation, 1, timeout=None):
+            cache.incr(cle_generation)
+
+
+def invalider(role, *utilisateurs_ids):
+    """
+    Invalider les tableaux de bord des utilisateurs donnés.
+
+    L'invalidation est reportée après le commit de la transaction en cours,
+    pour qu'une lecture concurrente ne remette pas en cache l'ancien état.
+    """
+    cles = [
+        _cle_generation(role, utilisateur_id)
+        for utilisateur_id in set(utilisateurs_ids)
+        if utilisateur_id is not None
+    ]
+
+    def _invalider():
+        for cle_generation in cles:
+            _incrementer(cle_generation)
+
+    if cles:
+        transaction.on_commit(_invalider)
@@ -0,0 +1,40 @@
+# backend/statistiques/management/commands/rafraichir_statistiques.py
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from statistiques import agregats
+
+
+class Command(BaseCommand):
+    help = "Recalculer les agrégats journaliers des tableaux de bord"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--depuis',
+            type=str,
+            default=None,
+            help='Recalculer tous les jours depuis cette date (AAAA-MM-JJ)'
+        )
+        parser.add_argument(
+            '--complet',
+            action='store_true',
+            help="Reconstruire tout l'historique"
+        )
+
+    def handle(self, *args, **options):
+        """Rafraîchir les agrégats."""
+        
+        depuis = None
+        if options['complet']:
+            depuis = agregats.premier_jour_sources()
+        elif options['depuis']:
+            try:
+                depuis = date.fromisoformat(options['depuis'])
+            except ValueError:
+                raise CommandError('Format de date invalide (attendu : AAAA-MM-JJ)')
+        
+        nombre = agregats.rafraichir(depuis=depuis)
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'{nombre} jour(s) recalculé(s)')
+        )
@@ -0,0 +1,100 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JourARecalculer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('date_ajout', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Jour à recalculer',
+                'verbose_name_plural': 'Jours à recalculer',
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatistiquePlateformeJournaliere',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='Jour')),
+                ('nouveaux_utilisateurs', models.PositiveIntegerField(default=0)),
+                ('nouveaux_clients', models.PositiveIntegerField(default=0)),
+                ('nouveaux_concessionnaires', models.PositiveIntegerField(default=0)),
+                ('nouveaux_administrateurs', models.PositiveIntegerField(default=0)),
+                ('date_calcul', models.DateTimeField(auto_now=True, verbose_name='Date de calcul')),
+            ],
+            options={
+                'verbose_name': 'Statistique plateforme journalière',
+                'verbose_name_plural': 'Statistiques plateforme journalières',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatistiqueClientJournaliere',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Jour')),
+                ('locations_creees', models.PositiveIntegerField(default=0)),
+                ('locations_en_cours', models.PositiveIntegerField(default=0)),
+                ('locations_terminees', models.PositiveIntegerField(default=0)),
+                ('locations_annulees', models.PositiveIntegerField(default=0)),
+                ('locations_retournees', models.PositiveIntegerField(default=0)),
+                ('depenses', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('economies', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('date_calcul', models.DateTimeField(auto_now=True, verbose_name='Date de calcul')),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistiques_client_journalieres', to=settings.AUTH_USER_MODEL, verbose_name='Client')),
+            ],
+            options={
+                'verbose_name': 'Statistique client journalière',
+                'verbose_name_plural': 'Statistiques client journalières',
+                'ordering': ['-date'],
+                'unique_together': {('client', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='StatistiqueConcessionnaireJournaliere',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Jour')),
+                ('locations_creees', models.PositiveIntegerField(default=0)),
+                ('locations_en_attente', models.PositiveIntegerField(default=0)),
+                ('locations_confirmees', models.PositiveIntegerField(default=0)),
+                ('locations_en_cours', models.PositiveIntegerField(default=0)),
+                ('locations_terminees', models.PositiveIntegerField(default=0)),
+                ('locations_annulees', models.PositiveIntegerField(default=0)),
+                ('jours_loues', models.PositiveIntegerField(default=0, help_text='Somme des durées (jours) des locations terminées')),
+                ('locations_retournees', models.PositiveIntegerField(default=0)),
+                ('revenus', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('penalites', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('avis_recus', models.PositiveIntegerField(default=0)),
+                ('somme_notes', models.PositiveIntegerField(default=0)),
+                ('avis_recommandes', models.PositiveIntegerField(default=0)),
+                ('utilisations_promotions', models.PositiveIntegerField(default=0)),
+                ('reductions_promotions', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('date_calcul', models.DateTimeField(auto_now=True, verbose_name='Date de calcul')),
+                ('concessionnaire', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='statistiques_journalieres', to=settings.AUTH_USER_MODEL, verbose_name='Concessionnaire')),
+            ],
+            options={
+                'verbose_name': 'Statistique concessionnaire journalière',
+                'verbose_name_plural': 'Statistiques concessionnaire journalières',
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['date'], name='statistique_date_d917f2_idx')],
+                'unique_together': {('concessionnaire', 'date')},
+            },
+        ),
+    ]
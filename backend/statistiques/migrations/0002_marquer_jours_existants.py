@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-17 08:05
+
+from datetime import timedelta
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def marquer_jours_existants(apps, schema_editor):
+    """
+    Marquer chaque jour depuis la plus ancienne donnée source : la tâche
+    rafraichir_statistiques remplit les agrégats au passage suivant, sans
+    reconstruction manuelle (rafraichir_statistiques --complet).
+    """
+    User = apps.get_model('users', 'User')
+    Location = apps.get_model('locations', 'Location')
+    JourARecalculer = apps.get_model('statistiques', 'JourARecalculer')
+
+    candidats = [
+        User.objects.order_by('date_inscription').values_list('date_inscription', flat=True).first(),
+        Location.objects.order_by('date_creation').values_list('date_creation', flat=True).first(),
+    ]
+    candidats = [timezone.localtime(c).date() for c in candidats if c is not None]
+    if not candidats:
+        return
+
+    jour = min(candidats)
+    aujourd_hui = timezone.localdate()
+    jours = []
+    while jour <= aujourd_hui:
+        jours.append(JourARecalculer(date=jour))
+        jour += timedelta(days=1)
+    JourARecalculer.objects.bulk_create(jours, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('statistiques', '0001_initial'),
+        ('users', '0002_user_pourcentage_completion_user_raison_rejet_and_more'),
+        ('locations', '0005_index_pagination_curseur'),
+    ]
+
+    operations = [
+        migrations.RunPython(marquer_jours_existants, migrations.RunPython.noop),
+    ]
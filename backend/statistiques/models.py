@@ -1,3 +1,168 @@
+# backend/statistiques/models.py
+# Tables d'agrégats journaliers pour les tableaux de bord
+#
+# Les lignes sont (re)calculées par statistiques/agregats.py : un jour est
+# marqué à recalculer à chaque modification des données sources (signaux),
+# puis la tâche planifiée rafraichir_statistiques le recalcule en entier.
+
 from django.db import models
+from users.models import User
+
+
+# ========================================
+# AGRÉGATS PLATEFORME
+# ========================================
+
+class StatistiquePlateformeJournaliere(models.Model):
+    """Faits globaux d'une journée (inscriptions)."""
+
+    date = models.DateField(
+        unique=True,
+        verbose_name="Jour"
+    )
+
+    nouveaux_utilisateurs = models.PositiveIntegerField(default=0)
+    nouveaux_clients = models.PositiveIntegerField(default=0)
+    nouveaux_concessionnaires = models.PositiveIntegerField(default=0)
+    nouveaux_administrateurs = models.PositiveIntegerField(default=0)
+
+    date_calcul = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Date de calcul"
+    )
+
+    class Meta:
+        verbose_name = "Statistique plateforme journalière"
+        verbose_name_plural = "Statistiques plateforme journalières"
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"Plateforme - {self.date}"
+
+
+# ========================================
+# AGRÉGATS CONCESSIONNAIRE
+# ========================================
+
+class StatistiqueConcessionnaireJournaliere(models.Model):
+    """
+    Faits d'une journée pour un concessionnaire.
+
+    Les compteurs locations_* portent sur les locations créées ce jour-là,
+    réparties selon leur statut actuel. Les revenus portent sur les
+    locations terminées dont le retour a eu lieu ce jour-là.
+    """
+
+    concessionnaire = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='statistiques_journalieres',
+        verbose_name="Concessionnaire"
+    )
+
+    date = models.DateField(verbose_name="Jour")
+
+    # Locations créées (par statut actuel)
+    locations_creees = models.PositiveIntegerField(default=0)
+    locations_en_attente = models.PositiveIntegerField(default=0)
+    locations_confirmees = models.PositiveIntegerField(default=0)
+    locations_en_cours = models.PositiveIntegerField(default=0)
+    locations_terminees = models.PositiveIntegerField(default=0)
+    locations_annulees = models.PositiveIntegerField(default=0)
+    jours_loues = models.PositiveIntegerField(
+        default=0,
+        help_text="Somme des durées (jours) des locations terminées"
+    )
+
+    # Revenus (locations retournées ce jour)
+    locations_retournees = models.PositiveIntegerField(default=0)
+    revenus = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    penalites = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # Avis reçus
+    avis_recus = models.PositiveIntegerField(default=0)
+    somme_notes = models.PositiveIntegerField(default=0)
+    avis_recommandes = models.PositiveIntegerField(default=0)
+
+    # Promotions utilisées
+    utilisations_promotions = models.PositiveIntegerField(default=0)
+    reductions_promotions = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    date_calcul = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Date de calcul"
+    )
+
+    class Meta:
+        verbose_name = "Statistique concessionnaire journalière"
+        verbose_name_plural = "Statistiques concessionnaire journalières"
+        unique_together = ['concessionnaire', 'date']
+        ordering = ['-date']
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+    def __str__(self):
+        return f"{self.concessionnaire_id} - {self.date}"
+
+
+# ========================================
+# AGRÉGATS CLIENT
+# ========================================
+
+class StatistiqueClientJournaliere(models.Model):
+    """Faits d'une journée pour un client (locations et dépenses)."""
+
+    client = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='statistiques_client_journalieres',
+        verbose_name="Client"
+    )
+
+    date = models.DateField(verbose_name="Jour")
+
+    # Locations créées (par statut actuel)
+    locations_creees = models.PositiveIntegerField(default=0)
+    locations_en_cours = models.PositiveIntegerField(default=0)
+    locations_terminees = models.PositiveIntegerField(default=0)
+    locations_annulees = models.PositiveIntegerField(default=0)
+
+    # Dépenses (locations retournées ce jour)
+    locations_retournees = models.PositiveIntegerField(default=0)
+    depenses = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    economies = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    date_calcul = models.DateTimeField(
+        auto_now=True,
+        verbose_name="Date de calcul"
+    )
+
+    class Meta:
+        verbose_name = "Statistique client journalière"
+        verbose_name_plural = "Statistiques client journalières"
+        unique_together = ['client', 'date']
+        ordering = ['-date']
+
+    def __str__(self):
+        return f"{self.client_id} - {self.date}"
+
+
+# ========================================
+# JOURS À RECALCULER
+# ========================================
+
+class JourARecalculer(models.Model):
+    """Jour dont les données sources ont changé depuis le dernier calcul."""
+
+    date = models.DateField(unique=True)
+
+    date_ajout = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Jour à recalculer"
+        verbose_name_plural = "Jours à recalculer"
+        ordering = ['date']
 
-# Create your models here.
+    def __str__(self):
+        return str(self.date)
@@ -1,7 +1,7 @@
 # backend/statistiques/services.py
 # Services de calcul des statistiques
 
-from django.db.models import Sum, Count, Avg, Q, F
+from django.db.models import Sum, Count, Avg, Q, F, ExpressionWrapper, DurationField
 from django.db.models.functions import TruncMonth, TruncWeek, TruncDay
 from django.utils import timezone
 from datetime import timedelta
@@ -13,8 +13,22 @@ from concessions.models import Concession
 from locations.models import Location
 from demands.models import DemandeContact
 from avis.models import Avis
+from favoris import alertes_prix
 from favoris.models import Favori, Historique
 from promotions.models import Promotion, UtilisationPromotion
+from statistiques.models import (
+    StatistiquePlateformeJournaliere,
+    StatistiqueConcessionnaireJournaliere,
+    StatistiqueClientJournaliere,
+)
+
+
+def debut_periode_mois(jour, nombre_mois):
+    """Premier jour de la période couvrant les nombre_mois derniers mois (mois courant inclus)."""
+    debut = jour.replace(day=1)
+    for _ in range(nombre_mois - 1):
+        debut = (debut - timedelta(days=1)).replace(day=1)
+    return debut
 
 
 # ========================================
@@ -29,6 +43,9 @@ class StatistiquesConcessionnaire:
     def __init__(self, concessionnaire):
         self.concessionnaire = concessionnaire
         self.today = timezone.now().date()
+        self.agregats = StatistiqueConcessionnaireJournaliere.objects.filter(
+            concessionnaire=concessionnaire
+        )
     
     def get_statistiques_completes(self):
         """Retourner toutes les statistiques."""
@@ -43,29 +60,23 @@ class StatistiquesConcessionnaire:
         }
     
     def get_revenus(self):
-        """Calculer les statistiques de revenus."""
-        locations = Location.objects.filter(
-            concessionnaire=self.concessionnaire,
-            statut='TERMINEE'
-        )
-        
-        # Ce mois
+        """Calculer les statistiques de revenus (agrégats journaliers)."""
         debut_mois = self.today.replace(day=1)
-        locations_mois = locations.filter(date_retour_reel__date__gte=debut_mois)
-        revenu_mois = locations_mois.aggregate(
-            total=Sum('prix_total')
-        )['total'] or Decimal('0')
-        
-        # Mois précédent
         debut_mois_precedent = (debut_mois - timedelta(days=1)).replace(day=1)
         fin_mois_precedent = debut_mois - timedelta(days=1)
-        locations_mois_precedent = locations.filter(
-            date_retour_reel__date__gte=debut_mois_precedent,
-            date_retour_reel__date__lte=fin_mois_precedent
+        
+        stats = self.agregats.aggregate(
+            revenu_mois=Sum('revenus', filter=Q(date__gte=debut_mois)),
+            revenu_mois_precedent=Sum(
+                'revenus',
+                filter=Q(date__gte=debut_mois_precedent, date__lte=fin_mois_precedent)
+            ),
+            revenu_total=Sum('revenus'),
+            penalites_total=Sum('penalites'),
         )
-        revenu_mois_precedent = locations_mois_precedent.aggregate(
-            total=Sum('prix_total')
-        )['total'] or Decimal('0')
+        
+        revenu_mois = stats['revenu_mois'] or Decimal('0')
+        revenu_mois_precedent = stats['revenu_mois_precedent'] or Decimal('0')
         
         # Variation
         if revenu_mois_precedent > 0:
@@ -73,69 +84,62 @@ class StatistiquesConcessionnaire:
         else:
             variation = 100 if revenu_mois > 0 else 0
         
-        # Total général
-        revenu_total = locations.aggregate(total=Sum('prix_total'))['total'] or Decimal('0')
-        
-        # Pénalités
-        penalites_total = locations.aggregate(total=Sum('montant_penalite'))['total'] or Decimal('0')
-        
         return {
             'revenu_mois': float(revenu_mois),
             'revenu_mois_precedent': float(revenu_mois_precedent),
             'variation_pourcentage': round(float(variation), 1),
-            'revenu_total': float(revenu_total),
-            'penalites_total': float(penalites_total),
+            'revenu_total': float(stats['revenu_total'] or Decimal('0')),
+            'penalites_total': float(stats['penalites_total'] or Decimal('0')),
         }
     
     def get_locations(self):
-        """Calculer les statistiques de locations."""
-        locations = Location.objects.filter(concessionnaire=self.concessionnaire)
-        
-        total = locations.count()
-        en_cours = locations.filter(statut='EN_COURS').count()
-        confirmees = locations.filter(statut='CONFIRMEE').count()
-        terminees = locations.filter(statut='TERMINEE').count()
-        annulees = locations.filter(statut='ANNULEE').count()
-        demandes = locations.filter(statut='DEMANDE').count()
-        
-        # Ce mois
+        """Calculer les statistiques de locations (agrégats journaliers)."""
         debut_mois = self.today.replace(day=1)
-        locations_mois = locations.filter(date_creation__date__gte=debut_mois).count()
         
-        # Durée moyenne
-        duree_moyenne = locations.filter(statut='TERMINEE').aggregate(
-            moyenne=Avg('nombre_jours')
-        )['moyenne'] or 0
+        stats = self.agregats.aggregate(
+            total=Sum('locations_creees'),
+            en_cours=Sum('locations_en_cours'),
+            confirmees=Sum('locations_confirmees'),
+            terminees=Sum('locations_terminees'),
+            annulees=Sum('locations_annulees'),
+            demandes=Sum('locations_en_attente'),
+            ce_mois=Sum('locations_creees', filter=Q(date__gte=debut_mois)),
+            jours_loues=Sum('jours_loues'),
+        )
+        stats = {cle: valeur or 0 for cle, valeur in stats.items()}
+        
+        # Durée moyenne des locations terminées
+        duree_moyenne = stats['jours_loues'] / stats['terminees'] if stats['terminees'] > 0 else 0
         
         # Taux de conversion (demandes -> confirmées/terminées)
-        total_demandes = locations.count()
-        total_reussies = locations.filter(statut__in=['CONFIRMEE', 'EN_COURS', 'TERMINEE']).count()
-        taux_conversion = (total_reussies / total_demandes * 100) if total_demandes > 0 else 0
+        total = stats['total']
+        reussies = stats['confirmees'] + stats['en_cours'] + stats['terminees']
+        taux_conversion = (reussies / total * 100) if total > 0 else 0
         
         return {
             'total': total,
-            'en_cours': en_cours,
-            'confirmees': confirmees,
-            'terminees': terminees,
-            'annulees': annulees,
-            'en_attente': demandes,
-            'ce_mois': locations_mois,
+            'en_cours': stats['en_cours'],
+            'confirmees': stats['confirmees'],
+            'terminees': stats['terminees'],
+            'annulees': stats['annulees'],
+            'en_attente': stats['demandes'],
+            'ce_mois': stats['ce_mois'],
             'duree_moyenne_jours': round(duree_moyenne, 1),
             'taux_conversion': round(taux_conversion, 1),
         }
     
     def get_vehicules(self):
-        """Calculer les statistiques des véhicules."""
+        """Calculer les statistiques des véhicules (compteurs en une requête)."""
         vehicules = Vehicule.objects.filter(concessionnaire=self.concessionnaire)
         
-        total = vehicules.count()
-        disponibles = vehicules.filter(statut='DISPONIBLE').count()
-        loues = vehicules.filter(statut='LOUE').count()
-        maintenance = vehicules.filter(statut='MAINTENANCE').count()
-        indisponibles = vehicules.filter(statut='INDISPONIBLE').count()
-        
-        # Note moyenne
-        note_moyenne = vehicules.aggregate(moyenne=Avg('note_moyenne'))['moyenne'] or 0
+        stats = vehicules.aggregate(
+            total=Count('id'),
+            disponibles=Count('id', filter=Q(statut='DISPONIBLE')),
+            loues=Count('id', filter=Q(statut='LOUE')),
+            maintenance=Count('id', filter=Q(statut='MAINTENANCE')),
+            indisponibles=Count('id', filter=Q(statut='INDISPONIBLE')),
+            note_moyenne=Avg('note_moyenne'),
+        )
         
         # Top 5 véhicules les plus loués
         top_vehicules = vehicules.order_by('-nombre_locations')[:5].values(
@@ -143,73 +147,71 @@ class StatistiquesConcessionnaire:
         )
         
         # Taux d'occupation
-        taux_occupation = (loues / total * 100) if total > 0 else 0
+        total = stats['total']
+        taux_occupation = (stats['loues'] / total * 100) if total > 0 else 0
         
         return {
             'total': total,
-            'disponibles': disponibles,
-            'loues': loues,
-            'maintenance': maintenance,
-            'indisponibles': indisponibles,
-            'note_moyenne': round(float(note_moyenne), 2),
+            'disponibles': stats['disponibles'],
+            'loues': stats['loues'],
+            'maintenance': stats['maintenance'],
+            'indisponibles': stats['indisponibles'],
+            'note_moyenne': round(float(stats['note_moyenne'] or 0), 2),
             'taux_occupation': round(taux_occupation, 1),
             'top_vehicules': list(top_vehicules),
         }
     
     def get_demandes(self):
-        """Calculer les statistiques des demandes."""
+        """Calculer les statistiques des demandes (compteurs en une requête)."""
         demandes = DemandeContact.objects.filter(concessionnaire=self.concessionnaire)
-        
-        total = demandes.count()
-        en_attente = demandes.filter(statut='EN_ATTENTE').count()
-        en_cours = demandes.filter(statut='EN_COURS').count()
-        traitees = demandes.filter(statut='TRAITEE').count()
-        
-        # Ce mois
         debut_mois = self.today.replace(day=1)
-        demandes_mois = demandes.filter(date_creation__date__gte=debut_mois).count()
+        
+        stats = demandes.aggregate(
+            total=Count('id'),
+            en_attente=Count('id', filter=Q(statut='EN_ATTENTE')),
+            en_cours=Count('id', filter=Q(statut='EN_COURS')),
+            traitees=Count('id', filter=Q(statut='TRAITEE')),
+            ce_mois=Count('id', filter=Q(date_creation__date__gte=debut_mois)),
+            # Délai moyen de réponse, calculé en base
+            delai_moyen=Avg(
+                ExpressionWrapper(
+                    F('date_reponse') - F('date_creation'),
+                    output_field=DurationField()
+                ),
+                filter=Q(statut='TRAITEE', date_reponse__isnull=False)
+            ),
+        )
         
         # Par type
         par_type = demandes.values('type_demande').annotate(
             count=Count('id')
         ).order_by('-count')
         
-        # Délai moyen de réponse (en heures)
-        demandes_traitees = demandes.filter(
-            statut='TRAITEE',
-            date_reponse__isnull=False
-        )
-        
-        delai_moyen = 0
-        if demandes_traitees.exists():
-            from django.db.models import ExpressionWrapper, DurationField
-            # Calcul simplifié
-            total_heures = 0
-            count = 0
-            for d in demandes_traitees[:100]:  # Limiter pour performance
-                if d.date_reponse and d.date_creation:
-                    delta = d.date_reponse - d.date_creation
-                    total_heures += delta.total_seconds() / 3600
-                    count += 1
-            if count > 0:
-                delai_moyen = total_heures / count
+        delai_moyen = stats['delai_moyen']
+        delai_moyen_heures = delai_moyen.total_seconds() / 3600 if delai_moyen else 0
         
         return {
-            'total': total,
-            'en_attente': en_attente,
-            'en_cours': en_cours,
-            'traitees': traitees,
-            'ce_mois': demandes_mois,
+            'total': stats['total'],
+            'en_attente': stats['en_attente'],
+            'en_cours': stats['en_cours'],
+            'traitees': stats['traitees'],
+            'ce_mois': stats['ce_mois'],
             'par_type': list(par_type),
-            'delai_moyen_heures': round(delai_moyen, 1),
+            'delai_moyen_heures': round(delai_moyen_heures, 1),
         }
     
     def get_avis(self):
         """Calculer les statistiques des avis."""
         avis = Avis.objects.filter(vehicule__concessionnaire=self.concessionnaire)
+        debut_mois = self.today.replace(day=1)
         
-        total = avis.count()
-        note_moyenne = avis.aggregate(moyenne=Avg('note'))['moyenne'] or 0
+        stats = self.agregats.aggregate(
+            total=Sum('avis_recus'),
+            somme_notes=Sum('somme_notes'),
+            ce_mois=Sum('avis_recus', filter=Q(date__gte=debut_mois)),
+            recommandes=Sum('avis_recommandes'),
+        )
+        stats = {cle: valeur or 0 for cle, valeur in stats.items()}
         
         # Répartition par note
         par_note = avis.values('note').annotate(count=Count('id')).order_by('note')
@@ -217,75 +219,72 @@ class StatistiquesConcessionnaire:
         # Avis en attente de réponse
         sans_reponse = avis.filter(reponse='').count()
         
-        # Ce mois
-        debut_mois = self.today.replace(day=1)
-        avis_mois = avis.filter(date_creation__date__gte=debut_mois).count()
+        total = stats['total']
+        note_moyenne = stats['somme_notes'] / total if total > 0 else 0
         
         # Taux de recommandation
-        recommandes = avis.filter(recommande=True).count()
-        taux_recommandation = (recommandes / total * 100) if total > 0 else 0
+        taux_recommandation = (stats['recommandes'] / total * 100) if total > 0 else 0
         
         return {
             'total': total,
             'note_moyenne': round(float(note_moyenne), 2),
             'par_note': list(par_note),
             'sans_reponse': sans_reponse,
-            'ce_mois': avis_mois,
+            'ce_mois': stats['ce_mois'],
             'taux_recommandation': round(taux_recommandation, 1),
         }
     
     def get_promotions(self):
         """Calculer les statistiques des promotions."""
-        promotions = Promotion.objects.filter(concessionnaire=self.concessionnaire)
-        utilisations = UtilisationPromotion.objects.filter(
-            promotion__concessionnaire=self.concessionnaire
+        promotions = Promotion.objects.filter(
+            concessionnaire=self.concessionnaire
+        ).aggregate(
+            total=Count('id'),
+            actives=Count('id', filter=Q(statut='ACTIF')),
         )
         
-        total = promotions.count()
-        actives = promotions.filter(statut='ACTIF').count()
-        
-        # Total des réductions accordées
-        total_reductions = utilisations.aggregate(
-            total=Sum('montant_reduction')
-        )['total'] or Decimal('0')
-        
-        # Nombre d'utilisations
-        nb_utilisations = utilisations.count()
+        utilisations = self.agregats.aggregate(
+            nb_utilisations=Sum('utilisations_promotions'),
+            # Total des réductions accordées
+            total_reductions=Sum('reductions_promotions'),
+        )
         
         return {
-            'total': total,
-            'actives': actives,
-            'nb_utilisations': nb_utilisations,
-            'total_reductions': float(total_reductions),
+            'total': promotions['total'],
+            'actives': promotions['actives'],
+            'nb_utilisations': utilisations['nb_utilisations'] or 0,
+            'total_reductions': float(utilisations['total_reductions'] or Decimal('0')),
         }
     
     def get_tendances(self):
-        """Calculer les tendances (6 derniers mois)."""
-        locations = Location.objects.filter(
-            concessionnaire=self.concessionnaire,
-            statut='TERMINEE'
+        """Calculer les tendances (6 derniers mois, une seule requête)."""
+        par_mois = list(
+            self.agregats.filter(
+                date__gte=debut_periode_mois(self.today, 6)
+            ).annotate(
+                mois=TruncMonth('date')
+            ).values('mois').annotate(
+                revenus=Sum('revenus'),
+                retournees=Sum('locations_retournees'),
+                creees=Sum('locations_creees'),
+            ).order_by('-mois')
         )
         
         # Revenus par mois
-        revenus_par_mois = locations.annotate(
-            mois=TruncMonth('date_retour_reel')
-        ).values('mois').annotate(
-            total=Sum('prix_total'),
-            count=Count('id')
-        ).order_by('-mois')[:6]
+        revenus_par_mois = [
+            {'mois': ligne['mois'], 'total': ligne['revenus'], 'count': ligne['retournees']}
+            for ligne in par_mois if ligne['retournees']
+        ]
         
         # Locations par mois
-        locations_par_mois = Location.objects.filter(
-            concessionnaire=self.concessionnaire
-        ).annotate(
-            mois=TruncMonth('date_creation')
-        ).values('mois').annotate(
-            count=Count('id')
-        ).order_by('-mois')[:6]
+        locations_par_mois = [
+            {'mois': ligne['mois'], 'count': ligne['creees']}
+            for ligne in par_mois if ligne['creees']
+        ]
         
         return {
-            'revenus_par_mois': list(revenus_par_mois),
-            'locations_par_mois': list(locations_par_mois),
+            'revenus_par_mois': revenus_par_mois,
+            'locations_par_mois': locations_par_mois,
         }
 
 
@@ -301,6 +300,7 @@ class StatistiquesClient:
     def __init__(self, client):
         self.client = client
         self.today = timezone.now().date()
+        self.agregats = StatistiqueClientJournaliere.objects.filter(client=client)
     
     def get_statistiques_completes(self):
         """Retourner toutes les statistiques."""
@@ -314,18 +314,19 @@ class StatistiquesClient:
     
     def get_locations(self):
         """Statistiques des locations du client."""
-        locations = Location.objects.filter(client=self.client)
-        
-        total = locations.count()
-        en_cours = locations.filter(statut='EN_COURS').count()
-        terminees = locations.filter(statut='TERMINEE').count()
-        annulees = locations.filter(statut='ANNULEE').count()
+        stats = self.agregats.aggregate(
+            total=Sum('locations_creees'),
+            en_cours=Sum('locations_en_cours'),
+            terminees=Sum('locations_terminees'),
+            annulees=Sum('locations_annulees'),
+        )
         
         # Prochaine location
-        prochaine = locations.filter(
+        prochaine = Location.objects.filter(
+            client=self.client,
             statut='CONFIRMEE',
             date_debut__gte=self.today
-        ).order_by('date_debut').first()
+        ).select_related('vehicule__marque').order_by('date_debut').first()
         
         prochaine_info = None
         if prochaine:
@@ -336,42 +337,36 @@ class StatistiquesClient:
             }
         
         return {
-            'total': total,
-            'en_cours': en_cours,
-            'terminees': terminees,
-            'annulees': annulees,
+            'total': stats['total'] or 0,
+            'en_cours': stats['en_cours'] or 0,
+            'terminees': stats['terminees'] or 0,
+            'annulees': stats['annulees'] or 0,
             'prochaine_location': prochaine_info,
         }
     
     def get_depenses(self):
-        """Statistiques des dépenses du client."""
-        locations = Location.objects.filter(
-            client=self.client,
-            statut='TERMINEE'
-        )
-        
-        # Total dépensé
-        total = locations.aggregate(total=Sum('prix_total'))['total'] or Decimal('0')
-        
-        # Ce mois
+        """Statistiques des dépenses du client (agrégats journaliers)."""
         debut_mois = self.today.replace(day=1)
-        depenses_mois = locations.filter(
-            date_retour_reel__date__gte=debut_mois
-        ).aggregate(total=Sum('prix_total'))['total'] or Decimal('0')
         
-        # Économies (promotions)
-        economies = locations.aggregate(
-            total=Sum('montant_reduction')
-        )['total'] or Decimal('0')
+        stats = self.agregats.aggregate(
+            # Total dépensé
+            total=Sum('depenses'),
+            ce_mois=Sum('depenses', filter=Q(date__gte=debut_mois)),
+            # Économies (promotions)
+            economies=Sum('economies'),
+            nb_locations=Sum('locations_retournees'),
+        )
+        
+        total = stats['total'] or Decimal('0')
+        nb_locations = stats['nb_locations'] or 0
         
         # Panier moyen
-        nb_locations = locations.count()
         panier_moyen = total / nb_locations if nb_locations > 0 else Decimal('0')
         
         return {
             'total': float(total),
-            'ce_mois': float(depenses_mois),
-            'economies': float(economies),
+            'ce_mois': float(stats['ce_mois'] or Decimal('0')),
+            'economies': float(stats['economies'] or Decimal('0')),
             'panier_moyen': float(panier_moyen),
         }
     
@@ -382,11 +377,8 @@ class StatistiquesClient:
         total = favoris.count()
         avec_alerte = favoris.filter(alerte_prix_active=True).count()
         
-        # Favoris avec baisse de prix
-        baisses = 0
-        for favori in favoris.filter(alerte_prix_active=True):
-            if favori.verifier_baisse_prix():
-                baisses += 1
+        # Favoris avec baisse de prix : un seul COUNT (voir favoris/alertes_prix.py)
+        baisses = alertes_prix.favoris_en_baisse(favoris).count()
         
         return {
             'total': total,
@@ -455,35 +447,37 @@ class StatistiquesAdmin:
     
     def get_utilisateurs(self):
         """Statistiques des utilisateurs."""
-        users = User.objects.all()
-        
-        total = users.count()
-        clients = users.filter(type_utilisateur='CLIENT').count()
-        concessionnaires = users.filter(type_utilisateur='CONCESSIONNAIRE').count()
-        admins = users.filter(type_utilisateur='ADMINISTRATEUR').count()
-        
-        # Nouveaux ce mois
         debut_mois = self.today.replace(day=1)
-        nouveaux_mois = users.filter(date_inscription__date__gte=debut_mois).count()
         
-        # Actifs (connectés dans les 30 derniers jours)
-        date_limite = timezone.now() - timedelta(days=30)
-        actifs = users.filter(derniere_connexion__gte=date_limite).count()
+        inscriptions = StatistiquePlateformeJournaliere.objects.aggregate(
+            total=Sum('nouveaux_utilisateurs'),
+            clients=Sum('nouveaux_clients'),
+            concessionnaires=Sum('nouveaux_concessionnaires'),
+            admins=Sum('nouveaux_administrateurs'),
+            # Nouveaux ce mois
+            nouveaux_mois=Sum('nouveaux_utilisateurs', filter=Q(date__gte=debut_mois)),
+        )
+        inscriptions = {cle: valeur or 0 for cle, valeur in inscriptions.items()}
         
-        # Concessionnaires en attente de validation
-        en_attente_validation = users.filter(
-            type_utilisateur='CONCESSIONNAIRE',
-            est_valide=False
-        ).count()
+        date_limite = timezone.now() - timedelta(days=30)
+        etat = User.objects.aggregate(
+            # Actifs (connectés dans les 30 derniers jours)
+            actifs=Count('id', filter=Q(derniere_connexion__gte=date_limite)),
+            # Concessionnaires en attente de validation
+            en_attente_validation=Count('id', filter=Q(
+                type_utilisateur='CONCESSIONNAIRE',
+                est_valide=False
+            )),
+        )
         
         return {
-            'total': total,
-            'clients': clients,
-            'concessionnaires': concessionnaires,
-            'admins': admins,
-            'nouveaux_ce_mois': nouveaux_mois,
-            'actifs_30_jours': actifs,
-            'concessionnaires_en_attente': en_attente_validation,
+            'total': inscriptions['total'],
+            'clients': inscriptions['clients'],
+            'concessionnaires': inscriptions['concessionnaires'],
+            'admins': inscriptions['admins'],
+            'nouveaux_ce_mois': inscriptions['nouveaux_mois'],
+            'actifs_30_jours': etat['actifs'],
+            'concessionnaires_en_attente': etat['en_attente_validation'],
         }
     
     def get_concessions(self):
@@ -512,9 +506,13 @@ class StatistiquesAdmin:
         """Statistiques des véhicules."""
         vehicules = Vehicule.objects.all()
         
-        total = vehicules.count()
-        disponibles = vehicules.filter(statut='DISPONIBLE').count()
-        loues = vehicules.filter(statut='LOUE').count()
+        stats = vehicules.aggregate(
+            total=Count('id'),
+            disponibles=Count('id', filter=Q(statut='DISPONIBLE')),
+            loues=Count('id', filter=Q(statut='LOUE')),
+            # Note moyenne globale
+            note_moyenne=Avg('note_moyenne'),
+        )
         
         # Par catégorie
         par_categorie = vehicules.values(
@@ -526,63 +524,59 @@ class StatistiquesAdmin:
             'marque__nom'
         ).annotate(count=Count('id')).order_by('-count')[:10]
         
-        # Note moyenne globale
-        note_moyenne = vehicules.aggregate(moyenne=Avg('note_moyenne'))['moyenne'] or 0
-        
         return {
-            'total': total,
-            'disponibles': disponibles,
-            'loues': loues,
+            'total': stats['total'],
+            'disponibles': stats['disponibles'],
+            'loues': stats['loues'],
             'par_categorie': list(par_categorie),
             'par_marque': list(par_marque),
-            'note_moyenne_globale': round(float(note_moyenne), 2),
+            'note_moyenne_globale': round(float(stats['note_moyenne'] or 0), 2),
         }
     
     def get_locations(self):
-        """Statistiques des locations."""
-        locations = Location.objects.all()
-        
-        total = locations.count()
-        en_cours = locations.filter(statut='EN_COURS').count()
-        terminees = locations.filter(statut='TERMINEE').count()
-        
-        # Ce mois
+        """Statistiques des locations (agrégats journaliers)."""
         debut_mois = self.today.replace(day=1)
-        ce_mois = locations.filter(date_creation__date__gte=debut_mois).count()
+        
+        stats = StatistiqueConcessionnaireJournaliere.objects.aggregate(
+            total=Sum('locations_creees'),
+            en_attente=Sum('locations_en_attente'),
+            confirmees=Sum('locations_confirmees'),
+            en_cours=Sum('locations_en_cours'),
+            terminees=Sum('locations_terminees'),
+            ce_mois=Sum('locations_creees', filter=Q(date__gte=debut_mois)),
+        )
+        stats = {cle: valeur or 0 for cle, valeur in stats.items()}
         
         # Taux de réussite global
-        total_hors_demande = locations.exclude(statut='DEMANDE').count()
-        reussies = locations.filter(statut__in=['CONFIRMEE', 'EN_COURS', 'TERMINEE']).count()
+        total_hors_demande = stats['total'] - stats['en_attente']
+        reussies = stats['confirmees'] + stats['en_cours'] + stats['terminees']
         taux_reussite = (reussies / total_hors_demande * 100) if total_hors_demande > 0 else 0
         
         return {
-            'total': total,
-            'en_cours': en_cours,
-            'terminees': terminees,
-            'ce_mois': ce_mois,
+            'total': stats['total'],
+            'en_cours': stats['en_cours'],
+            'terminees': stats['terminees'],
+            'ce_mois': stats['ce_mois'],
             'taux_reussite': round(taux_reussite, 1),
         }
     
     def get_revenus(self):
-        """Statistiques des revenus globaux."""
-        locations = Location.objects.filter(statut='TERMINEE')
-        
-        # Total
-        total = locations.aggregate(total=Sum('prix_total'))['total'] or Decimal('0')
-        
-        # Ce mois
+        """Statistiques des revenus globaux (agrégats journaliers)."""
         debut_mois = self.today.replace(day=1)
-        ce_mois = locations.filter(
-            date_retour_reel__date__gte=debut_mois
-        ).aggregate(total=Sum('prix_total'))['total'] or Decimal('0')
-        
-        # Mois précédent
         debut_mois_precedent = (debut_mois - timedelta(days=1)).replace(day=1)
         fin_mois_precedent = debut_mois - timedelta(days=1)
-        mois_precedent = locations.filter(
-            date_retour_reel__date__gte=debut_mois_precedent,
-            date_retour_reel__date__lte=fin_mois_precedent
-        ).aggregate(total=Sum('prix_total'))['total'] or Decimal('0')
+        
+        stats = StatistiqueConcessionnaireJournaliere.objects.aggregate(
+            total=Sum('revenus'),
+            ce_mois=Sum('revenus', filter=Q(date__gte=debut_mois)),
+            mois_precedent=Sum(
+                'revenus',
+                filter=Q(date__gte=debut_mois_precedent, date__lte=fin_mois_precedent)
+            ),
+        )
+        
+        ce_mois = stats['ce_mois'] or Decimal('0')
+        mois_precedent = stats['mois_precedent'] or Decimal('0')
         
         # Variation
         if mois_precedent > 0:
@@ -591,7 +585,7 @@ class StatistiquesAdmin:
             variation = 100 if ce_mois > 0 else 0
         
         return {
-            'total': float(total),
+            'total': float(stats['total'] or Decimal('0')),
             'ce_mois': float(ce_mois),
             'mois_precedent': float(mois_precedent),
             'variation_pourcentage': round(float(variation), 1),
@@ -599,42 +593,60 @@ class StatistiquesAdmin:
     
     def get_demandes(self):
         """Statistiques des demandes."""
-        demandes = DemandeContact.objects.all()
-        
-        total = demandes.count()
-        en_attente = demandes.filter(statut='EN_ATTENTE').count()
-        traitees = demandes.filter(statut='TRAITEE').count()
-        
-        # Ce mois
         debut_mois = self.today.replace(day=1)
-        ce_mois = demandes.filter(date_creation__date__gte=debut_mois).count()
+        
+        stats = DemandeContact.objects.aggregate(
+            total=Count('id'),
+            en_attente=Count('id', filter=Q(statut='EN_ATTENTE')),
+            traitees=Count('id', filter=Q(statut='TRAITEE')),
+            # Ce mois
+            ce_mois=Count('id', filter=Q(date_creation__date__gte=debut_mois)),
+        )
         
         return {
-            'total': total,
-            'en_attente': en_attente,
-            'traitees': traitees,
-            'ce_mois': ce_mois,
+            'total': stats['total'],
+            'en_attente': stats['en_attente'],
+            'traitees': stats['traitees'],
+            'ce_mois': stats['ce_mois'],
         }
     
     def get_tendances(self):
-        """Tendances globales (6 derniers mois)."""
+        """Tendances globales (6 derniers mois, agrégats journaliers)."""
+        debut = debut_periode_mois(self.today, 6)
+        
         # Inscriptions par mois
-        inscriptions = User.objects.annotate(
-            mois=TruncMonth('date_inscription')
-        ).values('mois').annotate(count=Count('id')).order_by('-mois')[:6]
+        inscriptions = StatistiquePlateformeJournaliere.objects.filter(
+            date__gte=debut
+        ).annotate(
+            mois=TruncMonth('date')
+        ).values('mois').annotate(count=Sum('nouveaux_utilisateurs')).order_by('-mois')
+        
+        par_mois = list(
+            StatistiqueConcessionnaireJournaliere.objects.filter(
+                date__gte=debut
+            ).annotate(
+                mois=TruncMonth('date')
+            ).values('mois').annotate(
+                creees=Sum('locations_creees'),
+                revenus=Sum('revenus'),
+                retournees=Sum('locations_retournees'),
+            ).order_by('-mois')
+        )
         
         # Locations par mois
-        locations = Location.objects.annotate(
-            mois=TruncMonth('date_creation')
-        ).values('mois').annotate(count=Count('id')).order_by('-mois')[:6]
+        locations = [
+            {'mois': ligne['mois'], 'count': ligne['creees']}
+            for ligne in par_mois if ligne['creees']
+        ]
         
         # Revenus par mois
-        revenus = Location.objects.filter(statut='TERMINEE').annotate(
-            mois=TruncMonth('date_retour_reel')
-        ).values('mois').annotate(total=Sum('prix_total')).order_by('-mois')[:6]
+        revenus = [
+            {'mois': ligne['mois'], 'total': ligne['revenus']}
+            for ligne in par_mois if ligne['retournees']
+        ]
         
         return {
             'inscriptions_par_mois': list(inscriptions),
-            'locations_par_mois': list(locations),
-            'revenus_par_mois': list(revenus),
+            'locations_par_mois': locations,
+            'revenus_par_mois': revenus,
         }
\ No newline at end of file
@@ -0,0 +1,60 @@
+# backend/statistiques/signals.py
+# Marquage des jours d'agrégats à recalculer et invalidation du cache
+# des tableaux de bord
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from users.models import User
+from locations.models import Location
+from avis.models import Avis
+from demands.models import DemandeContact
+from promotions.models import Promotion, UtilisationPromotion
+from statistiques import cache as cache_statistiques
+from statistiques.agregats import marquer_jours
+
+
+@receiver([post_save, post_delete], sender=Location)
+def location_modifiee(sender, instance, **kwargs):
+    marquer_jours(instance.date_creation, instance.date_retour_reel)
+    cache_statistiques.invalider('concessionnaire', instance.concessionnaire_id)
+    cache_statistiques.invalider('client', instance.client_id)
+
+
+@receiver([post_save, post_delete], sender=Avis)
+def avis_modifie(sender, instance, **kwargs):
+    from vehicules.models import Vehicule
+
+    marquer_jours(instance.date_creation)
+    concessionnaire_id = Vehicule.objects.filter(
+        pk=instance.vehicule_id
+    ).values_list('concessionnaire_id', flat=True).first()
+    cache_statistiques.invalider('concessionnaire', concessionnaire_id)
+    cache_statistiques.invalider('client', instance.client_id)
+
+
+@receiver([post_save, post_delete], sender=DemandeContact)
+def demande_modifiee(sender, instance, **kwargs):
+    cache_statistiques.invalider('concessionnaire', instance.concessionnaire_id)
+    cache_statistiques.invalider('client', instance.client_id)
+
+
+@receiver([post_save, post_delete], sender=Promotion)
+def promotion_modifiee(sender, instance, **kwargs):
+    cache_statistiques.invalider('concessionnaire', instance.concessionnaire_id)
+
+
+@receiver([post_save, post_delete], sender=UtilisationPromotion)
+def utilisation_promotion_modifiee(sender, instance, **kwargs):
+    marquer_jours(instance.date_utilisation)
+
+
+@receiver(post_delete, sender=User)
+def utilisateur_supprime(sender, instance, **kwargs):
+    marquer_jours(instance.date_inscription)
+
+
+@receiver(post_save, sender=User)
+def utilisateur_inscrit(sender, instance, created, **kwargs):
+    if created:
+        marquer_jours(instance.date_inscription)
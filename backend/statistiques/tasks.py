@@ -0,0 +1,12 @@
+# backend/statistiques/tasks.py
+# Tâches Celery de l'app statistiques
+
+from celery import shared_task
+
+from statistiques import agregats
+
+
+@shared_task
+def rafraichir_statistiques():
+    """Recalculer les agrégats des jours modifiés et de la journée en cours."""
+    return agregats.rafraichir()
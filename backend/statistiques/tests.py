@@ -1,3 +1,65 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from vehicules.tests.donnees import CatalogueTestMixin
+from vehicules.models import Vehicule
+from locations.models import Location
+from statistiques import agregats
+from statistiques.services import StatistiquesConcessionnaire
+
+
+# Nombre de requêtes du tableau de bord concessionnaire :
+# revenus 1, locations 1, véhicules 2, demandes 2, avis 3,
+# promotions 2, tendances 1
+NOMBRE_REQUETES_DASHBOARD = 12
+
+
+class StatistiquesConcessionnaireRequetesTest(CatalogueTestMixin, TestCase):
+    """Le tableau de bord ne doit pas dépendre de la taille de la flotte."""
+
+    def creer_flotte(self, nombre, debut=0):
+        """Créer nombre véhicules ayant chacun une location terminée et une en cours."""
+        aujourd_hui = timezone.now().date()
+        statuts = ['DISPONIBLE', 'LOUE', 'MAINTENANCE']
+
+        for i in range(debut, debut + nombre):
+            vehicule = Vehicule.objects.create(
+                concessionnaire=self.concessionnaire, concession=self.concession,
+                marque=self.marque, categorie=self.categorie,
+                nom_modele=f'Modele {i}', annee=2020, couleur='Noir',
+                immatriculation=f'DK-{i:04d}-T', statut=statuts[i % len(statuts)],
+                prix_location_jour=Decimal('20000')
+            )
+            for statut in ['TERMINEE', 'EN_COURS']:
+                Location.objects.create(
+                    vehicule=vehicule, client=self.client_user,
+                    date_debut=aujourd_hui - timedelta(days=10),
+                    date_fin=aujourd_hui - timedelta(days=8),
+                    prix_jour=Decimal('20000'), caution=Decimal('0'),
+                    statut=statut, date_retour_reel=timezone.now()
+                )
+
+    def compter_requetes(self):
+        agregats.rafraichir()
+        with CaptureQueriesContext(connection) as contexte:
+            stats = StatistiquesConcessionnaire(self.concessionnaire).get_statistiques_completes()
+        return len(contexte.captured_queries), stats
+
+    def test_nombre_requetes_fixe(self):
+        self.creer_flotte(2)
+        petite_flotte, _ = self.compter_requetes()
+
+        self.creer_flotte(15, debut=2)
+        grande_flotte, stats = self.compter_requetes()
 
-# Create your tests here.
+        self.assertEqual(petite_flotte, NOMBRE_REQUETES_DASHBOARD)
+        self.assertEqual(grande_flotte, NOMBRE_REQUETES_DASHBOARD)
+        self.assertEqual(stats['vehicules']['total'], 17)
+        self.assertEqual(stats['locations']['total'], 34)
+        self.assertEqual(stats['locations']['terminees'], 17)
+        self.assertEqual(stats['locations']['en_cours'], 17)
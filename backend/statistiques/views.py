@@ -14,6 +14,17 @@ from .services import (
     StatistiquesAdmin
 )
 from users.permissions import IsConcessionnaire, IsClient, IsAdministrateur
+from statistiques import cache as cache_statistiques
+
+
+def reponse_en_cache(role, request, section, calcul):
+    """Servir une section de tableau de bord depuis le cache (TTL court)."""
+    stats, trouve = cache_statistiques.obtenir(role, request.user.pk, section, calcul)
+    return Response(
+        stats,
+        status=status.HTTP_200_OK,
+        headers={'X-Cache': 'HIT' if trouve else 'MISS'}
+    )
 
 
 # ========================================
@@ -34,9 +45,7 @@ class DashboardConcessionnnaireView(APIView):
     def get(self, request):
         """Récupérer les statistiques complètes."""
         service = StatistiquesConcessionnaire(request.user)
-        stats = service.get_statistiques_completes()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('concessionnaire', request, 'dashboard', service.get_statistiques_completes)
 
 
 class RevenusConcessionnnaireView(APIView):
@@ -51,9 +60,7 @@ class RevenusConcessionnnaireView(APIView):
     def get(self, request):
         """Récupérer les statistiques de revenus."""
         service = StatistiquesConcessionnaire(request.user)
-        stats = service.get_revenus()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('concessionnaire', request, 'revenus', service.get_revenus)
 
 
 class LocationsConcessionnnaireView(APIView):
@@ -68,9 +75,7 @@ class LocationsConcessionnnaireView(APIView):
     def get(self, request):
         """Récupérer les statistiques de locations."""
         service = StatistiquesConcessionnaire(request.user)
-        stats = service.get_locations()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('concessionnaire', request, 'locations', service.get_locations)
 
 
 class VehiculesConcessionnnaireView(APIView):
@@ -85,9 +90,7 @@ class VehiculesConcessionnnaireView(APIView):
     def get(self, request):
         """Récupérer les statistiques de véhicules."""
         service = StatistiquesConcessionnaire(request.user)
-        stats = service.get_vehicules()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('concessionnaire', request, 'vehicules', service.get_vehicules)
 
 
 class DemandesConcessionnnaireView(APIView):
@@ -102,9 +105,7 @@ class DemandesConcessionnnaireView(APIView):
     def get(self, request):
         """Récupérer les statistiques de demandes."""
         service = StatistiquesConcessionnaire(request.user)
-        stats = service.get_demandes()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('concessionnaire', request, 'demandes', service.get_demandes)
 
 
 class AvisConcessionnnaireView(APIView):
@@ -119,9 +120,7 @@ class AvisConcessionnnaireView(APIView):
     def get(self, request):
         """Récupérer les statistiques d'avis."""
         service = StatistiquesConcessionnaire(request.user)
-        stats = service.get_avis()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('concessionnaire', request, 'avis', service.get_avis)
 
 
 class TendancesConcessionnnaireView(APIView):
@@ -136,9 +135,7 @@ class TendancesConcessionnnaireView(APIView):
     def get(self, request):
         """Récupérer les tendances."""
         service = StatistiquesConcessionnaire(request.user)
-        stats = service.get_tendances()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('concessionnaire', request, 'tendances', service.get_tendances)
 
 
 # ========================================
@@ -159,9 +156,7 @@ class DashboardClientView(APIView):
     def get(self, request):
         """Récupérer les statistiques complètes."""
         service = StatistiquesClient(request.user)
-        stats = service.get_statistiques_completes()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('client', request, 'dashboard', service.get_statistiques_completes)
 
 
 class LocationsClientView(APIView):
@@ -176,9 +171,7 @@ class LocationsClientView(APIView):
     def get(self, request):
         """Récupérer les statistiques de locations."""
         service = StatistiquesClient(request.user)
-        stats = service.get_locations()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('client', request, 'locations', service.get_locations)
 
 
 class DepensesClientView(APIView):
@@ -193,9 +186,7 @@ class DepensesClientView(APIView):
     def get(self, request):
         """Récupérer les statistiques de dépenses."""
         service = StatistiquesClient(request.user)
-        stats = service.get_depenses()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('client', request, 'depenses', service.get_depenses)
 
 
 class FavorisClientView(APIView):
@@ -210,9 +201,7 @@ class FavorisClientView(APIView):
     def get(self, request):
         """Récupérer les statistiques de favoris."""
         service = StatistiquesClient(request.user)
-        stats = service.get_favoris()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('client', request, 'favoris', service.get_favoris)
 
 
 class ActiviteClientView(APIView):
@@ -227,9 +216,7 @@ class ActiviteClientView(APIView):
     def get(self, request):
         """Récupérer les statistiques d'activité."""
         service = StatistiquesClient(request.user)
-        stats = service.get_activite()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('client', request, 'activite', service.get_activite)
 
 
 # ========================================
@@ -250,9 +237,7 @@ class DashboardAdminView(APIView):
     def get(self, request):
         """Récupérer les statistiques complètes."""
         service = StatistiquesAdmin()
-        stats = service.get_statistiques_completes()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('admin', request, 'dashboard', service.get_statistiques_completes)
 
 
 class UtilisateursAdminView(APIView):
@@ -267,9 +252,7 @@ class UtilisateursAdminView(APIView):
     def get(self, request):
         """Récupérer les statistiques des utilisateurs."""
         service = StatistiquesAdmin()
-        stats = service.get_utilisateurs()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('admin', request, 'utilisateurs', service.get_utilisateurs)
 
 
 class ConcessionsAdminView(APIView):
@@ -284,9 +267,7 @@ class ConcessionsAdminView(APIView):
     def get(self, request):
         """Récupérer les statistiques des concessions."""
         service = StatistiquesAdmin()
-        stats = service.get_concessions()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('admin', request, 'concessions', service.get_concessions)
 
 
 class VehiculesAdminView(APIView):
@@ -301,9 +282,7 @@ class VehiculesAdminView(APIView):
     def get(self, request):
         """Récupérer les statistiques des véhicules."""
         service = StatistiquesAdmin()
-        stats = service.get_vehicules()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('admin', request, 'vehicules', service.get_vehicules)
 
 
 class LocationsAdminView(APIView):
@@ -318,9 +297,7 @@ class LocationsAdminView(APIView):
     def get(self, request):
         """Récupérer les statistiques des locations."""
         service = StatistiquesAdmin()
-        stats = service.get_locations()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('admin', request, 'locations', service.get_locations)
 
 
 class RevenusAdminView(APIView):
@@ -335,9 +312,7 @@ class RevenusAdminView(APIView):
     def get(self, request):
         """Récupérer les statistiques des revenus."""
         service = StatistiquesAdmin()
-        stats = service.get_revenus()
-        
-        return Response(stats, status=status.HTTP_200_OK)
+        return reponse_en_cache('admin', request, 'revenus', service.get_revenus)
 
 
 class TendancesAdminView(APIView):
@@ -352,6 +327,4 @@ class TendancesAdminView(APIView):
     def get(self, request):
         """Récupérer les tendances."""
         service = StatistiquesAdmin()
-        stats = service.get_tendances()
-        
-        return Response(stats, status=status.HTTP_200_OK)
\ No newline at end of file
+        return reponse_en_cache('admin', request, 'tendances', service.get_tendances)
\ No newline at end of file
@@ -198,6 +198,32 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name="Préférences de notifications"
     )
     
+    # Valeurs des préférences absentes de preferences_notifications
+    PREFERENCES_NOTIFICATIONS_DEFAUT = {
+        # Notifications
+        'notifications_demandes': True,
+        'notifications_reservations': True,
+        'notifications_avis': True,
+        'notifications_maintenance': False,
+        'notifications_promotions': True,
+        
+        # Email
+        'email_nouvelles_demandes': True,
+        'email_confirmations': True,
+        'email_avis_clients': False,
+        'email_rappels': True,
+        'email_newsletter': False,
+        
+        # Confidentialité
+        'profil_public': True,
+        'afficher_telephone': True,
+        'afficher_email': False,
+        
+        # Langue et affichage
+        'langue': 'fr',
+        'theme': 'light',
+    }
+    
     newsletter_acceptee = models.BooleanField(
         default=False,
         verbose_name="Newsletter acceptée"
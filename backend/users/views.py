@@ -436,34 +436,8 @@ class ParametresView(APIView):
         # Récupérer les préférences depuis le JSONField
         preferences = user.preferences_notifications or {}
         
-        # Valeurs par défaut si certaines clés sont manquantes
-        default_preferences = {
-            # Notifications
-            'notifications_demandes': True,
-            'notifications_reservations': True,
-            'notifications_avis': True,
-            'notifications_maintenance': False,
-            'notifications_promotions': True,
-            
-            # Email
-            'email_nouvelles_demandes': True,
-            'email_confirmations': True,
-            'email_avis_clients': False,
-            'email_rappels': True,
-            'email_newsletter': False,
-            
-            # Confidentialité
-            'profil_public': True,
-            'afficher_telephone': True,
-            'afficher_email': False,
-            
-            # Langue et affichage
-            'langue': 'fr',
-            'theme': 'light',
-        }
-        
         # Fusionner les préférences existantes avec les valeurs par défaut
-        final_preferences = {**default_preferences, **preferences}
+        final_preferences = {**User.PREFERENCES_NOTIFICATIONS_DEFAUT, **preferences}
         
         return Response(final_preferences, status=status.HTTP_200_OK)
     
@@ -2,7 +2,8 @@
 
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Marque, Categorie, Vehicule, Photo, Video
+from .models import Marque, Categorie, Vehicule, Photo, Video, HistoriquePrix
+from vehicules import compteurs_derives
 
 
 # ========================================
@@ -98,9 +99,8 @@ class MarqueAdmin(admin.ModelAdmin):
     
     def mettre_a_jour_compteurs(self, request, queryset):
         """Mettre à jour les compteurs de véhicules."""
-        for marque in queryset:
-            marque.mettre_a_jour_compteur()
-        self.message_user(request, f'Compteurs mis à jour pour {queryset.count()} marque(s).')
+        nombre = compteurs_derives.recalculer('marque', queryset.values_list('pk', flat=True))
+        self.message_user(request, f'Compteurs mis à jour pour {nombre} marque(s).')
     mettre_a_jour_compteurs.short_description = 'Mettre à jour les compteurs'
 
 
@@ -200,9 +200,8 @@ class CategorieAdmin(admin.ModelAdmin):
     
     def mettre_a_jour_compteurs(self, request, queryset):
         """Mettre à jour les compteurs de véhicules."""
-        for categorie in queryset:
-            categorie.mettre_a_jour_compteur()
-        self.message_user(request, f'Compteurs mis à jour pour {queryset.count()} catégorie(s).')
+        nombre = compteurs_derives.recalculer('categorie', queryset.values_list('pk', flat=True))
+        self.message_user(request, f'Compteurs mis à jour pour {nombre} catégorie(s).')
     mettre_a_jour_compteurs.short_description = 'Mettre à jour les compteurs'
 
 
@@ -601,4 +600,26 @@ class VideoAdmin(admin.ModelAdmin):
                 obj.fichier.url
             )
         return 'Aucun aperçu disponible'
-    video_embed.short_description = 'Aperçu vidéo'
\ No newline at end of file
+    video_embed.short_description = 'Aperçu vidéo'
+
+# ========================================
+# ADMIN HISTORIQUE DES PRIX
+# ========================================
+
+@admin.register(HistoriquePrix)
+class HistoriquePrixAdmin(admin.ModelAdmin):
+    """
+    Consultation de l'historique des prix (ajout seul, écrit par Vehicule.save).
+    """
+    
+    list_display = ['vehicule', 'prix', 'prix_location_jour', 'prix_vente', 'date']
+    list_filter = ['date']
+    search_fields = ['vehicule__nom_modele', 'vehicule__immatriculation']
+    raw_id_fields = ['vehicule']
+    date_hierarchy = 'date'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
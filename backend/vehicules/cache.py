@@ -0,0 +1,171 @@
+# backend/vehicules/cache.py
+# Cache Redis des réponses publiques du catalogue véhicules
+
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+PREFIXE = 'vehicules:cache'
+
+# Générations : incrémentées à chaque modification pour invalider
+# toutes les clés construites avec l'ancienne valeur.
+CLE_GENERATION_LISTE = f'{PREFIXE}:generation:liste'
+
+# Paramètres ignorés par la signature des facettes (pagination et tri,
+# y compris le mode curseur de config.pagination.PaginationMixte)
+PARAMETRES_HORS_FACETTES = ('page', 'page_size', 'ordering', 'cursor', 'pagination')
+
+ESPACES = ['liste', 'detail', 'facettes']
+
+
+def _cle_generation_detail(vehicule_id):
+    return f'{PREFIXE}:generation:detail:{vehicule_id}'
+
+
+def _cle_compteur(espace, resultat):
+    return f'{PREFIXE}:stats:{espace}:{resultat}'
+
+
+def ttl_liste():
+    """Durée de vie (secondes) des pages de liste en cache."""
+    return getattr(settings, 'VEHICULES_CACHE_TTL_LISTE', 120)
+
+
+def ttl_detail():
+    """Durée de vie (secondes) des fiches véhicule en cache."""
+    return getattr(settings, 'VEHICULES_CACHE_TTL_DETAIL', 300)
+
+
+def _incrementer(cle):
+    """Incrémenter un compteur du cache en le créant si nécessaire."""
+    try:
+        return cache.incr(cle)
+    except ValueError:
+        if cache.add(cle, 1, timeout=None):
+            return 1
+        return cache.incr(cle)
+
+
+# ========================================
+# CONSTRUCTION DES CLÉS
+# ========================================
+
+def requete_cacheable(request):
+    """
+    Seul le trafic anonyme est servi depuis le cache : les réponses des
+    utilisateurs connectés dépendent de leur rôle (concessionnaire, etc.).
+    """
+    return request.method == 'GET' and not request.user.is_authenticated
+
+
+def _signature_requete(request, ignorer=()):
+    """
+    Normaliser les paramètres (filtres, recherche, tri, page) pour que
+    deux URLs équivalentes partagent la même clé.
+
+    Args:
+        ignorer: Paramètres sans effet sur la réponse (exclus de la clé)
+    """
+    parametres = []
+    for cle in sorted(request.query_params.keys()):
+        if cle in ignorer:
+            continue
+        valeurs = sorted(v for v in request.query_params.getlist(cle) if v != '')
+        if valeurs:
+            parametres.append((cle, valeurs))
+
+    brut = '|'.join([
+        request.scheme,
+        request.get_host(),
+        urlencode(parametres, doseq=True),
+    ])
+    return hashlib.md5(brut.encode('utf-8')).hexdigest()
+
+
+def cle_liste(request):
+    """Clé d'une page de liste pour la requête donnée."""
+    generation = cache.get(CLE_GENERATION_LISTE, 0)
+    return f'{PREFIXE}:liste:g{generation}:{_signature_requete(request)}'
+
+
+def cle_facettes(request):
+    """
+    Clé des facettes pour le jeu de filtres de la requête. La pagination
+    et le tri ne changent pas les compteurs.
+    """
+    generation = cache.get(CLE_GENERATION_LISTE, 0)
+    signature = _signature_requete(request, ignorer=PARAMETRES_HORS_FACETTES)
+    return f'{PREFIXE}:facettes:g{generation}:{signature}'
+
+
+def cle_detail(request, vehicule_id):
+    """Clé de la fiche d'un véhicule pour la requête donnée."""
+    generation = cache.get(_cle_generation_detail(vehicule_id), 0)
+    return f'{PREFIXE}:detail:{vehicule_id}:g{generation}:{_signature_requete(request)}'
+
+
+# ========================================
+# LECTURE / ÉCRITURE
+# ========================================
+
+def lire(cle, espace):
+    """
+    Lire une réponse en cache et mettre à jour les compteurs hit/miss.
+
+    Returns:
+        Les données en cache, ou None si absentes
+    """
+    data = cache.get(cle)
+    _incrementer(_cle_compteur(espace, 'hits' if data is not None else 'miss'))
+    return data
+
+
+def ecrire(cle, data, ttl):
+    """Stocker une réponse en cache."""
+    cache.set(cle, data, timeout=ttl)
+
+
+# ========================================
+# INVALIDATION
+# ========================================
+
+def invalider_vehicule(vehicule_id):
+    """
+    Invalider la fiche d'un véhicule, toutes les pages de liste et les
+    facettes (le véhicule peut apparaître sur n'importe laquelle d'entre elles).
+    """
+    if vehicule_id:
+        _incrementer(_cle_generation_detail(vehicule_id))
+    _incrementer(CLE_GENERATION_LISTE)
+
+
+# ========================================
+# STATISTIQUES
+# ========================================
+
+def statistiques():
+    """Retourner les compteurs hit/miss par espace (liste, detail, facettes)."""
+    stats = {}
+    for espace in ESPACES:
+        hits = cache.get(_cle_compteur(espace, 'hits'), 0)
+        miss = cache.get(_cle_compteur(espace, 'miss'), 0)
+        total = hits + miss
+        stats[espace] = {
+            'hits': hits,
+            'miss': miss,
+            'taux_hit': round(hits / total * 100, 1) if total > 0 else 0,
+        }
+    stats['ttl'] = {'liste': ttl_liste(), 'detail': ttl_detail(), 'facettes': ttl_liste()}
+    return stats
+
+
+def reinitialiser_statistiques():
+    """Remettre les compteurs hit/miss à zéro."""
+    cache.delete_many([
+        _cle_compteur(espace, resultat)
+        for espace in ESPACES
+        for resultat in ['hits', 'miss']
+    ])
@@ -0,0 +1,7 @@
+# backend/vehicules/champs.py
+# Enregistrements partiels (save(update_fields=...))
+
+
+def champs_concernes(update_fields, champs):
+    """Un save(update_fields=...) touche-t-il l'un des champs donnés ?"""
+    return update_fields is None or bool(set(update_fields) & set(champs))
@@ -0,0 +1,262 @@
+# backend/vehicules/compteurs.py
+# Compteurs de vues bufferisés (Vehicule, Video, Concession)
+#
+# Les vues sont accumulées dans un hash Redis (ou dans un buffer mémoire
+# si Redis est indisponible) puis reportées en base par lots via des
+# UPDATE ... SET nombre_vues = nombre_vues + n, sans verrou par requête.
+#
+# Un vidage renomme le hash en clé temporaire (<hash>:vidage:<horodatage>:<id>),
+# supprimée une fois le report en base réussi. Une clé temporaire restée
+# en Redis (worker arrêté entre les deux, restitution impossible) est
+# fusionnée dans le hash courant au vidage suivant, passé un délai.
+
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+
+logger = logging.getLogger(__name__)
+
+# Modèles dont le champ nombre_vues est bufferisé
+MODELES = {
+    'vehicule': 'vehicules.Vehicule',
+    'video': 'vehicules.Video',
+    'concession': 'concessions.Concession',
+}
+
+PREFIXE = 'compteurs:vues'
+
+# Buffer mémoire de repli : {modele: {pk: increment}}
+_buffer_local = defaultdict(lambda: defaultdict(int))
+_verrou_local = threading.Lock()
+_dernier_vidage_local = time.monotonic()
+
+
+def intervalle_vidage():
+    """Intervalle (secondes) entre deux reports en base."""
+    return getattr(settings, 'COMPTEURS_VUES_INTERVALLE_VIDAGE', 60)
+
+
+def delai_orphelins():
+    """Âge (secondes) au-delà duquel une clé temporaire est abandonnée."""
+    return getattr(settings, 'COMPTEURS_VUES_DELAI_ORPHELINS', 600)
+
+
+def _connexion_redis():
+    """Retourner la connexion Redis brute, ou None si indisponible."""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except (ImportError, NotImplementedError):
+        return None
+
+
+def _cle(modele):
+    return f'{PREFIXE}:{modele}'
+
+
+# ========================================
+# INCRÉMENTATION
+# ========================================
+
+def incrementer(modele, pk, n=1):
+    """
+    Enregistrer n vue(s) pour l'objet pk du modèle donné.
+
+    Args:
+        modele: Clé de MODELES ('vehicule', 'video', 'concession')
+        pk: Identifiant de l'objet
+        n: Nombre de vues à ajouter
+    """
+    if modele not in MODELES:
+        raise ValueError(f"Modèle de compteur inconnu : {modele}")
+
+    connexion = _connexion_redis()
+    if connexion is not None:
+        try:
+            connexion.hincrby(_cle(modele), str(pk), n)
+            return
+        except Exception:
+            # Redis injoignable : basculer sur le buffer mémoire
+            pass
+
+    _incrementer_local(modele, pk, n)
+
+
+def _incrementer_local(modele, pk, n):
+    global _dernier_vidage_local
+
+    with _verrou_local:
+        _buffer_local[modele][int(pk)] += n
+        doit_vider = time.monotonic() - _dernier_vidage_local >= intervalle_vidage()
+        if doit_vider:
+            _dernier_vidage_local = time.monotonic()
+
+    if doit_vider:
+        vider_buffer_local()
+
+
+# ========================================
+# REPORT EN BASE
+# ========================================
+
+def appliquer(modele, increments, taille_lot=500):
+    """
+    Reporter des incréments en base.
+
+    Les objets partageant le même incrément sont mis à jour ensemble,
+    par lots de taille_lot identifiants.
+
+    Args:
+        modele: Clé de MODELES
+        increments: dict {pk: increment}
+
+    Returns:
+        Nombre de vues reportées
+    """
+    Model = apps.get_model(MODELES[modele])
+
+    par_increment = defaultdict(list)
+    for pk, increment in increments.items():
+        if increment:
+            par_increment[int(increment)].append(int(pk))
+
+    with transaction.atomic():
+        for increment, pks in par_increment.items():
+            for i in range(0, len(pks), taille_lot):
+                Model.objects.filter(pk__in=pks[i:i + taille_lot]).update(
+                    nombre_vues=F('nombre_vues') + increment
+                )
+
+    return sum(increment * len(pks) for increment, pks in par_increment.items())
+
+
+def _vider_redis(connexion, modele):
+    """
+    Extraire atomiquement le hash Redis d'un modèle.
+
+    Le hash est renommé en clé temporaire, supprimée par l'appelant une
+    fois les incréments reportés en base.
+
+    Returns:
+        (cle_temporaire, {pk: increment}), cle_temporaire None si vide
+    """
+    cle_temporaire = f'{_cle(modele)}:vidage:{int(time.time())}:{uuid.uuid4().hex}'
+    try:
+        connexion.rename(_cle(modele), cle_temporaire)
+    except Exception:
+        # Hash inexistant : rien à vider
+        return None, {}
+
+    brut = connexion.hgetall(cle_temporaire)
+    return cle_temporaire, {int(pk): int(valeur) for pk, valeur in brut.items()}
+
+
+def _restituer_redis(connexion, modele, cle_temporaire, increments):
+    """
+    Report en base échoué : rendre les incréments au hash courant (repris
+    au vidage suivant). Si Redis échoue aussi, la clé temporaire reste en
+    place et sera reprise par _reprendre_orphelins().
+    """
+    try:
+        pipeline = connexion.pipeline()
+        for pk, increment in increments.items():
+            pipeline.hincrby(_cle(modele), pk, increment)
+        pipeline.delete(cle_temporaire)
+        pipeline.execute()
+    except Exception:
+        logger.error("Compteurs de vues conservés dans %s (report en base impossible)", cle_temporaire)
+
+
+def _est_orpheline(cle, maintenant):
+    """Clé temporaire plus ancienne que delai_orphelins() (ou sans horodatage)."""
+    try:
+        horodatage = int(cle.rsplit(':', 2)[-2])
+    except ValueError:
+        return True
+    return maintenant - horodatage >= delai_orphelins()
+
+
+def _reprendre_orphelins(connexion, modele):
+    """
+    Fusionner dans le hash courant les clés temporaires abandonnées d'un
+    modèle (SCAN). Chaque clé est d'abord réclamée par RENAME : deux
+    vidages simultanés ne la fusionnent pas deux fois.
+
+    Returns:
+        Nombre de clés reprises
+    """
+    maintenant = time.time()
+    reprises = 0
+    for cle in connexion.scan_iter(match=f'{_cle(modele)}:vidage:*', count=100):
+        cle = cle.decode() if isinstance(cle, bytes) else cle
+        if not _est_orpheline(cle, maintenant):
+            # Vidage peut-être encore en cours dans un autre worker
+            continue
+
+        reclamee = f'{_cle(modele)}:reprise:{uuid.uuid4().hex}'
+        try:
+            connexion.rename(cle, reclamee)
+        except Exception:
+            # Déjà reprise ou supprimée
+            continue
+
+        increments = connexion.hgetall(reclamee)
+        pipeline = connexion.pipeline()
+        for pk, increment in increments.items():
+            pipeline.hincrby(_cle(modele), pk, int(increment))
+        pipeline.delete(reclamee)
+        pipeline.execute()
+        logger.warning("Compteurs de vues repris depuis %s", cle)
+        reprises += 1
+    return reprises
+
+
+def vider_buffer_local():
+    """Reporter en base le buffer mémoire du processus courant."""
+    with _verrou_local:
+        contenu = {modele: dict(increments) for modele, increments in _buffer_local.items()}
+        _buffer_local.clear()
+
+    return {modele: appliquer(modele, increments) for modele, increments in contenu.items()}
+
+
+def vider():
+    """
+    Reporter en base tous les compteurs en attente (Redis et mémoire).
+
+    Returns:
+        dict {modele: nombre de vues reportées}
+    """
+    resultats = defaultdict(int)
+
+    connexion = _connexion_redis()
+    if connexion is not None:
+        for modele in MODELES:
+            try:
+                _reprendre_orphelins(connexion, modele)
+                cle_temporaire, increments = _vider_redis(connexion, modele)
+            except Exception:
+                continue
+            if cle_temporaire is None:
+                continue
+
+            try:
+                resultats[modele] += appliquer(modele, increments)
+            except Exception:
+                logger.exception("Report des vues (%s) en base impossible", modele)
+                _restituer_redis(connexion, modele, cle_temporaire, increments)
+                continue
+            connexion.delete(cle_temporaire)
+
+    for modele, total in vider_buffer_local().items():
+        resultats[modele] += total
+
+    return dict(resultats)
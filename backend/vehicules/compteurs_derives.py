@@ -0,0 +1,208 @@
+# backend/vehicules/compteurs_derives.py
+# Compteurs dénormalisés (nombre de véhicules, de concessions, notes)
+#
+# Les écritures ne recalculent plus les compteurs des objets parents :
+# elles les marquent « à recalculer ». Les objets marqués sont regroupés
+# jusqu'au commit de la transaction, puis recalculés en une requête UPDATE
+# agrégée par type de compteur (dans le processus, ou par un worker Celery
+# si COMPTEURS_DERIVES_ASYNCHRONE). Le recalcul part des tables sources :
+# il est idempotent et répare au passage toute dérive. La commande
+# reconcilier_compteurs le rejoue sur toutes les lignes.
+
+import threading
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, DecimalField, F, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce
+
+
+# ========================================
+# DÉFINITION DES COMPTEURS
+# ========================================
+
+def _nombre(modele, cle, **filtres):
+    """Nombre de lignes de modele rattachées à l'objet (0 si aucune)."""
+    lignes = apps.get_model(modele).objects.filter(**{cle: OuterRef('pk')}, **filtres)
+    return Coalesce(
+        Subquery(lignes.order_by().values(cle).annotate(total=Count('pk')).values('total')),
+        0
+    )
+
+
+def _somme(modele, cle, champ, **filtres):
+    """Somme de champ sur les lignes rattachées (0 si aucune)."""
+    lignes = apps.get_model(modele).objects.filter(**{cle: OuterRef('pk')}, **filtres)
+    return Coalesce(
+        Subquery(lignes.order_by().values(cle).annotate(somme=Sum(champ)).values('somme')),
+        0
+    )
+
+
+def _moyenne(modele, cle, champ, **filtres):
+    """Moyenne de champ sur les lignes rattachées, arrondie à 2 décimales (0 si aucune)."""
+    lignes = apps.get_model(modele).objects.filter(**{cle: OuterRef('pk')}, **filtres)
+    moyenne = Subquery(lignes.order_by().values(cle).annotate(moyenne=Avg(champ)).values('moyenne'))
+    return Cast(Coalesce(moyenne, 0.0), DecimalField(max_digits=3, decimal_places=2))
+
+
+# Nom -> (modèle, fonction retournant {champ: expression de recalcul})
+COMPTEURS = {
+    'marque': ('vehicules.Marque', lambda: {
+        'nombre_vehicules': _nombre('vehicules.Vehicule', 'marque'),
+    }),
+    'categorie': ('vehicules.Categorie', lambda: {
+        'nombre_vehicules': _nombre('vehicules.Vehicule', 'categorie'),
+    }),
+    'concession': ('concessions.Concession', lambda: {
+        'nombre_vehicules': _nombre('vehicules.Vehicule', 'concession'),
+    }),
+    'region': ('concessions.Region', lambda: {
+        'nombre_concessions': _nombre('concessions.Concession', 'region'),
+    }),
+    'note_vehicule': ('vehicules.Vehicule', lambda: {
+        'note_moyenne': _moyenne('avis.Avis', 'vehicule', 'note', est_valide=True),
+        'nombre_avis': _nombre('avis.Avis', 'vehicule', est_valide=True),
+        'somme_notes': _somme('avis.Avis', 'vehicule', 'note', est_valide=True),
+    }),
+    'note_concession': ('concessions.Concession', lambda: {
+        'note_moyenne': _moyenne('avis.Avis', 'vehicule__concession', 'note', est_valide=True),
+        'nombre_avis': _nombre('avis.Avis', 'vehicule__concession', est_valide=True),
+        'somme_notes': _somme('avis.Avis', 'vehicule__concession', 'note', est_valide=True),
+    }),
+}
+
+
+def _apres_recalcul(nom, pks):
+    """Effets de bord d'un recalcul (cache des fiches dont la note change)."""
+    if nom == 'note_vehicule':
+        from vehicules import cache as cache_vehicules
+        for pk in pks:
+            cache_vehicules.invalider_vehicule(pk)
+
+
+# ========================================
+# RECALCUL
+# ========================================
+
+def recalculer(nom, pks, taille_lot=500):
+    """
+    Recalculer un compteur pour les objets donnés, en une requête UPDATE
+    par lot de taille_lot identifiants.
+
+    Args:
+        nom: Clé de COMPTEURS
+        pks: Identifiants des objets à recalculer
+
+    Returns:
+        Nombre de lignes mises à jour
+    """
+    if nom not in COMPTEURS:
+        raise ValueError(f"Compteur inconnu : {nom}")
+
+    modele, champs = COMPTEURS[nom]
+    Model = apps.get_model(modele)
+    pks = sorted({int(pk) for pk in pks if pk is not None})
+
+    mises_a_jour = 0
+    for i in range(0, len(pks), taille_lot):
+        lot = pks[i:i + taille_lot]
+        mises_a_jour += Model.objects.filter(pk__in=lot).update(**champs())
+        _apres_recalcul(nom, lot)
+    return mises_a_jour
+
+
+def reconcilier(nom, taille_lot=500):
+    """
+    Réparer la dérive d'un compteur sur toutes les lignes : les valeurs
+    stockées sont comparées au recalcul, seules les lignes fausses sont
+    réécrites.
+
+    Returns:
+        Nombre de lignes corrigées
+    """
+    if nom not in COMPTEURS:
+        raise ValueError(f"Compteur inconnu : {nom}")
+
+    modele, champs = COMPTEURS[nom]
+    Model = apps.get_model(modele)
+    expressions = champs()
+
+    derive = Q()
+    for champ in expressions:
+        derive |= ~Q(**{champ: F(f'{champ}_recalcule')})
+
+    faux = Model.objects.annotate(
+        **{f'{champ}_recalcule': expression for champ, expression in expressions.items()}
+    ).filter(derive).values_list('pk', flat=True)
+
+    return recalculer(nom, list(faux), taille_lot=taille_lot)
+
+
+# ========================================
+# MARQUAGE DIFFÉRÉ
+# ========================================
+
+# Objets à recalculer au prochain commit, par thread : {nom: {pk}}
+_local = threading.local()
+
+
+def _en_attente():
+    if not hasattr(_local, 'en_attente'):
+        _local.en_attente = defaultdict(set)
+    return _local.en_attente
+
+
+def marquer(nom, *pks):
+    """
+    Marquer des objets dont un compteur doit être recalculé.
+
+    Le recalcul a lieu au commit de la transaction courante (tout de suite
+    hors transaction) ; les marquages d'une même transaction sont
+    regroupés. Si la transaction est annulée, les objets restent marqués
+    et sont recalculés au commit suivant, sans effet puisque le recalcul
+    est idempotent.
+    """
+    if nom not in COMPTEURS:
+        raise ValueError(f"Compteur inconnu : {nom}")
+
+    pks = [pk for pk in pks if pk is not None]
+    if not pks:
+        return
+    _en_attente()[nom].update(pks)
+    transaction.on_commit(vider)
+
+
+def vider():
+    """Recalculer les objets marqués du thread courant (appelé au commit)."""
+    en_attente = _en_attente()
+    if not en_attente:
+        return
+    lots = {nom: sorted(pks) for nom, pks in en_attente.items()}
+    en_attente.clear()
+
+    if getattr(settings, 'COMPTEURS_DERIVES_ASYNCHRONE', False):
+        from vehicules.tasks import recalculer_compteurs_derives
+        try:
+            recalculer_compteurs_derives.delay(lots)
+            return
+        except Exception:
+            # Broker indisponible : recalculer dans le processus
+            pass
+
+    appliquer(lots)
+
+
+def appliquer(lots):
+    """
+    Recalculer des lots d'objets marqués.
+
+    Args:
+        lots: dict {nom: [pk, ...]}
+
+    Returns:
+        dict {nom: nombre de lignes mises à jour}
+    """
+    return {nom: recalculer(nom, pks) for nom, pks in lots.items()}
@@ -0,0 +1,152 @@
+# backend/vehicules/facettes.py
+# Facettes du catalogue véhicules (compteurs de la barre de filtres)
+#
+# Toutes les facettes sont calculées en une seule requête : le QuerySet
+# filtré de la liste sert de table dérivée, regroupée par GROUPING SETS
+# (un ensemble par facette, plus l'ensemble vide pour le total).
+
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Value, When
+
+
+# Tranches de prix de location journalier (FCFA) : min inclus, max exclu
+TRANCHES_PRIX = [
+    (None, 15000),
+    (15000, 25000),
+    (25000, 40000),
+    (40000, 60000),
+    (60000, None),
+]
+
+# Tranches d'année : bornes incluses
+TRANCHES_ANNEE = [
+    (None, 2014),
+    (2015, 2018),
+    (2019, 2021),
+    (2022, None),
+]
+
+# Facette -> colonnes de la table dérivée
+FACETTES = {
+    'marques': ['marque_id', 'marque_nom'],
+    'categories': ['categorie_id', 'categorie_nom', 'categorie_slug'],
+    'types_carburant': ['type_carburant'],
+    'transmissions': ['transmission'],
+    'prix': ['tranche_prix'],
+    'annees': ['tranche_annee'],
+}
+
+COLONNES = [colonne for colonnes in FACETTES.values() for colonne in colonnes]
+
+
+def _tranche(champ, tranches, borne_superieure_incluse):
+    """Expression CASE donnant l'indice de la tranche d'un champ."""
+    conditions = [When(**{f'{champ}__isnull': True}, then=Value(None))]
+    for indice, (_minimum, maximum) in enumerate(tranches):
+        if maximum is None:
+            continue
+        lookup = 'lte' if borne_superieure_incluse else 'lt'
+        conditions.append(When(**{f'{champ}__{lookup}': maximum}, then=Value(indice)))
+    return Case(*conditions, default=Value(len(tranches) - 1), output_field=IntegerField())
+
+
+def _sql(queryset):
+    """Requête GROUPING SETS sur le QuerySet filtré."""
+    lignes = queryset.order_by().annotate(
+        marque_nom=F('marque__nom'),
+        categorie_nom=F('categorie__nom'),
+        categorie_slug=F('categorie__slug'),
+        tranche_prix=_tranche('prix_location_jour', TRANCHES_PRIX, False),
+        tranche_annee=_tranche('annee', TRANCHES_ANNEE, True),
+    ).values(*COLONNES)
+
+    sql, params = lignes.query.sql_with_params()
+
+    indicateurs = [f'GROUPING({colonnes_facette[0]})' for colonnes_facette in FACETTES.values()]
+    ensembles = [f"({', '.join(colonnes_facette)})" for colonnes_facette in FACETTES.values()]
+
+    return (
+        f"SELECT {', '.join(COLONNES)}, {', '.join(indicateurs)}, COUNT(*) "
+        f"FROM ({sql}) AS facettes "
+        f"GROUP BY GROUPING SETS ({', '.join(ensembles)}, ())"
+    ), params
+
+
+def _tranches(tranches, compteurs):
+    return [
+        {'min': minimum, 'max': maximum, 'nombre': compteurs.get(indice, 0)}
+        for indice, (minimum, maximum) in enumerate(tranches)
+    ]
+
+
+def _choix(champ):
+    from vehicules.models import Vehicule
+
+    return dict(Vehicule._meta.get_field(champ).choices)
+
+
+def calculer_facettes(queryset):
+    """
+    Compter les véhicules du QuerySet par marque, catégorie, carburant,
+    transmission, tranche de prix et tranche d'année.
+
+    Args:
+        queryset: QuerySet de Vehicule déjà filtré (filtres de la liste)
+
+    Returns:
+        Dict {'total': int, 'marques': [...], 'categories': [...], ...}
+    """
+    sql, params = _sql(queryset)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        resultats = cursor.fetchall()
+
+    groupes = {nom: [] for nom in FACETTES}
+    total = 0
+
+    for ligne in resultats:
+        valeurs = dict(zip(COLONNES, ligne))
+        indicateurs = ligne[len(COLONNES):-1]
+        nombre = ligne[-1]
+
+        # GROUPING(x) vaut 0 pour la colonne regroupée, 1 sinon
+        facette = next(
+            (nom for nom, indicateur in zip(FACETTES, indicateurs) if indicateur == 0),
+            None
+        )
+        if facette is None:
+            total = nombre
+            continue
+
+        valeurs_facette = [valeurs[colonne] for colonne in FACETTES[facette]]
+        if valeurs_facette[0] is not None:
+            groupes[facette].append((valeurs_facette, nombre))
+
+    def par_nombre(elements, libelle=0):
+        # Plus fréquents d'abord, puis ordre alphabétique
+        return sorted(elements, key=lambda element: (-element[1], str(element[0][libelle])))
+
+    carburants = _choix('type_carburant')
+    transmissions = _choix('transmission')
+
+    return {
+        'total': total,
+        'marques': [
+            {'id': v[0], 'nom': v[1], 'nombre': n}
+            for v, n in par_nombre(groupes['marques'], libelle=1)
+        ],
+        'categories': [
+            {'id': v[0], 'nom': v[1], 'slug': v[2], 'nombre': n}
+            for v, n in par_nombre(groupes['categories'], libelle=1)
+        ],
+        'types_carburant': [
+            {'valeur': v[0], 'libelle': carburants.get(v[0], v[0]), 'nombre': n}
+            for v, n in par_nombre(groupes['types_carburant'])
+        ],
+        'transmissions': [
+            {'valeur': v[0], 'libelle': transmissions.get(v[0], v[0]), 'nombre': n}
+            for v, n in par_nombre(groupes['transmissions'])
+        ],
+        'prix_location_jour': _tranches(TRANCHES_PRIX, {v[0]: n for v, n in groupes['prix']}),
+        'annees': _tranches(TRANCHES_ANNEE, {v[0]: n for v, n in groupes['annees']}),
+    }
@@ -0,0 +1,105 @@
+# backend/vehicules/filters.py
+# Filtres du catalogue véhicules
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Greatest
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+from concessions.geo import filtrer_proximite, lire_position
+from vehicules.recherche import CONFIG
+
+
+class RechercheTexteFilter(filters.BaseFilterBackend):
+    """
+    Recherche plein texte classée par pertinence.
+
+    ?search=toyota hilux diesel
+
+    Interroge le vecteur Vehicule.vecteur_recherche (index GIN) et, dans
+    la même requête, la similarité de trigrammes du modèle et de la marque
+    (pg_trgm) pour tolérer les fautes de frappe. Chaque véhicule est
+    annoté de sa `pertinence` : les correspondances plein texte
+    (1 + rang) passent avant les seules correspondances approchées
+    (similarité, au plus 1).
+    """
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        terme = request.query_params.get(self.search_param, '').strip()
+        if not terme:
+            return queryset
+
+        requete = SearchQuery(terme, search_type='websearch', config=CONFIG)
+        plein_texte = Q(vecteur_recherche=requete)
+
+        # Recherche approchée sur les seuls mots recherchés ; les mots
+        # exclus (-clio) restent exclus. L'opérateur % utilise le seuil
+        # pg_trgm.similarity_threshold (0.3 par défaut)
+        mots = terme.split()
+        exclus = [mot[1:] for mot in mots if mot.startswith('-') and len(mot) > 1]
+        approche = ' '.join(mot for mot in mots if not mot.startswith('-')) or terme
+        vehicules = queryset.model.objects.order_by()
+        approches = vehicules.filter(nom_modele__trigram_similar=approche).values('pk').union(
+            vehicules.filter(marque__nom__trigram_similar=approche).values('pk')
+        )
+        if exclus:
+            approches = vehicules.filter(pk__in=approches).exclude(vecteur_recherche=SearchQuery(
+                ' or '.join(exclus), search_type='websearch', config=CONFIG
+            )).values('pk')
+
+        # Union des identifiants : chaque branche garde son index (GIN plein
+        # texte, GIN trigrammes du modèle, clé étrangère de la marque), ce
+        # qu'un OU à travers la jointure marque ne permet pas
+        correspondances = vehicules.filter(plein_texte).values('pk').union(approches)
+
+        return queryset.filter(pk__in=correspondances).annotate(
+            pertinence=Case(
+                When(plein_texte, then=Value(1.0) + SearchRank(F('vecteur_recherche'), requete)),
+                default=Greatest(
+                    TrigramSimilarity('nom_modele', approche),
+                    TrigramSimilarity('marque__nom', approche),
+                ),
+                output_field=FloatField(),
+            )
+        )
+
+
+class ProximiteFilter(filters.BaseFilterBackend):
+    """
+    Filtrer les véhicules par distance à leur concession.
+
+    ?latitude=14.7167&longitude=-17.4677&rayon=10
+
+    Se combine avec les autres filtres dans la même requête SQL et annote
+    chaque véhicule de sa `distance` (km).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        try:
+            position = lire_position(request.query_params)
+        except ValueError as e:
+            raise ValidationError({'error': str(e)})
+
+        if position is None:
+            return queryset
+
+        latitude, longitude, rayon = position
+        return filtrer_proximite(queryset, latitude, longitude, rayon, prefixe='concession__')
+
+
+class VehiculeOrderingFilter(filters.OrderingFilter):
+    """
+    Tri par défaut sur la pertinence lors d'une recherche, puis sur la
+    distance lorsqu'une position est fournie.
+    """
+
+    def get_default_ordering(self, view):
+        params = view.request.query_params
+        if params.get(RechercheTexteFilter.search_param, '').strip():
+            return ['-pertinence', 'id']
+        if params.get('latitude') and params.get('longitude'):
+            return ['distance', 'id']
+        return super().get_default_ordering(view)
@@ -0,0 +1,77 @@
+# backend/vehicules/historique_prix.py
+# Séries de prix pour les graphiques
+#
+# L'historique (HistoriquePrix) décrit un prix en escalier : chaque ligne
+# vaut jusqu'au changement suivant. Quand la période compte plus de
+# changements que de points demandés, la série est échantillonnée en SQL :
+# la période est découpée en intervalles égaux, et chaque intervalle donne
+# son prix minimum, maximum et le dernier prix en vigueur. La réponse ne
+# dépasse jamais le nombre de points demandé.
+
+from datetime import timedelta
+
+from django.db.models import ExpressionWrapper, FloatField, IntegerField, Max, Min
+from django.db.models.functions import Extract, Floor
+
+
+POINTS_DEFAUT = 100
+POINTS_MAX = 500
+
+
+def serie(vehicule_id, debut, fin, points=POINTS_DEFAUT):
+    """
+    Série des prix d'un véhicule sur [debut, fin[.
+
+    Args:
+        vehicule_id: Véhicule concerné
+        debut, fin: datetimes bornant la période (fin exclue)
+        points: Nombre maximum de points retournés
+
+    Returns:
+        dict avec prix_debut (prix en vigueur à debut, None si inconnu),
+        echantillonne et points : [{date, prix, prix_min, prix_max}]
+    """
+    from vehicules.models import HistoriquePrix
+
+    historique = HistoriquePrix.objects.filter(vehicule_id=vehicule_id)
+    prix_debut = historique.filter(date__lt=debut).order_by('-date').values_list('prix', flat=True).first()
+    periode = historique.filter(date__gte=debut, date__lt=fin)
+
+    lignes = list(periode.order_by('date').values_list('date', 'prix')[:points + 1])
+    if len(lignes) <= points:
+        return {
+            'prix_debut': prix_debut,
+            'echantillonne': False,
+            'points': [
+                {'date': date, 'prix': prix, 'prix_min': prix, 'prix_max': prix}
+                for date, prix in lignes
+            ],
+        }
+
+    largeur = (fin - debut).total_seconds() / points
+    intervalles = periode.order_by().annotate(
+        intervalle=Floor(ExpressionWrapper(
+            (Extract('date', 'epoch') - debut.timestamp()) / largeur,
+            output_field=FloatField()
+        ), output_field=IntegerField())
+    )
+
+    bornes = intervalles.values('intervalle').annotate(prix_min=Min('prix'), prix_max=Max('prix'))
+    # DISTINCT ON : dernière ligne de chaque intervalle
+    derniers = dict(
+        intervalles.order_by('intervalle', '-date').distinct('intervalle').values_list('intervalle', 'prix')
+    )
+
+    return {
+        'prix_debut': prix_debut,
+        'echantillonne': True,
+        'points': [
+            {
+                'date': debut + timedelta(seconds=borne['intervalle'] * largeur),
+                'prix': derniers[borne['intervalle']],
+                'prix_min': borne['prix_min'],
+                'prix_max': borne['prix_max'],
+            }
+            for borne in sorted(bornes, key=lambda borne: borne['intervalle'])
+        ],
+    }
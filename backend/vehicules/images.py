@@ -0,0 +1,150 @@
+# backend/vehicules/images.py
+# Déclinaisons redimensionnées des photos de véhicules
+#
+# Chaque photo est déclinée en plusieurs largeurs (miniature de liste,
+# carte, détail), en JPEG et en WebP, à côté de l'original. Les chemins
+# sont enregistrés dans Photo.variantes ; la génération est faite par la
+# tâche Celery generer_variantes_photo après l'upload.
+
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+
+# Nom de la déclinaison -> largeur maximale (pixels)
+TAILLES = {
+    'miniature': 320,
+    'carte': 640,
+    'detail': 1280,
+}
+
+# Format -> (format Pillow, extension, options d'enregistrement)
+FORMATS = {
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+}
+
+DOSSIER = 'variantes'
+
+
+def _chemin(nom_original, taille, extension):
+    dossier, fichier = os.path.split(nom_original)
+    base, _ = os.path.splitext(fichier)
+    return os.path.join(dossier, DOSSIER, f'{base}_{taille}.{extension}')
+
+
+def _redimensionner(image, largeur):
+    """Copie de l'image réduite à la largeur donnée (jamais agrandie)."""
+    if image.width <= largeur:
+        return image.copy()
+    hauteur = round(image.height * largeur / image.width)
+    return image.resize((largeur, hauteur), Image.LANCZOS)
+
+
+# ========================================
+# GÉNÉRATION
+# ========================================
+
+def generer_variantes(photo):
+    """
+    Générer toutes les déclinaisons d'une photo et les enregistrer.
+
+    Returns:
+        Dict {taille: {format: chemin, 'largeur': int}}
+    """
+    from vehicules.models import Photo
+    from vehicules import cache as cache_vehicules
+
+    stockage = photo.image.storage
+    with photo.image.open('rb') as fichier:
+        image = Image.open(fichier)
+        image = ImageOps.exif_transpose(image)
+        image = image.convert('RGB')
+
+    variantes = {}
+    par_largeur = {}
+    for taille, largeur in TAILLES.items():
+        reduite = _redimensionner(image, largeur)
+
+        # Original plus étroit que la taille : réutiliser la déclinaison
+        # déjà produite à cette largeur
+        if reduite.width in par_largeur:
+            variantes[taille] = par_largeur[reduite.width]
+            continue
+        variantes[taille] = par_largeur[reduite.width] = {'largeur': reduite.width}
+
+        for format_nom, (format_pillow, extension, options) in FORMATS.items():
+            tampon = BytesIO()
+            reduite.save(tampon, format_pillow, **options)
+            chemin = _chemin(photo.image.name, taille, extension)
+            if stockage.exists(chemin):
+                stockage.delete(chemin)
+            variantes[taille][format_nom] = stockage.save(chemin, ContentFile(tampon.getvalue()))
+
+    # update() : ne pas relancer Photo.save (et une nouvelle génération)
+    Photo.objects.filter(pk=photo.pk).update(variantes=variantes)
+    photo.variantes = variantes
+    cache_vehicules.invalider_vehicule(photo.vehicule_id)
+    return variantes
+
+
+def planifier_variantes(photo_id):
+    """
+    Lancer la génération en arrière-plan après le commit de la transaction.
+
+    Si le broker est indisponible, la commande generer_variantes_photos
+    rattrape les photos sans déclinaisons.
+    """
+    from vehicules.tasks import generer_variantes_photo
+
+    def _lancer():
+        try:
+            generer_variantes_photo.delay(photo_id)
+        except Exception:
+            pass
+
+    transaction.on_commit(_lancer)
+
+
+# ========================================
+# LECTURE
+# ========================================
+
+def url_variante(photo, taille, format_nom='jpeg'):
+    """URL d'une déclinaison, ou de l'original si elle n'existe pas encore."""
+    chemin = (photo.variantes or {}).get(taille, {}).get(format_nom)
+    if chemin:
+        return photo.image.storage.url(chemin)
+    return photo.image.url if photo.image else None
+
+
+def srcset(photo, construire_url=None):
+    """
+    Attributs srcset de la photo, par format.
+
+    Args:
+        construire_url: Fonction appliquée à chaque URL (ex:
+            request.build_absolute_uri)
+
+    Returns:
+        Dict {'jpeg': 'url 320w, url 640w, ...', 'webp': '...'}, vide si
+        les déclinaisons ne sont pas encore générées
+    """
+    variantes = photo.variantes or {}
+    if not variantes:
+        return {}
+
+    construire_url = construire_url or (lambda url: url)
+    stockage = photo.image.storage
+    par_largeur = {variante['largeur']: variante for variante in variantes.values()}
+    return {
+        format_nom: ', '.join(
+            f"{construire_url(stockage.url(par_largeur[largeur][format_nom]))} {largeur}w"
+            for largeur in sorted(par_largeur)
+            if format_nom in par_largeur[largeur]
+        )
+        for format_nom in FORMATS
+    }
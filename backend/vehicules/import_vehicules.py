@@ -0,0 +1,289 @@
+# backend/vehicules/import_vehicules.py
+# Import en masse de véhicules (CSV, JSON, JSON Lines)
+#
+# Les lignes sont lues au fil de l'eau et traitées par lots : validation
+# (VehiculeImportSerializer), résolution des marques / catégories par nom
+# dans des dictionnaires chargés une seule fois, vérification des
+# immatriculations en une requête par lot, puis bulk_create. Les
+# compteurs (concession, marque, catégorie, voir compteurs_derives),
+# l'index de recherche et le cache du catalogue sont mis à jour une seule
+# fois à la fin.
+
+import csv
+import io
+import json
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from concessions.models import Concession
+from vehicules import cache as cache_vehicules
+from vehicules import compteurs_derives
+from vehicules import recherche
+from vehicules.models import Marque, Categorie, Vehicule, HistoriquePrix
+from vehicules.serializers import VehiculeImportSerializer
+
+
+FORMATS = ('csv', 'json', 'jsonl')
+
+# Séparateur des équipements dans une cellule CSV (ex: "GPS|Bluetooth")
+SEPARATEUR_EQUIPEMENTS = '|'
+
+
+def taille_lot():
+    """Nombre de lignes validées et insérées ensemble."""
+    return getattr(settings, 'VEHICULES_IMPORT_TAILLE_LOT', 500)
+
+
+# ========================================
+# LECTURE
+# ========================================
+
+def detecter_format(nom_fichier):
+    """Format d'après l'extension du fichier (csv, json, jsonl), ou None."""
+    extension = nom_fichier.rsplit('.', 1)[-1].lower() if '.' in nom_fichier else ''
+    if extension == 'ndjson':
+        return 'jsonl'
+    return extension if extension in FORMATS else None
+
+
+def lire_lignes(fichier, format_fichier):
+    """
+    Itérer sur les lignes d'un fichier binaire ouvert.
+
+    CSV et JSON Lines sont lus ligne à ligne ; un document JSON (tableau
+    d'objets) est chargé en entier.
+
+    Yields:
+        Tuple (numéro de ligne, dict des valeurs)
+    """
+    texte = io.TextIOWrapper(fichier, encoding='utf-8-sig', newline='')
+
+    if format_fichier == 'csv':
+        # Ligne 1 : en-têtes
+        for numero, ligne in enumerate(csv.DictReader(texte), start=2):
+            valeurs = {cle.strip(): valeur.strip() for cle, valeur in ligne.items() if cle and valeur and valeur.strip()}
+            if 'equipements' in valeurs:
+                valeurs['equipements'] = [
+                    equipement.strip()
+                    for equipement in valeurs['equipements'].split(SEPARATEUR_EQUIPEMENTS)
+                    if equipement.strip()
+                ]
+            yield numero, valeurs
+
+    elif format_fichier == 'jsonl':
+        for numero, ligne in enumerate(texte, start=1):
+            if ligne.strip():
+                yield numero, _objet_json(ligne)
+
+    else:
+        document = json.load(texte)
+        if not isinstance(document, list):
+            raise ValueError('Le fichier JSON doit contenir une liste de véhicules')
+        for numero, valeurs in enumerate(document, start=1):
+            yield numero, valeurs if isinstance(valeurs, dict) else None
+
+
+def _objet_json(ligne):
+    try:
+        valeurs = json.loads(ligne)
+    except ValueError:
+        return None
+    return valeurs if isinstance(valeurs, dict) else None
+
+
+# ========================================
+# IMPORT
+# ========================================
+
+class ImportVehicules:
+    """
+    Import des véhicules d'un concessionnaire.
+
+    Usage :
+        rapport = ImportVehicules(concessionnaire).importer(lignes)
+    """
+
+    def __init__(self, concessionnaire, concession_defaut=None, simulation=False):
+        """
+        Args:
+            concessionnaire: Propriétaire des véhicules importés
+            concession_defaut: Concession des lignes sans concession_id
+                (par défaut : l'unique concession validée du concessionnaire)
+            simulation: Valider sans rien enregistrer
+        """
+        self.concessionnaire = concessionnaire
+        self.simulation = simulation
+
+        # Référentiels en mémoire : une requête chacun pour tout l'import
+        self.marques = {
+            marque.nom.lower(): marque
+            for marque in Marque.objects.filter(est_active=True)
+        }
+        self.categories = {}
+        for categorie in Categorie.objects.filter(est_active=True):
+            self.categories[categorie.nom.lower()] = categorie
+            self.categories[categorie.slug.lower()] = categorie
+        self.concessions = {
+            concession.id: concession
+            for concession in Concession.objects.filter(concessionnaire=concessionnaire, statut='VALIDE')
+        }
+
+        if concession_defaut is None and len(self.concessions) == 1:
+            concession_defaut = next(iter(self.concessions.values()))
+        self.concession_defaut = concession_defaut
+
+        self.immatriculations_vues = set()
+        self.rapport = {'total': 0, 'importes': 0, 'erreurs': []}
+        self.ids_importes = []
+        # Objets dont le compteur de véhicules est à recalculer : {nom: {pk}}
+        self.parents = defaultdict(set)
+
+    def importer(self, lignes):
+        """
+        Importer les lignes (itérable de (numéro, valeurs)).
+
+        Si la lecture échoue en cours de fichier (JSON invalide, encodage,
+        CSV mal formé), les lignes déjà lues restent importées et le
+        rapport porte l'erreur dans 'erreur_fichier'.
+
+        Returns:
+            Dict {'total', 'importes', 'erreurs': [{'ligne', 'erreurs'}]},
+            plus 'erreur_fichier' si la lecture a été interrompue
+        """
+        lot = []
+        try:
+            try:
+                for numero, valeurs in lignes:
+                    self.rapport['total'] += 1
+                    lot.append((numero, valeurs))
+                    if len(lot) >= taille_lot():
+                        self._traiter_lot(lot)
+                        lot = []
+            except (ValueError, csv.Error) as erreur:
+                self.rapport['erreur_fichier'] = str(erreur)
+            if lot:
+                self._traiter_lot(lot)
+        finally:
+            # Compteurs, index et cache des lots déjà insérés
+            self._finaliser()
+        return self.rapport
+
+    def _erreur(self, numero, erreurs, valeurs=None):
+        entree = {'ligne': numero, 'erreurs': erreurs}
+        if valeurs and valeurs.get('immatriculation'):
+            entree['immatriculation'] = valeurs['immatriculation']
+        self.rapport['erreurs'].append(entree)
+
+    def _valider(self, numero, valeurs):
+        """Valider une ligne et retourner le Vehicule à créer (ou None)."""
+        if valeurs is None:
+            self._erreur(numero, {'ligne': ['Objet invalide']})
+            return None
+
+        serializer = VehiculeImportSerializer(data=valeurs)
+        if not serializer.is_valid():
+            self._erreur(numero, serializer.errors, valeurs)
+            return None
+        donnees = dict(serializer.validated_data)
+
+        erreurs = {}
+        marque = self.marques.get(donnees.pop('marque').lower())
+        if marque is None:
+            erreurs['marque'] = ['Marque inconnue ou inactive']
+        categorie = self.categories.get(donnees.pop('categorie').lower())
+        if categorie is None:
+            erreurs['categorie'] = ['Catégorie inconnue ou inactive']
+
+        concession_id = donnees.pop('concession_id', None)
+        concession = self.concessions.get(concession_id) if concession_id else self.concession_defaut
+        if concession is None:
+            erreurs['concession_id'] = ['Concession absente, non validée ou appartenant à un autre concessionnaire']
+
+        if donnees['immatriculation'] in self.immatriculations_vues:
+            erreurs['immatriculation'] = ['Immatriculation en double dans le fichier']
+
+        if erreurs:
+            self._erreur(numero, erreurs, valeurs)
+            return None
+
+        self.immatriculations_vues.add(donnees['immatriculation'])
+        return Vehicule(
+            concessionnaire=self.concessionnaire,
+            concession=concession,
+            marque=marque,
+            categorie=categorie,
+            **donnees
+        )
+
+    def _traiter_lot(self, lot):
+        candidats = []
+        for numero, valeurs in lot:
+            vehicule = self._valider(numero, valeurs)
+            if vehicule is not None:
+                candidats.append((numero, vehicule))
+
+        # Immatriculations déjà en base : une requête pour le lot
+        existantes = set(Vehicule.objects.filter(
+            immatriculation__in=[vehicule.immatriculation for _, vehicule in candidats]
+        ).values_list('immatriculation', flat=True))
+
+        a_creer = []
+        for numero, vehicule in candidats:
+            if vehicule.immatriculation in existantes:
+                self._erreur_doublon(numero, vehicule)
+            else:
+                a_creer.append((numero, vehicule))
+
+        if self.simulation or not a_creer:
+            self.rapport['importes'] += len(a_creer)
+            return
+
+        try:
+            crees = self._inserer([vehicule for _, vehicule in a_creer])
+        except IntegrityError:
+            # Immatriculation insérée entre-temps (import concurrent) ou en
+            # double dans le fichier : reprise ligne par ligne, chacune dans
+            # son savepoint, pour isoler les lignes en conflit
+            crees = []
+            for numero, vehicule in a_creer:
+                try:
+                    crees.extend(self._inserer([vehicule]))
+                except IntegrityError:
+                    self._erreur_doublon(numero, vehicule)
+
+        self.ids_importes.extend(vehicule.pk for vehicule in crees)
+        for vehicule in crees:
+            self.parents['concession'].add(vehicule.concession_id)
+            self.parents['marque'].add(vehicule.marque_id)
+            self.parents['categorie'].add(vehicule.categorie_id)
+        self.rapport['importes'] += len(crees)
+
+    def _erreur_doublon(self, numero, vehicule):
+        self._erreur(numero, {'immatriculation': ['Un véhicule avec cette immatriculation existe déjà']},
+                     {'immatriculation': vehicule.immatriculation})
+
+    @staticmethod
+    def _inserer(vehicules):
+        """Insérer des véhicules et leur premier historique de prix (une transaction)."""
+        # bulk_create ne passe pas par Vehicule.save : compteurs, index de
+        # recherche et cache sont mis à jour dans _finaliser()
+        with transaction.atomic():
+            crees = Vehicule.objects.bulk_create(vehicules)
+            HistoriquePrix.objects.bulk_create(
+                [HistoriquePrix(**HistoriquePrix.valeurs(vehicule)) for vehicule in crees]
+            )
+        return crees
+
+    def _finaliser(self):
+        self.rapport['erreurs'].sort(key=lambda erreur: erreur['ligne'])
+        if not self.ids_importes:
+            return
+
+        recherche.indexer(pk__in=self.ids_importes)
+
+        for nom, pks in self.parents.items():
+            compteurs_derives.marquer(nom, *pks)
+
+        cache_vehicules.invalider_vehicule(None)
@@ -0,0 +1,201 @@
+# backend/vehicules/lots_photos.py
+# Upload de photos par lot (grandes galeries)
+#
+# Les fichiers sont vérifiés (décodage Pillow) et écrits dans le stockage
+# en parallèle dans un pool de threads, puis toutes les lignes Photo sont
+# insérées par un seul bulk_create. Le lot est suivi dans le cache sous un
+# identifiant : chaque fichier y porte son statut, mis à jour par la tâche
+# qui génère les déclinaisons (vehicules/images.py).
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from PIL import Image
+
+from vehicules import cache as cache_vehicules
+
+
+PREFIXE = 'vehicules:lots-photos'
+
+# Formats d'image acceptés (Pillow)
+FORMATS_ACCEPTES = {'JPEG', 'PNG', 'WEBP'}
+
+# Statuts d'un fichier du lot
+REJETE = 'REJETE'          # Fichier invalide, non enregistré
+ENREGISTRE = 'ENREGISTRE'  # Photo créée, déclinaisons en attente
+TRAITE = 'TRAITE'          # Déclinaisons générées
+ECHEC = 'ECHEC'            # Photo créée, échec des déclinaisons
+
+
+def taille_max_fichier():
+    """Taille maximale d'un fichier (octets)."""
+    return getattr(settings, 'VEHICULES_PHOTOS_TAILLE_MAX', 10 * 1024 * 1024)
+
+
+def nombre_max_fichiers():
+    """Nombre maximal de fichiers par lot."""
+    return getattr(settings, 'VEHICULES_PHOTOS_LOT_MAX', 50)
+
+
+def _cle(lot_id):
+    return f'{PREFIXE}:{lot_id}'
+
+
+def _ttl():
+    return getattr(settings, 'VEHICULES_PHOTOS_LOT_TTL', 24 * 3600)
+
+
+# ========================================
+# SUIVI DU LOT
+# ========================================
+
+def lire_lot(lot_id):
+    """État d'un lot, ou None s'il est inconnu ou expiré."""
+    return cache.get(_cle(lot_id))
+
+
+def _enregistrer_lot(lot):
+    fichiers = lot['fichiers']
+    lot['acceptes'] = sum(1 for fichier in fichiers if fichier['statut'] != REJETE)
+    lot['rejetes'] = sum(1 for fichier in fichiers if fichier['statut'] == REJETE)
+    lot['statut'] = 'EN_COURS' if any(fichier['statut'] == ENREGISTRE for fichier in fichiers) else 'TERMINE'
+    cache.set(_cle(lot['id']), lot, timeout=_ttl())
+
+
+def marquer_fichier(lot_id, photo_id, statut, erreur=None):
+    """Mettre à jour le statut du fichier d'un lot correspondant à une photo."""
+    lot = lire_lot(lot_id)
+    if lot is None:
+        return
+    for fichier in lot['fichiers']:
+        if fichier.get('photo_id') == photo_id:
+            fichier['statut'] = statut
+            if erreur:
+                fichier['erreur'] = erreur
+    _enregistrer_lot(lot)
+
+
+# ========================================
+# TRAITEMENT DES FICHIERS
+# ========================================
+
+def _verifier_et_stocker(fichier):
+    """
+    Vérifier qu'un fichier est une image décodable puis l'écrire dans le
+    stockage (par morceaux). Exécuté dans un thread : aucun accès à la base.
+    Les gros uploads sont déjà sur disque (TemporaryUploadedFile) : ils ne
+    sont jamais chargés en entier en mémoire par Django.
+
+    Returns:
+        Tuple (chemin, erreur) : l'un des deux vaut None
+    """
+    from vehicules.models import Photo
+
+    if fichier.size > taille_max_fichier():
+        return None, f'Fichier trop volumineux (max {taille_max_fichier() // (1024 * 1024)} Mo)'
+
+    try:
+        with Image.open(fichier) as image:
+            format_image = image.format
+            image.load()
+    except Exception:
+        return None, 'Image illisible ou corrompue'
+
+    if format_image not in FORMATS_ACCEPTES:
+        return None, f'Format non accepté ({format_image})'
+
+    fichier.seek(0)
+    champ = Photo._meta.get_field('image')
+    chemin = champ.generate_filename(None, fichier.name)
+    return champ.storage.save(chemin, fichier, max_length=champ.max_length), None
+
+
+def creer_lot(vehicule, fichiers):
+    """
+    Enregistrer un lot de photos pour un véhicule.
+
+    Args:
+        vehicule: Véhicule destinataire
+        fichiers: Liste d'UploadedFile
+
+    Returns:
+        Dict de l'état du lot (voir lire_lot)
+    """
+    from vehicules.models import Photo, Vehicule
+    from vehicules.tasks import generer_variantes_lot
+
+    with ThreadPoolExecutor(max_workers=getattr(settings, 'VEHICULES_PHOTOS_THREADS', 4)) as pool:
+        resultats = list(pool.map(_verifier_et_stocker, fichiers))
+
+    lot = {
+        'id': uuid.uuid4().hex,
+        'vehicule_id': vehicule.id,
+        'date_creation': timezone.now().isoformat(),
+        'total': len(fichiers),
+        'fichiers': [],
+    }
+
+    try:
+        with transaction.atomic():
+            # Verrou sur le véhicule : deux lots simultanés ne calculent pas
+            # le même ordre ni deux photos principales
+            vehicule = Vehicule.objects.select_for_update().get(pk=vehicule.pk)
+            existantes = vehicule.photos.aggregate(
+                dernier_ordre=Max('ordre'),
+                principales=Count('id', filter=Q(est_principale=True)),
+            )
+            ordre = existantes['dernier_ordre'] or 0
+            # Pas encore de photo principale : la première photo valide le devient
+            principale_a_definir = not existantes['principales']
+
+            photos = []
+            for fichier, (chemin, erreur) in zip(fichiers, resultats):
+                etat = {'nom': fichier.name, 'statut': REJETE if erreur else ENREGISTRE}
+                if erreur:
+                    etat['erreur'] = erreur
+                else:
+                    ordre += 1
+                    photos.append(Photo(
+                        vehicule=vehicule,
+                        image=chemin,
+                        ordre=ordre,
+                        est_principale=principale_a_definir and not photos
+                    ))
+                lot['fichiers'].append(etat)
+
+            # bulk_create ne passe pas par Photo.save : une seule requête INSERT
+            Photo.objects.bulk_create(photos)
+    except Exception:
+        # Rien n'est inséré : les fichiers déjà écrits seraient orphelins
+        stockage = Photo._meta.get_field('image').storage
+        for chemin, _ in resultats:
+            if chemin:
+                stockage.delete(chemin)
+        raise
+
+    photos_creees = iter(photos)
+    for etat in lot['fichiers']:
+        if etat['statut'] == ENREGISTRE:
+            etat['photo_id'] = next(photos_creees).pk
+
+    _enregistrer_lot(lot)
+
+    if photos:
+        cache_vehicules.invalider_vehicule(vehicule.id)
+        identifiants = [photo.pk for photo in photos]
+
+        def _lancer():
+            try:
+                generer_variantes_lot.delay(lot['id'], identifiants)
+            except Exception:
+                # Broker indisponible : la commande generer_variantes_photos rattrapera
+                pass
+
+        transaction.on_commit(_lancer)
+
+    return lot
@@ -0,0 +1,34 @@
+# backend/vehicules/management/commands/generer_variantes_photos.py
+from django.core.management.base import BaseCommand
+from vehicules.models import Photo
+from vehicules import images
+
+
+class Command(BaseCommand):
+    help = "Générer les déclinaisons redimensionnées des photos (miniature, carte, détail, WebP)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--toutes',
+            action='store_true',
+            help='Régénérer aussi les photos qui ont déjà leurs déclinaisons'
+        )
+
+    def handle(self, *args, **options):
+        """Générer les déclinaisons manquantes."""
+        
+        photos = Photo.objects.exclude(image='')
+        if not options['toutes']:
+            photos = photos.filter(variantes={})
+        
+        generees = 0
+        for photo in photos.iterator():
+            try:
+                images.generer_variantes(photo)
+                generees += 1
+            except (OSError, ValueError) as erreur:
+                self.stderr.write(f'Photo {photo.pk} : {erreur}')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'{generees} photo(s) traitée(s)')
+        )
@@ -0,0 +1,79 @@
+# backend/vehicules/management/commands/importer_vehicules.py
+from django.core.management.base import BaseCommand, CommandError
+from users.models import User
+from concessions.models import Concession
+from vehicules import import_vehicules
+
+
+class Command(BaseCommand):
+    help = "Importer des véhicules depuis un fichier CSV, JSON ou JSON Lines"
+
+    def add_arguments(self, parser):
+        parser.add_argument('fichier', help='Chemin du fichier à importer')
+        parser.add_argument(
+            '--concessionnaire',
+            required=True,
+            help='Email ou identifiant du concessionnaire propriétaire'
+        )
+        parser.add_argument(
+            '--concession',
+            type=int,
+            help='Concession des lignes sans concession_id'
+        )
+        parser.add_argument(
+            '--format',
+            choices=import_vehicules.FORMATS,
+            help="Format du fichier (par défaut : d'après l'extension)"
+        )
+        parser.add_argument(
+            '--simulation',
+            action='store_true',
+            help='Valider le fichier sans rien enregistrer'
+        )
+
+    def handle(self, *args, **options):
+        """Importer le fichier et afficher les erreurs par ligne."""
+
+        identifiant = options['concessionnaire']
+        filtre = {'email': identifiant} if '@' in identifiant else {'pk': identifiant}
+        concessionnaire = User.objects.filter(type_utilisateur='CONCESSIONNAIRE', **filtre).first()
+        if concessionnaire is None:
+            raise CommandError(f'Concessionnaire introuvable : {identifiant}')
+
+        concession = None
+        if options['concession']:
+            concession = Concession.objects.filter(
+                pk=options['concession'], concessionnaire=concessionnaire, statut='VALIDE'
+            ).first()
+            if concession is None:
+                raise CommandError('Concession introuvable, non validée ou appartenant à un autre concessionnaire')
+
+        format_fichier = options['format'] or import_vehicules.detecter_format(options['fichier'])
+        if format_fichier is None:
+            raise CommandError('Format non reconnu : préciser --format')
+
+        import_ = import_vehicules.ImportVehicules(concessionnaire, concession, simulation=options['simulation'])
+        try:
+            with open(options['fichier'], 'rb') as fichier:
+                rapport = import_.importer(import_vehicules.lire_lignes(fichier, format_fichier))
+        except OSError as erreur:
+            raise CommandError(f'Fichier illisible : {erreur}')
+        if 'erreur_fichier' in rapport:
+            if not rapport['total']:
+                raise CommandError(f"Fichier illisible : {rapport['erreur_fichier']}")
+            self.stderr.write(f"Lecture interrompue : {rapport['erreur_fichier']}")
+
+        for erreur in rapport['erreurs']:
+            details = '; '.join(
+                f"{champ} : {' '.join(str(message) for message in messages)}"
+                for champ, messages in erreur['erreurs'].items()
+            )
+            self.stderr.write(f"Ligne {erreur['ligne']} : {details}")
+
+        verbe = 'valide(s)' if options['simulation'] else 'importé(s)'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{rapport['importes']} véhicule(s) {verbe} sur {rapport['total']} ligne(s), "
+                f"{len(rapport['erreurs'])} erreur(s)"
+            )
+        )
@@ -0,0 +1,34 @@
+# backend/vehicules/management/commands/reconcilier_compteurs.py
+from django.core.management.base import BaseCommand
+from vehicules import compteurs_derives
+
+
+class Command(BaseCommand):
+    help = "Réparer les compteurs dénormalisés (véhicules par marque, catégorie, concession, concessions par région, notes)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--compteur',
+            action='append',
+            choices=list(compteurs_derives.COMPTEURS),
+            help='Compteur à réparer (répétable, par défaut : tous)'
+        )
+        parser.add_argument(
+            '--taille-lot',
+            type=int,
+            default=500,
+            help='Nombre de lignes mises à jour par requête'
+        )
+
+    def handle(self, *args, **options):
+        """Recalculer les lignes dont le compteur a dérivé."""
+        
+        total = 0
+        for nom in options['compteur'] or compteurs_derives.COMPTEURS:
+            corrigees = compteurs_derives.reconcilier(nom, taille_lot=options['taille_lot'])
+            total += corrigees
+            self.stdout.write(f'{nom} : {corrigees} ligne(s) corrigée(s)')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'{total} compteur(s) réparé(s)')
+        )
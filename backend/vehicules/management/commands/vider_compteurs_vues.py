@@ -0,0 +1,19 @@
+# backend/vehicules/management/commands/vider_compteurs_vues.py
+from django.core.management.base import BaseCommand
+from vehicules import compteurs
+
+
+class Command(BaseCommand):
+    help = 'Reporter en base les compteurs de vues bufferisés (véhicules, vidéos, concessions)'
+
+    def handle(self, *args, **options):
+        """Vider les compteurs de vues en attente."""
+        
+        resultats = compteurs.vider()
+        
+        for modele, total in resultats.items():
+            self.stdout.write(f'{modele} : {total} vue(s) reportée(s)')
+        
+        self.stdout.write(
+            self.style.SUCCESS(f'{sum(resultats.values())} vue(s) reportée(s) en base')
+        )
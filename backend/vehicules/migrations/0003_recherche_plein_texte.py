@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def indexer_vehicules(apps, schema_editor):
+    """Calculer le vecteur de recherche des véhicules existants."""
+    Vehicule = apps.get_model('vehicules', 'Vehicule')
+    Marque = apps.get_model('vehicules', 'Marque')
+    Categorie = apps.get_model('vehicules', 'Categorie')
+    Concession = apps.get_model('concessions', 'Concession')
+
+    def champ_lie(modele, cle, champ):
+        return Subquery(modele.objects.filter(pk=OuterRef(cle)).values(champ)[:1])
+
+    Vehicule.objects.update(vecteur_recherche=(
+        SearchVector('nom_modele', weight='A', config='french')
+        + SearchVector(champ_lie(Marque, 'marque_id', 'nom'), weight='A', config='french')
+        + SearchVector(champ_lie(Categorie, 'categorie_id', 'nom'), weight='B', config='french')
+        + SearchVector(champ_lie(Concession, 'concession_id', 'ville'), weight='B', config='french')
+        + SearchVector(champ_lie(Concession, 'concession_id', 'nom'), weight='C', config='french')
+        + SearchVector('immatriculation', weight='C', config='french')
+        + SearchVector('description', weight='D', config='french')
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('concessions', '0001_initial'),
+        ('vehicules', '0002_remove_vehicule_image_principale_photo_video_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='vehicule',
+            name='vecteur_recherche',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='vehicule',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['vecteur_recherche'], name='vehicule_recherche_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicule',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['nom_modele'], name='vehicule_modele_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.RunPython(indexer_vehicules, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('concessions', '0001_initial'),
+        ('vehicules', '0003_recherche_plein_texte'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehicule',
+            index=models.Index(fields=['date_ajout'], name='vehicules_v_date_aj_5ece66_idx'),
+        ),
+    ]
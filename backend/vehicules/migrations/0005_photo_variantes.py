@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicules', '0004_index_pagination_curseur'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='photo',
+            name='variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Chemins des versions redimensionnées (vehicules/images.py)', verbose_name='Déclinaisons'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:39
+
+from django.db import migrations, models
+from django.db.models import Avg, Count, DecimalField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce
+
+
+def reconstruire_notes(apps, schema_editor):
+    """Initialiser somme, nombre et moyenne des notes depuis les avis validés."""
+    Avis = apps.get_model('avis', 'Avis')
+    Vehicule = apps.get_model('vehicules', 'Vehicule')
+    Concession = apps.get_model('concessions', 'Concession')
+
+    for modele, cle in ((Vehicule, 'vehicule'), (Concession, 'vehicule__concession')):
+        avis = Avis.objects.filter(est_valide=True, **{cle: OuterRef('pk')}).order_by().values(cle)
+        modele.objects.update(
+            somme_notes=Coalesce(Subquery(avis.annotate(s=Sum('note')).values('s')), 0),
+            nombre_avis=Coalesce(Subquery(avis.annotate(n=Count('pk')).values('n')), 0),
+            note_moyenne=Cast(
+                Coalesce(Subquery(avis.annotate(m=Avg('note')).values('m')), 0.0),
+                DecimalField(max_digits=3, decimal_places=2)
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('avis', '0001_initial'),
+        ('concessions', '0002_notes_incrementales'),
+        ('vehicules', '0005_photo_variantes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicule',
+            name='somme_notes',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(reconstruire_notes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.8 on 2026-10-17 06:52
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def initialiser_historique(apps, schema_editor):
+    """Une première ligne par véhicule existant, au prix courant."""
+    Vehicule = apps.get_model('vehicules', 'Vehicule')
+    HistoriquePrix = apps.get_model('vehicules', 'HistoriquePrix')
+
+    def prix_courant(vehicule):
+        if vehicule.est_disponible_location and vehicule.prix_location_jour:
+            return vehicule.prix_location_jour
+        if vehicule.est_disponible_vente and vehicule.prix_vente:
+            return vehicule.prix_vente
+        return None
+
+    vehicules = Vehicule.objects.only(
+        'prix_location_jour', 'prix_vente', 'est_disponible_location', 'est_disponible_vente'
+    ).order_by('pk')
+    lot = []
+    for vehicule in vehicules.iterator(chunk_size=2000):
+        lot.append(HistoriquePrix(
+            vehicule_id=vehicule.pk,
+            prix_location_jour=vehicule.prix_location_jour,
+            prix_vente=vehicule.prix_vente,
+            prix=prix_courant(vehicule),
+        ))
+        if len(lot) >= 2000:
+            HistoriquePrix.objects.bulk_create(lot)
+            lot = []
+    HistoriquePrix.objects.bulk_create(lot)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicules', '0006_notes_incrementales'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoriquePrix',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prix_location_jour', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('prix_vente', models.DecimalField(blank=True, decimal_places=2, max_digits=12, null=True)),
+                ('prix', models.DecimalField(blank=True, decimal_places=2, help_text='Vehicule.prix_courant à cette date', max_digits=12, null=True, verbose_name='Prix affiché')),
+                ('date', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date')),
+                ('vehicule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='historique_prix', to='vehicules.vehicule', verbose_name='Véhicule')),
+            ],
+            options={
+                'verbose_name': 'Historique de prix',
+                'verbose_name_plural': 'Historique des prix',
+                'ordering': ['vehicule', 'date'],
+                'indexes': [models.Index(fields=['vehicule', 'date'], name='vehicules_h_vehicul_225408_idx')],
+            },
+        ),
+        migrations.RunPython(initialiser_historique, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,16 @@
 from django.db import models
+from django.utils import timezone
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from users.models import User
+from vehicules import cache as cache_vehicules
+from vehicules.champs import champs_concernes
+from vehicules import compteurs
+from vehicules import compteurs_derives
+from vehicules import recherche
+from vehicules import images
 
 
 # ========================================
@@ -61,10 +70,17 @@ class Marque(models.Model):
     def __str__(self):
         return self.nom
     
+    def save(self, *args, **kwargs):
+        """Réindexer les véhicules si le nom change."""
+        is_new = self.pk is None
+        super().save(*args, **kwargs)
+        if not is_new and champs_concernes(kwargs.get('update_fields'), ['nom']):
+            recherche.indexer(marque_id=self.pk)
+    
     def mettre_a_jour_compteur(self):
-        """Mettre à jour le compteur de véhicules."""
-        self.nombre_vehicules = self.vehicules.count()
-        self.save(update_fields=['nombre_vehicules'])
+        """Mettre à jour le compteur de véhicules (tout de suite)."""
+        compteurs_derives.recalculer('marque', [self.pk])
+        self.refresh_from_db(fields=['nombre_vehicules'])
 
 
 # ========================================
@@ -126,16 +142,19 @@ class Categorie(models.Model):
         return self.nom
     
     def save(self, *args, **kwargs):
-        """Générer automatiquement le slug."""
+        """Générer automatiquement le slug et réindexer les véhicules si le nom change."""
         if not self.slug:
             from django.utils.text import slugify
             self.slug = slugify(self.nom)
+        is_new = self.pk is None
         super().save(*args, **kwargs)
+        if not is_new and champs_concernes(kwargs.get('update_fields'), ['nom']):
+            recherche.indexer(categorie_id=self.pk)
     
     def mettre_a_jour_compteur(self):
-        """Mettre à jour le compteur de véhicules."""
-        self.nombre_vehicules = self.vehicules.count()
-        self.save(update_fields=['nombre_vehicules'])
+        """Mettre à jour le compteur de véhicules (tout de suite)."""
+        compteurs_derives.recalculer('categorie', [self.pk])
+        self.refresh_from_db(fields=['nombre_vehicules'])
 
 
 # ========================================
@@ -179,6 +198,14 @@ class Photo(models.Model):
         help_text="Une seule photo principale par véhicule"
     )
     
+    variantes = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Déclinaisons",
+        help_text="Chemins des versions redimensionnées (vehicules/images.py)"
+    )
+    
     date_ajout = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Date d'ajout"
@@ -201,7 +228,16 @@ class Photo(models.Model):
         """
         Si cette photo est marquée comme principale,
         retirer le statut principal des autres photos du même véhicule.
+        Les déclinaisons d'une nouvelle image sont générées en arrière-plan.
         """
+        update_fields = kwargs.get('update_fields')
+        nouvelle_image = self.pk is None
+        if self.pk and self.image and (update_fields is None or 'image' in update_fields):
+            ancienne = Photo.objects.filter(pk=self.pk).values_list('image', flat=True).first()
+            if ancienne != self.image.name:
+                nouvelle_image = True
+                self.variantes = {}
+        
         if self.est_principale:
             # Retirer le statut principal des autres photos
             Photo.objects.filter(
@@ -210,6 +246,20 @@ class Photo(models.Model):
             ).exclude(pk=self.pk).update(est_principale=False)
         
         super().save(*args, **kwargs)
+        cache_vehicules.invalider_vehicule(self.vehicule_id)
+        
+        if nouvelle_image and self.image:
+            images.planifier_variantes(self.pk)
+    
+    def url_variante(self, taille, format_nom='jpeg'):
+        """URL d'une version redimensionnée ('miniature', 'carte', 'detail')."""
+        return images.url_variante(self, taille, format_nom)
+    
+    def delete(self, *args, **kwargs):
+        """Override delete pour invalider le cache du véhicule."""
+        vehicule_id = self.vehicule_id
+        super().delete(*args, **kwargs)
+        cache_vehicules.invalider_vehicule(vehicule_id)
 
  #========================================
 # MODÈLE VIDEO
@@ -315,6 +365,17 @@ class Video(models.Model):
     def __str__(self):
         return f"Vidéo {self.ordre} - {self.vehicule}"
     
+    def save(self, *args, **kwargs):
+        """Override save pour invalider le cache du véhicule."""
+        super().save(*args, **kwargs)
+        cache_vehicules.invalider_vehicule(self.vehicule_id)
+    
+    def delete(self, *args, **kwargs):
+        """Override delete pour invalider le cache du véhicule."""
+        vehicule_id = self.vehicule_id
+        super().delete(*args, **kwargs)
+        cache_vehicules.invalider_vehicule(vehicule_id)
+    
     def clean(self):
         """Validation : soit fichier, soit URL."""
         from django.core.exceptions import ValidationError
@@ -342,9 +403,8 @@ class Video(models.Model):
         return self.url
     
     def incrementer_vues(self):
-        """Incrémenter le compteur de vues."""
-        self.nombre_vues += 1
-        self.save(update_fields=['nombre_vues'])
+        """Incrémenter le compteur de vues (reporté en base par lots)."""
+        compteurs.incrementer('video', self.pk)
     
     @staticmethod
     def extraire_id_youtube(url):
@@ -469,11 +529,15 @@ class Vehicule(models.Model):
     nombre_locations = models.IntegerField(default=0)
     note_moyenne = models.DecimalField(max_digits=3, decimal_places=2, default=0, validators=[MinValueValidator(0), MaxValueValidator(5)])
     nombre_avis = models.IntegerField(default=0)
+    somme_notes = models.IntegerField(default=0, editable=False)  # Avis validés (avis/notes.py)
     
     # Métadonnées
     date_ajout = models.DateTimeField(auto_now_add=True)
     date_modification = models.DateTimeField(auto_now=True)
     
+    # Recherche plein texte (maintenu par vehicules/recherche.py)
+    vecteur_recherche = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         verbose_name = "Véhicule"
         verbose_name_plural = "Véhicules"
@@ -485,6 +549,9 @@ class Vehicule(models.Model):
             models.Index(fields=['statut', 'est_visible']),
             models.Index(fields=['prix_location_jour']),
             models.Index(fields=['immatriculation']),
+            models.Index(fields=['date_ajout']),
+            GinIndex(fields=['vecteur_recherche'], name='vehicule_recherche_gin'),
+            GinIndex(fields=['nom_modele'], name='vehicule_modele_trgm', opclasses=['gin_trgm_ops']),
         ]
         unique_together = [['concessionnaire', 'immatriculation']]
     
@@ -512,57 +579,87 @@ class Vehicule(models.Model):
         if self.est_disponible_location and not self.prix_location_jour:
             raise ValidationError({'prix_location_jour': 'Prix obligatoire'})
     
+    # Champs dont dépend le prix courant (alertes prix des favoris)
+    CHAMPS_PRIX = ('prix_location_jour', 'prix_vente', 'est_disponible_location', 'est_disponible_vente')
+    
     def save(self, *args, **kwargs):
         """Override save."""
         self.clean()
         is_new = self.pk is None
+        
+        ancien_prix = None
+        if not is_new and champs_concernes(kwargs.get('update_fields'), self.CHAMPS_PRIX):
+            ancien_prix = Vehicule.objects.filter(pk=self.pk).values_list(*self.CHAMPS_PRIX).first()
+        
         super().save(*args, **kwargs)
+        cache_vehicules.invalider_vehicule(self.pk)
+        
+        prix_modifie = ancien_prix is not None and ancien_prix != tuple(getattr(self, champ) for champ in self.CHAMPS_PRIX)
+        if is_new or prix_modifie:
+            HistoriquePrix.objects.create(**HistoriquePrix.valeurs(self))
+        
+        if prix_modifie:
+            # Favoris du véhicule évalués au commit (favoris/alertes_prix.py)
+            from favoris import alertes_prix
+            alertes_prix.prix_modifie(self.pk)
+        
+        if champs_concernes(kwargs.get('update_fields'), recherche.CHAMPS_INDEXES):
+            recherche.indexer(pk=self.pk)
         
         if is_new:
-            self.concession.nombre_vehicules += 1
-            self.concession.save(update_fields=['nombre_vehicules'])
-            self.marque.mettre_a_jour_compteur()
-            self.categorie.mettre_a_jour_compteur()
+            # Compteurs des parents recalculés au commit (compteurs_derives)
+            compteurs_derives.marquer('concession', self.concession_id)
+            compteurs_derives.marquer('marque', self.marque_id)
+            compteurs_derives.marquer('categorie', self.categorie_id)
     
     def delete(self, *args, **kwargs):
         """Override delete."""
-        concession = self.concession
-        marque = self.marque
-        categorie = self.categorie
+        vehicule_id = self.pk
         
         super().delete(*args, **kwargs)
+        cache_vehicules.invalider_vehicule(vehicule_id)
         
-        if concession:
-            concession.nombre_vehicules = max(0, concession.nombre_vehicules - 1)
-            concession.save(update_fields=['nombre_vehicules'])
-        if marque:
-            marque.mettre_a_jour_compteur()
-        if categorie:
-            categorie.mettre_a_jour_compteur()
+        compteurs_derives.marquer('concession', self.concession_id)
+        compteurs_derives.marquer('marque', self.marque_id)
+        compteurs_derives.marquer('categorie', self.categorie_id)
 
 
+    def incrementer_vues(self):
+        """Incrémenter le compteur de vues (reporté en base par lots)."""
+        compteurs.incrementer('vehicule', self.pk)
+
     def mettre_a_jour_note(self):
         """
-        Met à jour la note moyenne du véhicule à partir des avis validés.
+        Recalcule la note moyenne du véhicule à partir de tous ses avis
+        validés (les avis appliquent sinon des deltas, voir avis/notes.py).
         """
-        from django.db.models import Avg, Count
-        
-        # Calculer la moyenne des notes des avis validés
-        avis_valides = self.avis.filter(est_valide=True)
-        
-        stats = avis_valides.aggregate(
-            moyenne=Avg('note'),
-            total=Count('id')
-        )
-        
-        self.note_moyenne = stats['moyenne'] or 0
-        self.nombre_avis = stats['total'] or 0
-        
-        self.save(update_fields=['note_moyenne', 'nombre_avis'])
+        compteurs_derives.recalculer('note_vehicule', [self.pk])
+        self.refresh_from_db(fields=['note_moyenne', 'nombre_avis', 'somme_notes'])
+
+    @property
+    def prix_courant(self):
+        """
+        Prix affiché du véhicule : prix de location s'il est proposé à la
+        location, sinon prix de vente (None si aucun).
+        """
+        if self.est_disponible_location and self.prix_location_jour:
+            return self.prix_location_jour
+        if self.est_disponible_vente and self.prix_vente:
+            return self.prix_vente
+        return None
 
     @property
     def photo_principale(self):
-        """Retourner la photo principale du véhicule."""
+        """
+        Retourner la photo principale du véhicule.
+        
+        Aucune requête si les photos ont été préchargées, par
+        prefetch_photo_principale() ou par prefetch_related('photos').
+        """
+        if hasattr(self, 'photos_principales'):
+            return self.photos_principales[0] if self.photos_principales else None
+        if 'photos' in getattr(self, '_prefetched_objects_cache', {}):
+            return next((photo for photo in self.photos.all() if photo.est_principale), None)
         return self.photos.filter(est_principale=True).first()
     
     @property
@@ -585,3 +682,69 @@ class Vehicule(models.Model):
         """Retourner la première vidéo du véhicule."""
         return self.videos.first()
 
+
+class HistoriquePrix(models.Model):
+    """
+    Historique des prix d'un véhicule (ajout seul).
+    Une ligne à la création du véhicule puis à chaque changement de prix
+    ou de disponibilité (vente / location).
+    """
+    
+    vehicule = models.ForeignKey(
+        Vehicule,
+        on_delete=models.CASCADE,
+        related_name='historique_prix',
+        verbose_name="Véhicule"
+    )
+    
+    prix_location_jour = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    prix_vente = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
+    
+    prix = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Prix affiché",
+        help_text="Vehicule.prix_courant à cette date"
+    )
+    
+    date = models.DateTimeField(default=timezone.now, verbose_name="Date")
+    
+    class Meta:
+        verbose_name = "Historique de prix"
+        verbose_name_plural = "Historique des prix"
+        ordering = ['vehicule', 'date']
+        indexes = [
+            models.Index(fields=['vehicule', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.vehicule_id} - {self.prix} ({self.date:%d/%m/%Y %H:%M})"
+    
+    @staticmethod
+    def valeurs(vehicule):
+        """Champs d'une ligne d'historique pour le prix courant du véhicule."""
+        return {
+            'vehicule_id': vehicule.pk,
+            'prix_location_jour': vehicule.prix_location_jour,
+            'prix_vente': vehicule.prix_vente,
+            'prix': vehicule.prix_courant,
+        }
+
+
+def prefetch_photo_principale(prefixe=''):
+    """
+    Précharger la seule photo principale des véhicules d'une liste, lue
+    ensuite par Vehicule.photo_principale sans requête supplémentaire.
+    
+    Args:
+        prefixe: Chemin vers le véhicule depuis le modèle listé
+            (ex: 'vehicule__' pour une liste de locations)
+    """
+    return models.Prefetch(
+        f'{prefixe}photos',
+        queryset=Photo.objects.filter(est_principale=True),
+        to_attr='photos_principales'
+    )
+
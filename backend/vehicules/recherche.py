@@ -0,0 +1,52 @@
+# backend/vehicules/recherche.py
+# Recherche plein texte du catalogue véhicules (PostgreSQL)
+#
+# Chaque véhicule porte un vecteur tsvector (Vehicule.vecteur_recherche,
+# index GIN) construit à partir du modèle, de la marque, de la catégorie,
+# de la concession et de la description. Le vecteur est recalculé par un
+# UPDATE SQL à chaque modification d'un de ces champs. Le filtre de
+# recherche est vehicules.filters.RechercheTexteFilter.
+
+from django.contrib.postgres.search import SearchVector
+from django.db.models import OuterRef, Subquery
+
+
+# Configuration de recherche PostgreSQL (racinisation française)
+CONFIG = 'french'
+
+# Champs de Vehicule qui entrent dans le vecteur
+CHAMPS_INDEXES = {
+    'nom_modele', 'immatriculation', 'description',
+    'marque', 'marque_id', 'categorie', 'categorie_id',
+    'concession', 'concession_id',
+}
+
+
+def expression_vecteur():
+    """Expression SQL du vecteur de recherche d'un véhicule."""
+    from vehicules.models import Marque, Categorie
+    from concessions.models import Concession
+
+    def champ_lie(modele, cle, champ):
+        return Subquery(modele.objects.filter(pk=OuterRef(cle)).values(champ)[:1])
+
+    return (
+        SearchVector('nom_modele', weight='A', config=CONFIG)
+        + SearchVector(champ_lie(Marque, 'marque_id', 'nom'), weight='A', config=CONFIG)
+        + SearchVector(champ_lie(Categorie, 'categorie_id', 'nom'), weight='B', config=CONFIG)
+        + SearchVector(champ_lie(Concession, 'concession_id', 'ville'), weight='B', config=CONFIG)
+        + SearchVector(champ_lie(Concession, 'concession_id', 'nom'), weight='C', config=CONFIG)
+        + SearchVector('immatriculation', weight='C', config=CONFIG)
+        + SearchVector('description', weight='D', config=CONFIG)
+    )
+
+
+def indexer(**filtres):
+    """
+    Recalculer les vecteurs des véhicules sélectionnés, en un seul UPDATE.
+
+    Exemples : indexer(pk=12), indexer(marque_id=3), indexer()
+    """
+    from vehicules.models import Vehicule
+
+    return Vehicule.objects.filter(**filtres).update(vecteur_recherche=expression_vecteur())
@@ -5,6 +5,7 @@ from rest_framework import serializers
 from .models import Marque, Categorie, Vehicule, Photo, Video
 from concessions.models import Concession
 from users.models import User
+from vehicules import images
 
 
 # ========================================
@@ -152,6 +153,7 @@ class PhotoSerializer(serializers.ModelSerializer):
     """
     
     image_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = Photo
@@ -159,6 +161,7 @@ class PhotoSerializer(serializers.ModelSerializer):
             'id',
             'image',
             'image_url',
+            'srcset',
             'legende',
             'ordre',
             'est_principale',
@@ -174,6 +177,11 @@ class PhotoSerializer(serializers.ModelSerializer):
         elif obj.image:
             return obj.image.url
         return None
+    
+    def get_srcset(self, obj):
+        """Versions redimensionnées par format : {'jpeg': 'url 320w, ...', 'webp': ...}."""
+        request = self.context.get('request')
+        return images.srcset(obj, request.build_absolute_uri if request else None)
 
 
 class PhotoCreateSerializer(serializers.ModelSerializer):
@@ -377,6 +385,8 @@ class VehiculeListSerializer(serializers.ModelSerializer):
     
     nom_complet = serializers.ReadOnlyField()
     photo_principale = serializers.SerializerMethodField()
+    photo_principale_srcset = serializers.SerializerMethodField()
+    distance = serializers.SerializerMethodField()
     
     class Meta:
         model = Vehicule
@@ -397,22 +407,37 @@ class VehiculeListSerializer(serializers.ModelSerializer):
             'prix_vente',
             'prix_location_jour',
             'photo_principale',  # Au lieu de image_principale
+            'photo_principale_srcset',
             'statut',
             'concession_nom',
             'concession_ville',
             'note_moyenne',
             'nombre_avis',
+            'distance',
         ]
     
     def get_photo_principale(self, obj):
-        """Retourner l'URL de la photo principale."""
+        """Retourner l'URL de la photo principale (format carte)."""
         photo = obj.photo_principale
         if photo and photo.image:
             request = self.context.get('request')
             if request:
-                return request.build_absolute_uri(photo.image.url)
-            return photo.image.url
+                return request.build_absolute_uri(photo.url_variante('carte'))
+            return photo.url_variante('carte')
         return None
+    
+    def get_photo_principale_srcset(self, obj):
+        """Versions redimensionnées de la photo principale, par format."""
+        photo = obj.photo_principale
+        if photo and photo.image:
+            request = self.context.get('request')
+            return images.srcset(photo, request.build_absolute_uri if request else None)
+        return {}
+    
+    def get_distance(self, obj):
+        """Distance (km) à la position recherchée (?latitude=&longitude=)."""
+        distance = getattr(obj, 'distance', None)
+        return round(distance, 2) if distance is not None else None
 
 
 # ========================================
@@ -584,4 +609,43 @@ class VehiculeCreateSerializer(serializers.ModelSerializer):
                 est_principale=(index == 0)  # La première photo est principale
             )
         
-        return vehicule
\ No newline at end of file
+        return vehicule
+
+# ========================================
+# SERIALIZER VÉHICULE (IMPORT EN MASSE)
+# ========================================
+
+class VehiculeImportSerializer(VehiculeCreateSerializer):
+    """
+    Validation d'une ligne d'import (vehicules/import_vehicules.py).
+
+    Mêmes règles que la création, mais la marque et la catégorie sont
+    données par leur nom et résolues par l'import (sans requête par ligne),
+    tout comme la concession et l'unicité de l'immatriculation.
+    """
+
+    marque_id = None
+    categorie_id = None
+    photos_data = None
+
+    marque = serializers.CharField(max_length=100)
+    categorie = serializers.CharField(max_length=100)
+    concession_id = serializers.IntegerField(required=False)
+
+    # Pas de UniqueValidator (une requête par ligne) : vérifié par lot
+    immatriculation = serializers.CharField(max_length=20)
+
+    class Meta(VehiculeCreateSerializer.Meta):
+        fields = ['marque', 'categorie'] + [
+            champ for champ in VehiculeCreateSerializer.Meta.fields
+            if champ not in ('marque_id', 'categorie_id', 'photos_data')
+        ]
+
+    def validate_concession_id(self, value):
+        return value
+
+    def validate(self, data):
+        # Valeurs par défaut du modèle, utilisées par les règles d'offre
+        data.setdefault('est_disponible_vente', False)
+        data.setdefault('est_disponible_location', True)
+        return super().validate(data)
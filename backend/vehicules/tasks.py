@@ -0,0 +1,49 @@
+# backend/vehicules/tasks.py
+# Tâches Celery de l'app véhicules
+
+from celery import shared_task
+
+from vehicules import compteurs
+
+
+@shared_task
+def vider_compteurs_vues():
+    """Reporter en base les compteurs de vues bufferisés (planifié par Celery beat)."""
+    return compteurs.vider()
+
+
+@shared_task
+def recalculer_compteurs_derives(lots):
+    """Recalculer les compteurs dénormalisés marqués lors d'un commit ({nom: [pk]})."""
+    from vehicules import compteurs_derives
+
+    return compteurs_derives.appliquer(lots)
+
+
+@shared_task
+def generer_variantes_photo(photo_id):
+    """Générer les déclinaisons redimensionnées d'une photo après son upload."""
+    from vehicules.models import Photo
+    from vehicules import images
+
+    photo = Photo.objects.filter(pk=photo_id).first()
+    if photo is None or not photo.image:
+        return None
+    return images.generer_variantes(photo)
+
+
+@shared_task
+def generer_variantes_lot(lot_id, photo_ids):
+    """Générer les déclinaisons des photos d'un lot et suivre leur statut."""
+    from PIL import Image
+
+    from vehicules.models import Photo
+    from vehicules import images, lots_photos
+
+    for photo in Photo.objects.filter(pk__in=photo_ids):
+        try:
+            images.generer_variantes(photo)
+            lots_photos.marquer_fichier(lot_id, photo.pk, lots_photos.TRAITE)
+        except (OSError, ValueError, Image.DecompressionBombError) as erreur:
+            lots_photos.marquer_fichier(lot_id, photo.pk, lots_photos.ECHEC, str(erreur))
+    return len(photo_ids)
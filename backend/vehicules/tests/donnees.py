@@ -0,0 +1,41 @@
+# backend/vehicules/tests/donnees.py
+# Données communes aux tests du catalogue (vehicules, statistiques)
+
+from decimal import Decimal
+
+from users.models import User, Role
+from concessions.models import Region, Concession
+from vehicules.models import Marque, Categorie
+
+
+class CatalogueTestMixin:
+    """
+    Un concessionnaire, un client, une concession validée, une marque et
+    une catégorie, créés une fois par classe de test (setUpTestData).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        role_concessionnaire = Role.objects.create(nom='CONCESSIONNAIRE_PROPRIETAIRE')
+        role_client = Role.objects.create(nom='CLIENT')
+
+        cls.concessionnaire = User.objects.create_user(
+            email='concessionnaire@test.sn', password='test', nom='Diop', prenom='Awa',
+            type_utilisateur='CONCESSIONNAIRE', role=role_concessionnaire
+        )
+        cls.client_user = User.objects.create_user(
+            email='client@test.sn', password='test', nom='Fall', prenom='Moussa',
+            type_utilisateur='CLIENT', role=role_client
+        )
+
+        region = Region.objects.create(nom='Dakar', code='DK')
+        cls.concession = Concession.objects.create(
+            concessionnaire=cls.concessionnaire, region=region, nom='Auto Dakar',
+            description='Concession de test', adresse='Plateau', ville='Dakar',
+            telephone='+221771234567', email='concession@test.sn',
+            latitude=Decimal('14.7167'), longitude=Decimal('-17.4677'),
+            numero_registre_commerce='RC-TEST-1', statut='VALIDE'
+        )
+        cls.marque = Marque.objects.create(nom='Toyota')
+        cls.categorie = Categorie.objects.create(nom='SUV')
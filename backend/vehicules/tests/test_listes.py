@@ -0,0 +1,75 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from vehicules.tests.donnees import CatalogueTestMixin
+from vehicules.models import Vehicule, Photo
+from locations.models import Location
+from favoris.models import Favori
+
+
+class ListesRequetesTest(CatalogueTestMixin, TestCase):
+    """
+    Détecteur de N+1 : le nombre de requêtes d'une liste ne doit pas
+    dépendre du nombre d'éléments affichés (photo principale comprise).
+    """
+
+    def setUp(self):
+        # Utilisateur connecté : les listes ne sont pas servies depuis le cache
+        self.api = APIClient()
+        self.api.force_authenticate(self.client_user)
+
+    def creer_vehicules(self, nombre, debut=0):
+        """Créer nombre véhicules avec deux photos, une location et un favori chacun."""
+        aujourd_hui = timezone.now().date()
+
+        for i in range(debut, debut + nombre):
+            vehicule = Vehicule.objects.create(
+                concessionnaire=self.concessionnaire, concession=self.concession,
+                marque=self.marque, categorie=self.categorie,
+                nom_modele=f'Modele {i}', annee=2020, couleur='Noir',
+                immatriculation=f'DK-{i:04d}-T', prix_location_jour=Decimal('20000')
+            )
+            Photo.objects.create(vehicule=vehicule, image=f'vehicules/photos/{i}-a.jpg', est_principale=True)
+            Photo.objects.create(vehicule=vehicule, image=f'vehicules/photos/{i}-b.jpg', ordre=1)
+            Location.objects.create(
+                vehicule=vehicule, client=self.client_user,
+                date_debut=aujourd_hui + timedelta(days=1),
+                date_fin=aujourd_hui + timedelta(days=3),
+                prix_jour=Decimal('20000'), caution=Decimal('0')
+            )
+            Favori.objects.create(client=self.client_user, vehicule=vehicule)
+
+    def compter_requetes(self, url):
+        with CaptureQueriesContext(connection) as contexte:
+            response = self.api.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(contexte.captured_queries), response.data['results']
+
+    def test_listes_nombre_requetes_fixe(self):
+        urls = ['/api/vehicules/', '/api/locations/', '/api/favoris/']
+
+        self.creer_vehicules(2)
+        peu = {url: self.compter_requetes(url)[0] for url in urls}
+
+        self.creer_vehicules(8, debut=2)
+        for url in urls:
+            nombre, resultats = self.compter_requetes(url)
+            self.assertEqual(nombre, peu[url], url)
+            self.assertEqual(len(resultats), 10, url)
+
+    def test_photo_principale_prechargee(self):
+        self.creer_vehicules(3)
+
+        _, resultats = self.compter_requetes('/api/vehicules/')
+        for vehicule in resultats:
+            self.assertTrue(vehicule['photo_principale'].endswith('-a.jpg'))
+
+        _, resultats = self.compter_requetes('/api/favoris/')
+        for favori in resultats:
+            self.assertTrue(favori['vehicule']['photo_principale'].endswith('-a.jpg'))
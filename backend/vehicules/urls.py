@@ -49,8 +49,15 @@ PUT    /api/vehicules/{id}/           - Modifier un véhicule (Propriétaire)
 PATCH  /api/vehicules/{id}/           - Modifier partiellement (Propriétaire)
 DELETE /api/vehicules/{id}/           - Supprimer un véhicule (Propriétaire)
 GET    /api/vehicules/mes-vehicules/  - Mes véhicules (Concessionnaire)
+GET    /api/vehicules/disponibles/?date_debut=&date_fin= - Véhicules libres à la location sur la période
+POST   /api/vehicules/{id}/photos-lot/ - Ajouter une galerie par lot (202 + identifiant de lot)
+GET    /api/vehicules/{id}/photos-lot/{lot_id}/ - Statut de chaque fichier du lot
+GET    /api/vehicules/{id}/historique-prix/ - Série de prix échantillonnée (?date_debut=&date_fin=&points=)
+GET    /api/vehicules/facettes/       - Compteurs des filtres (marque, catégorie, prix...)
 GET    /api/vehicules/par-marque/     - Grouper par marque
 GET    /api/vehicules/par-categorie/  - Grouper par catégorie
+GET    /api/vehicules/statistiques_cache/ - Compteurs hit/miss du cache (Admin)
+POST   /api/vehicules/import/         - Import en masse CSV / JSON (Concessionnaire), erreurs par ligne
 
 FILTRES VÉHICULES :
 -------------------
@@ -64,6 +71,8 @@ FILTRES VÉHICULES :
 ?annee__gte=2020                       - Année min
 ?nombre_places__gte=5                  - Nombre de places min
 ?climatisation=true                    - Avec climatisation
-?search=Toyota                         - Recherche textuelle
+?latitude=14.71&longitude=-17.46&rayon=10 - Concession à moins de 10 km (tri par distance)
+?search=Toyota                         - Recherche plein texte (tri par pertinence)
 ?ordering=-prix_location_jour          - Tri (prix décroissant)
+?pagination=curseur                    - Pagination par curseur (défilement infini, liens next/previous)
 """
\ No newline at end of file
@@ -5,7 +5,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
 from favoris.models import Historique
 
-from vehicules.models import Marque, Categorie, Vehicule, Photo, Video
+from vehicules.models import Marque, Categorie, Vehicule, Photo, Video, prefetch_photo_principale
 from vehicules.serializers import (
     MarqueSerializer, MarqueCreateSerializer,
     CategorieSerializer, CategorieCreateSerializer,
@@ -14,6 +14,14 @@ from vehicules.serializers import (
     VideoSerializer, VideoCreateSerializer
 )
 from users.permissions import IsConcessionnaire, IsAdministrateur
+from vehicules import cache as cache_vehicules
+from vehicules import compteurs
+from vehicules import lots_photos
+from vehicules import import_vehicules
+from vehicules.facettes import calculer_facettes
+from config.pagination import PaginationCatalogue
+from vehicules.filters import ProximiteFilter, RechercheTexteFilter, VehiculeOrderingFilter
+from locations.disponibilite import vehicules_disponibles
 
 
 # ========================================
@@ -127,7 +135,12 @@ class VehiculeViewSet(viewsets.ModelViewSet):
         'concessionnaire'
     ).prefetch_related('photos', 'videos')
     
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [
+        DjangoFilterBackend,
+        RechercheTexteFilter,
+        ProximiteFilter,
+        VehiculeOrderingFilter
+    ]
     
     # Filtres Django Filter
     filterset_fields = {
@@ -146,16 +159,7 @@ class VehiculeViewSet(viewsets.ModelViewSet):
         'climatisation': ['exact'],
     }
     
-    # Recherche textuelle
-    search_fields = [
-        'nom_modele',
-        'marque__nom',
-        'categorie__nom',
-        'description',
-        'immatriculation',
-        'concession__nom',
-        'concession__ville'
-    ]
+    # Recherche textuelle : voir vehicules/recherche.py (champs indexés)
     
     # Tri
     ordering_fields = [
@@ -165,10 +169,16 @@ class VehiculeViewSet(viewsets.ModelViewSet):
         'kilometrage',
         'date_ajout',
         'note_moyenne',
-        'nombre_vues'
+        'nombre_vues',
+        'distance'  # Avec ?latitude=&longitude=
     ]
     ordering = ['-date_ajout']
     
+    # Pagination : ?page=N (total estimé au-delà du seuil), ou curseur sur
+    # la date d'ajout (?pagination=curseur)
+    pagination_class = PaginationCatalogue
+    ordering_curseur = '-date_ajout'
+    
     def get_serializer_class(self):
         """Retourner le serializer approprié."""
         if self.action == 'list':
@@ -179,7 +189,7 @@ class VehiculeViewSet(viewsets.ModelViewSet):
     
     def get_permissions(self):
         """Permissions."""
-        if self.action in ['create']:
+        if self.action in ['create', 'importer']:
             return [permissions.IsAuthenticated(), IsConcessionnaire()]
         elif self.action in ['update', 'partial_update', 'destroy']:
             return [permissions.IsAuthenticated()]
@@ -189,14 +199,18 @@ class VehiculeViewSet(viewsets.ModelViewSet):
         """Personnaliser le queryset selon l'utilisateur."""
         queryset = super().get_queryset()
         
+        # Les listes n'affichent que la photo principale : ne précharger qu'elle
+        if self.action in ['list', 'mes_vehicules', 'disponibles']:
+            queryset = queryset.prefetch_related(None).prefetch_related(prefetch_photo_principale())
+        
         # Si l'utilisateur est concessionnaire, voir tous ses véhicules
         if self.request.user.is_authenticated and self.request.user.is_concessionnaire():
-            if self.action in ['update', 'partial_update', 'destroy', 'retrieve']:
+            if self.action in ['update', 'partial_update', 'destroy', 'retrieve', 'historique_prix']:
                 # Pour les actions d'édition, voir uniquement ses propres véhicules
                 return queryset.filter(concessionnaire=self.request.user)
         
         # Pour les autres (clients, visiteurs), seulement les véhicules disponibles et visibles
-        if self.action == 'list':
+        if self.action in ['list', 'facettes']:
             queryset = queryset.filter(
                 statut='DISPONIBLE',
                 est_visible=True,
@@ -205,6 +219,14 @@ class VehiculeViewSet(viewsets.ModelViewSet):
             ).filter(
                 Q(est_disponible_vente=True) | Q(est_disponible_location=True)
             )
+        elif self.action == 'disponibles':
+            # Le statut est filtré par le moteur de disponibilité
+            # (un véhicule LOUE peut être libre sur une période future)
+            queryset = queryset.filter(
+                est_visible=True,
+                concession__statut='VALIDE',
+                concession__est_visible=True
+            )
         
         return queryset
     
@@ -212,8 +234,31 @@ class VehiculeViewSet(viewsets.ModelViewSet):
         """Créer un véhicule et l'attribuer au concessionnaire connecté."""
         serializer.save(concessionnaire=self.request.user)
     
+    def list(self, request, *args, **kwargs):
+        """Lister les véhicules (servi depuis le cache pour les visiteurs)."""
+        if not cache_vehicules.requete_cacheable(request):
+            return super().list(request, *args, **kwargs)
+        
+        cle = cache_vehicules.cle_liste(request)
+        data = cache_vehicules.lire(cle, 'liste')
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+        
+        response = super().list(request, *args, **kwargs)
+        cache_vehicules.ecrire(cle, response.data, cache_vehicules.ttl_liste())
+        response['X-Cache'] = 'MISS'
+        return response
+    
     def retrieve(self, request, *args, **kwargs):
         """Récupérer un véhicule et incrémenter le compteur de vues."""
+        cacheable = cache_vehicules.requete_cacheable(request)
+        if cacheable:
+            cle = cache_vehicules.cle_detail(request, kwargs[self.lookup_field])
+            data = cache_vehicules.lire(cle, 'detail')
+            if data is not None:
+                compteurs.incrementer('vehicule', data['id'])
+                return Response(data, headers={'X-Cache': 'HIT'})
+        
         instance = self.get_object()
         
         # Incrémenter les vues (sauf pour le propriétaire)
@@ -231,6 +276,10 @@ class VehiculeViewSet(viewsets.ModelViewSet):
                 vehicule=instance,
                 request=request
             )
+        
+        if cacheable:
+            cache_vehicules.ecrire(cle, serializer.data, cache_vehicules.ttl_detail())
+            return Response(serializer.data, headers={'X-Cache': 'MISS'})
         return Response(serializer.data)
     
     # ========================================
@@ -258,6 +307,82 @@ class VehiculeViewSet(viewsets.ModelViewSet):
         serializer = VehiculeListSerializer(queryset, many=True, context={'request': request})
         return Response(serializer.data)
     
+    @action(
+        detail=False,
+        methods=['get']
+    )
+    def disponibles(self, request):
+        """
+        Véhicules libres à la location sur toute une période.
+        GET /api/vehicules/disponibles/?date_debut=2025-01-10&date_fin=2025-01-15
+
+        Combinable avec les filtres, la recherche et le tri de la liste.
+        """
+        from datetime import date
+
+        date_debut = request.query_params.get('date_debut')
+        date_fin = request.query_params.get('date_fin')
+
+        if not date_debut or not date_fin:
+            return Response(
+                {'error': 'Les paramètres date_debut et date_fin sont requis'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            date_debut = date.fromisoformat(date_debut)
+            date_fin = date.fromisoformat(date_fin)
+        except ValueError:
+            return Response(
+                {'error': 'Format de date invalide (attendu : AAAA-MM-JJ)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if date_fin < date_debut:
+            return Response(
+                {'error': 'La date de fin doit être après la date de début'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = vehicules_disponibles(
+            date_debut,
+            date_fin,
+            queryset=self.filter_queryset(self.get_queryset())
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = VehiculeListSerializer(page, many=True, context={'request': request})
+            return self.get_paginated_response(serializer.data)
+
+        serializer = VehiculeListSerializer(queryset, many=True, context={'request': request})
+        return Response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=['get']
+    )
+    def facettes(self, request):
+        """
+        Compteurs de la barre de filtres pour les filtres courants.
+        GET /api/vehicules/facettes/?type_carburant=DIESEL&search=toyota
+
+        Marques, catégories, carburants, transmissions, tranches de prix et
+        d'année, calculés en une requête et mis en cache par jeu de filtres
+        (visiteurs uniquement, comme la liste).
+        """
+        if not cache_vehicules.requete_cacheable(request):
+            return Response(calculer_facettes(self.filter_queryset(self.get_queryset())))
+
+        cle = cache_vehicules.cle_facettes(request)
+        data = cache_vehicules.lire(cle, 'facettes')
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        data = calculer_facettes(self.filter_queryset(self.get_queryset()))
+        cache_vehicules.ecrire(cle, data, cache_vehicules.ttl_liste())
+        return Response(data, headers={'X-Cache': 'MISS'})
+
     @action(
         detail=False,
         methods=['get']
@@ -307,6 +432,81 @@ class VehiculeViewSet(viewsets.ModelViewSet):
         
         return Response(data)
     
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[permissions.IsAuthenticated, IsAdministrateur]
+    )
+    def statistiques_cache(self, request):
+        """
+        Compteurs hit/miss du cache du catalogue.
+        GET /api/vehicules/statistiques_cache/
+        """
+        return Response(cache_vehicules.statistiques())
+
+    @action(
+        detail=False,
+        methods=['post'],
+        permission_classes=[permissions.IsAuthenticated, IsConcessionnaire],
+        url_path='import'
+    )
+    def importer(self, request):
+        """
+        Importer un parc de véhicules depuis un fichier.
+        POST /api/vehicules/import/
+
+        Body: multipart/form-data avec 'fichier' (.csv, .json ou .jsonl),
+        'concession_id' (optionnel si une seule concession validée),
+        'format' (optionnel, sinon d'après l'extension) et 'simulation'
+        (valider sans enregistrer).
+        Colonnes : celles de la création, avec 'marque' et 'categorie' par
+        nom ; en CSV, les équipements sont séparés par '|'.
+        Réponse : nombre de lignes lues et importées, erreurs par ligne et,
+        si la lecture s'est interrompue en cours de fichier, 'erreur_fichier'.
+        """
+        from concessions.models import Concession
+
+        fichier = request.FILES.get('fichier')
+        if not fichier:
+            return Response(
+                {"error": "Aucun fichier fourni"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        format_fichier = request.data.get('format') or import_vehicules.detecter_format(fichier.name)
+        if format_fichier not in import_vehicules.FORMATS:
+            return Response(
+                {"error": "Format non reconnu (csv, json ou jsonl)"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        concession = None
+        if request.data.get('concession_id'):
+            concession = Concession.objects.filter(
+                pk=request.data['concession_id'],
+                concessionnaire=request.user,
+                statut='VALIDE'
+            ).first()
+            if concession is None:
+                return Response(
+                    {"error": "Concession non trouvée ou non validée"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        simulation = str(request.data.get('simulation', '')).lower() in ('1', 'true', 'oui')
+        import_ = import_vehicules.ImportVehicules(request.user, concession, simulation=simulation)
+
+        rapport = import_.importer(import_vehicules.lire_lignes(fichier, format_fichier))
+        if 'erreur_fichier' in rapport and not rapport['total']:
+            # Fichier illisible dans son ensemble (JSON invalide, encodage)
+            return Response(
+                {"error": f"Fichier illisible : {rapport['erreur_fichier']}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rapport['simulation'] = simulation
+        return Response(rapport)
+
     # ========================================
     # GESTION DES PHOTOS (NOUVEAU)
     # ========================================
@@ -357,6 +557,77 @@ class VehiculeViewSet(viewsets.ModelViewSet):
             "photos": photos_creees
         }, status=status.HTTP_201_CREATED)
     
+    @action(
+        detail=True,
+        methods=['post'],
+        permission_classes=[permissions.IsAuthenticated],
+        url_path='photos-lot'
+    )
+    def ajouter_photos_lot(self, request, pk=None):
+        """
+        Ajouter une galerie de photos en un lot.
+        POST /api/vehicules/{id}/photos-lot/
+        
+        Body: multipart/form-data avec 'photos[]'
+        Réponse 202 : identifiant du lot et statut de chaque fichier. Les
+        versions redimensionnées sont générées en arrière-plan ; suivre
+        l'avancement sur GET /api/vehicules/{id}/photos-lot/{lot_id}/
+        """
+        vehicule = self.get_object()
+        
+        # Vérifier que c'est le propriétaire
+        if vehicule.concessionnaire != request.user:
+            return Response(
+                {"error": "Vous n'êtes pas le propriétaire de ce véhicule"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        photos = request.FILES.getlist('photos')
+        
+        if not photos:
+            return Response(
+                {"error": "Aucune photo fournie"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if len(photos) > lots_photos.nombre_max_fichiers():
+            return Response(
+                {"error": f"{lots_photos.nombre_max_fichiers()} photos maximum par lot"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        lot = lots_photos.creer_lot(vehicule, photos)
+        return Response(lot, status=status.HTTP_202_ACCEPTED)
+    
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[permissions.IsAuthenticated],
+        url_path='photos-lot/(?P<lot_id>[0-9a-f]+)'
+    )
+    def suivi_photos_lot(self, request, pk=None, lot_id=None):
+        """
+        Suivre un lot de photos.
+        GET /api/vehicules/{id}/photos-lot/{lot_id}/
+        """
+        vehicule = self.get_object()
+        
+        # Vérifier que c'est le propriétaire
+        if vehicule.concessionnaire != request.user:
+            return Response(
+                {"error": "Vous n'êtes pas le propriétaire de ce véhicule"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        lot = lots_photos.lire_lot(lot_id)
+        if lot is None or lot['vehicule_id'] != vehicule.id:
+            return Response(
+                {"error": "Lot non trouvé ou expiré"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response(lot)
+    
     @action(
         detail=True,
         methods=['delete'],
@@ -496,4 +767,69 @@ class VehiculeViewSet(viewsets.ModelViewSet):
             return Response(
                 {"error": "Vidéo non trouvée"},
                 status=status.HTTP_404_NOT_FOUND
-            )
\ No newline at end of file
+            )
+
+    # ========================================
+    # HISTORIQUE DES PRIX
+    # ========================================
+    
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path='historique-prix'
+    )
+    def historique_prix(self, request, pk=None):
+        """
+        Historique des prix d'un véhicule, échantillonné pour les graphiques.
+        GET /api/vehicules/{id}/historique-prix/?date_debut=2025-01-01&date_fin=2025-12-31&points=100
+        
+        Par défaut : les 365 derniers jours, 100 points au plus.
+        """
+        from datetime import date, datetime, time, timedelta
+        from django.utils import timezone
+        from rest_framework.generics import get_object_or_404
+        from vehicules import historique_prix
+        
+        # Mêmes règles de visibilité que la fiche, sans précharger photos
+        # ni relations
+        vehicule = get_object_or_404(
+            self.get_queryset().select_related(None).prefetch_related(None).only('pk'),
+            pk=pk
+        )
+        
+        try:
+            date_fin = date.fromisoformat(request.query_params.get('date_fin') or timezone.localdate().isoformat())
+            date_debut = request.query_params.get('date_debut')
+            date_debut = date.fromisoformat(date_debut) if date_debut else date_fin - timedelta(days=365)
+        except ValueError:
+            return Response(
+                {'error': 'Format de date invalide (attendu : AAAA-MM-JJ)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if date_fin < date_debut:
+            return Response(
+                {'error': 'La date de fin doit être après la date de début'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            points = int(request.query_params.get('points', historique_prix.POINTS_DEFAUT))
+        except ValueError:
+            points = 0
+        if not 1 <= points <= historique_prix.POINTS_MAX:
+            return Response(
+                {'error': f'points doit être compris entre 1 et {historique_prix.POINTS_MAX}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Journées entières : de date_debut 00:00 à date_fin + 1 jour 00:00 (exclu)
+        debut = timezone.make_aware(datetime.combine(date_debut, time.min))
+        fin = timezone.make_aware(datetime.combine(date_fin + timedelta(days=1), time.min))
+        
+        return Response({
+            'vehicule_id': vehicule.pk,
+            'date_debut': date_debut,
+            'date_fin': date_fin,
+            **historique_prix.serie(vehicule.pk, debut, fin, points)
+        })
@@ -117,6 +117,68 @@ const notificationService = {
     }
   },
 
+  // ========================================
+  // TEMPS RÉEL
+  // ========================================
+
+  /**
+   * S'abonner au flux temps réel (Server-Sent Events)
+   * POST /api/notifications/flux/ticket/ puis GET /api/notifications/flux/?ticket=
+   *
+   * Le ticket est à usage unique : le jeton d'accès ne passe jamais dans
+   * l'URL, et chaque reconnexion demande un nouveau ticket.
+   *
+   * onCompteur(nonLues) : à la connexion puis à chaque lecture / suppression
+   * onNotification(notification) : nouvelle notification (non lue)
+   * Retourne (promesse) une fonction de désabonnement.
+   */
+  async ecouter({ onCompteur, onNotification } = {}) {
+    let source = null;
+    let relance = null;
+    let ferme = false;
+
+    const reconnecter = () => {
+      if (!ferme) {
+        relance = setTimeout(() => ouvrir().catch(reconnecter), 5000);
+      }
+    };
+
+    const ouvrir = async () => {
+      const response = await api.post('/notifications/flux/ticket/');
+      if (ferme) return;
+
+      const ticket = encodeURIComponent(response.data.ticket);
+      source = new EventSource(`${api.defaults.baseURL}/notifications/flux/?ticket=${ticket}`);
+
+      source.onmessage = (event) => {
+        const donnees = JSON.parse(event.data);
+        if (donnees.type === 'compteur' && onCompteur) {
+          onCompteur(donnees.non_lues);
+        } else if (donnees.type === 'notification' && onNotification) {
+          onNotification(donnees.notification);
+        }
+      };
+
+      // Ticket consommé : la reconnexion automatique d'EventSource échouerait
+      source.onerror = () => {
+        source.close();
+        reconnecter();
+      };
+    };
+
+    try {
+      await ouvrir();
+    } catch (error) {
+      throw this.handleError(error);
+    }
+
+    return () => {
+      ferme = true;
+      clearTimeout(relance);
+      if (source) source.close();
+    };
+  },
+
   // ========================================
   // FILTRES PAR TYPE
   // ========================================